@@ -10,13 +10,52 @@ of default values as defined by the literature for ESNs. allows for creation of
 than 1 model per call, as well as allowing for 4 differing interconnections between
 nodes. To create multiple identical models, set nn to the desired number; for different
 models, set nn to 1 and repeat calls to ESN_Maker, passing desired parameters.
+
+with backend='numpy' the models are NumPy_ESN objects (see NumPy_Reservoir_V1) instead
+of reservoirpy graphs: same lr/sr/cny/ins/ins_cny/seed semantics and run/fit interface,
+without graph construction or per-node dispatch. only the 'simple' configuration exists
+for this backend. the seed is used for the weights when rep is True.
+
+ensemble (numpy backend only) is a list of dicts, one per member, overriding any of
+lr/sr/cny/ins/ins_cny/seed. the members share the node count and are simulated together
+as one NumPy_Ensemble; networks then holds one model view per member, each usable on
+its own by the metrics (see NumPy_Reservoir_V1).
+
+with rep True, the raw weights of each (nc, cny, ins_cny, init_W, seed) are kept in a
+module level LRU cache of WEIGHT_CACHE_SIZE entries: raw W, its leading eigenvalue
+modulus (ARPACK, computed once) and raw Win and bias. models that differ only in sr,
+ins or lr are then rescales of the cached matrices, not new draws. the rescaled weights
+are the same as a fresh draw would give. with the reservoirpy backend the Reservoir is
+given the rescaled matrices instead of drawing its own, as with sparse_W, and with
+init_W they are not redrawn by init_network either. with rep False every model draws.
+
+sparse_W=True builds W, Win and bias with Sparse_Weights_V1 instead, for reservoirs of
+10k - 100k nodes: W is drawn directly in CSR form (distribution init_W, 'normal' if None)
+with round(cny * nc) connections per row, and scaled to sr with a bounded-iteration
+ARPACK estimate of its spectral radius. nothing is densified. works with both backends,
+the reservoirpy Reservoir is then given the matrices instead of drawing its own.
+
+dtype='float32' simulates in single precision, halving the memory and bandwidth of the
+weights and states: weights are drawn in float64 as usual (so they are the float64
+weights, rounded) then cast, and the reservoir runs in float32. with the reservoirpy
+backend the Reservoir holds float32 weights and state, its outputs are cast back to
+float32 by Harvest_V1.
 """
 
 import reservoirpy as res
 from reservoirpy.nodes import Reservoir, Input, Output
-from reservoirpy.mat_gen import random_sparse
+from reservoirpy.mat_gen import random_sparse, normal, bernoulli, _epsilon
+from reservoirpy.observables import spectral_radius
+from scipy.sparse.linalg import ArpackNoConvergence
 from dataclasses import dataclass, field
+from collections import OrderedDict
 import numpy as np
+from NumPy_Reservoir_V1 import NumPy_ESN, NumPy_Ensemble
+import Sparse_Weights_V1 as SW
+import Phase_Timer_V1 as PT
+
+WEIGHT_CACHE_SIZE = 32 # number of (nc, cny, ins_cny, init_W, seed, sparse_W) weight sets kept
+_WEIGHT_CACHE = OrderedDict() # key --> (raw W, leading eigenvalue modulus, raw Win, bias)
 
 @dataclass
 class ESN_Maker ():   
@@ -51,7 +90,11 @@ class ESN_Maker ():
                  
                  verb: bool = False, # sets verbosity
                  rep: bool = False, # sets reproducibility
-                 seed: int = 42
+                 seed: int = 42,
+                 backend: str = 'reservoirpy', # 'reservoirpy' or 'numpy'
+                 ensemble: list = None, # list of per-member parameter dicts, numpy backend only
+                 sparse_W: bool = False, # if True, O(nnz) construction of W, see class description ^^^
+                 dtype: str = 'float64' # 'float64' or 'float32', precision of the simulation
                 ):
         
                     if nc == None:
@@ -60,11 +103,27 @@ class ESN_Maker ():
                         raise ValueError("You can't request less than 1 ESN.")
                     elif nn > 10:
                         raise ValueError("You can't request more than 10 ESNs")
+                    elif backend.lower() not in ('reservoirpy','numpy'):
+                        raise ValueError("backend options are 'reservoirpy' or 'numpy'.")
+                    elif backend.lower() == 'numpy' and cn.lower() != 'simple':
+                        raise ValueError("the numpy backend only supports the 'simple' connection type.")
+                    elif ensemble is not None and backend.lower() != 'numpy':
+                        raise ValueError("ensembles are only available with the numpy backend.")
+                    elif np.dtype(dtype) not in (np.float64, np.float32):
+                        raise ValueError("dtype options are 'float64' or 'float32'.")
                         
                     self.res_params = [nc,lr,sr,cny,ins,ins_cny]
                     self.config_params = [nn,cn.lower(),init,init_W,out]
+                    self.backend = backend.lower()
+                    self.sparse_W = sparse_W
+                    self.dtype = np.dtype(dtype)
                     
-                    self.make_nodes(nn, cn.lower(), out)
+                    if ensemble is not None:
+                        self.make_ensemble(ensemble, init_W, seed if rep else None)
+                    elif self.backend == 'numpy':
+                        self.make_numpy_nodes(nn, init_W, seed if rep else None)
+                    else:
+                        self.make_nodes(nn, cn.lower(), out, init_W, seed if rep else None)
                     self.init_network(init, init_W)
                     self.set_others(verb,rep,seed)
                     
@@ -72,7 +131,13 @@ class ESN_Maker ():
       
     # class field res_params is used to set all the desired reservoir parameters.
               
-    def make_nodes(self,nn,cn,out):
+    def make_nodes(self,nn,cn,out,init_W=None,seed=None):
+        
+        weights = {}
+        if self.sparse_W or seed is not None: # matrices given to the Reservoir, which then draws nothing
+            W, Win, bias = self.numpy_weights(self.res_params, init_W, seed) # from the weight cache if seed
+            weights = {"W" : W.astype(self.dtype), "Win" : Win.astype(self.dtype), "bias" : bias.astype(self.dtype)}
+        self.weights_given = bool(weights)
         
         self.networks = []
         for i in range(nn):
@@ -84,7 +149,9 @@ class ESN_Maker ():
                                      sr=self.res_params[2],
                                      rc_connectivity=self.res_params[3],
                                      input_scaling=self.res_params[4],
-                                     input_connectivity=self.res_params[5]
+                                     input_connectivity=self.res_params[5],
+                                     dtype=self.dtype,
+                                     **weights
                                      )
         
             if cn == 'simple':
@@ -114,16 +181,118 @@ class ESN_Maker ():
             
             self.networks.append(model)
             
+#---------------------INSTANTIATE NUMPY BACKEND MODELS------------------------#
+
+    # weights are drawn with the reservoirpy initialisers, as a Reservoir or init_network
+    # (with init_W) would draw them: W, Win and bias in turn from one generator of the
+    # seed, so that they are independent of each other.
+    
+    def numpy_weights(self,res_params,init_W,seed):
+        
+        nc,lr,sr,cny,ins,ins_cny = res_params
+        
+        if self.sparse_W: # O(nnz) construction, always scaled to sr and ins
+            if seed is not None:
+                W, rho, Win, bias = self.cached_weights(nc, cny, ins_cny, init_W, seed)
+            else:
+                W, rho, Win, bias = SW.Sparse_Weights(nc, cny, ins_cny, init_W or 'normal')
+            return W * (sr / rho), Win * ins, bias
+        
+        if seed is not None: # reproducible draw, can come from the cache
+            cached = self.cached_weights(nc, cny, ins_cny, init_W, seed)
+            if cached is not None:
+                W, rho, Win, bias = cached
+                if init_W is not None: # init_network ignores sr and ins too
+                    return W, Win, bias
+                return W * (sr / rho), Win * ins, bias # same operations as the initialisers
+        
+        rng = np.random.default_rng(seed)
+        if init_W is not None:
+            initializer = random_sparse(dist=init_W, loc=-1, scale=2, input_scaling=0.5)
+            W = initializer(nc, nc, seed=rng)
+            Win = initializer(nc, 1, seed=rng)
+        else:
+            W = normal(nc, nc, connectivity=cny, sr=sr, seed=rng)
+            Win = bernoulli(nc, 1, connectivity=ins_cny, input_scaling=ins, seed=rng)
+        bias = bernoulli(nc, 1, connectivity=ins_cny, input_scaling=1.0, seed=rng)
+        
+        return W, Win, bias
+    
+    def cached_weights(self,nc,cny,ins_cny,init_W,seed):
+        
+        # raw weights of the key, drawn on a cache miss. None if ARPACK doesn't converge,
+        # the initialisers then retry with other seeds themselves.
+        
+        key = (nc, cny, ins_cny, init_W, seed, self.sparse_W)
+        
+        if key in _WEIGHT_CACHE:
+            _WEIGHT_CACHE.move_to_end(key)
+            return _WEIGHT_CACHE[key]
+        
+        if self.sparse_W:
+            W, rho, Win, bias = SW.Sparse_Weights(nc, cny, ins_cny, init_W or 'normal', seed)
+        else:
+            rng = np.random.default_rng(seed) # as numpy_weights, one generator for all three
+            if init_W is not None:
+                initializer = random_sparse(dist=init_W, loc=-1, scale=2, input_scaling=0.5)
+                W = initializer(nc, nc, seed=rng)
+                Win = initializer(nc, 1, seed=rng)
+                rho = None
+            else:
+                W = normal(nc, nc, connectivity=cny, seed=rng)
+                try:
+                    rho = spectral_radius(W)
+                except ArpackNoConvergence:
+                    return None
+                if -_epsilon < rho < _epsilon: # as reservoirpy, avoids dividing by zero
+                    rho = _epsilon
+                Win = bernoulli(nc, 1, connectivity=ins_cny, seed=rng)
+            bias = bernoulli(nc, 1, connectivity=ins_cny, input_scaling=1.0, seed=rng)
+        
+        weights = (W, rho, Win, bias)
+        _WEIGHT_CACHE[key] = weights
+        while len(_WEIGHT_CACHE) > WEIGHT_CACHE_SIZE:
+            _WEIGHT_CACHE.popitem(last=False) # least recently used
+        
+        return weights
+    
+    def make_numpy_nodes(self,nn,init_W,seed):
+        
+        W, Win, bias = self.numpy_weights(self.res_params, init_W, seed)
+        
+        self.networks = []
+        for i in range(nn):
+            self.networks.append(NumPy_ESN(W, Win, bias, lr=self.res_params[1], dtype=self.dtype))
+            
+#-----------------------INSTANTIATE NUMPY ENSEMBLE----------------------------#
+
+    def make_ensemble(self,members,init_W,seed):
+        
+        names = ['nc','lr','sr','cny','ins','ins_cny']
+        weights = []
+        leak_rates = []
+        
+        for member in members:
+            if 'nc' in member and member['nc'] != self.res_params[0]:
+                raise ValueError("ensemble members must share the node count.")
+            res_params = [member.get(name, self.res_params[i]) for i, name in enumerate(names)]
+            weights.append(self.numpy_weights(res_params, init_W, member.get('seed', seed)))
+            leak_rates.append(res_params[1])
+            
+        self.ensemble = NumPy_Ensemble(weights, leak_rates, dtype=self.dtype)
+        self.networks = self.ensemble.members
+            
 #-------------------------INITIALISE MODEL NODES------------------------------#
     
     def init_network(self,init,init_W):
         
         if init:
             init_data = np.random.random([1,1])
-            for esn in self.networks:
-                esn.run(init_data)
+            with PT.Phase("warmup"):
+                for esn in self.networks:
+                    esn.run(init_data)
         
-        if init_W is not None:
+        if init_W is not None and self.backend == 'reservoirpy' and not self.weights_given:
             
             try:
                 initializer = random_sparse(
@@ -139,8 +308,8 @@ class ESN_Maker ():
                 init_win = initializer(self.res_params[0],1) # matrix input weights
 
                 for network in self.networks:
-                    network.nodes[1].W = init_res # node 1 is always reservoir when using ESN_Maker
-                    network.nodes[1].Win = init_win
+                    network.nodes[1].W = init_res.astype(self.dtype) # node 1 is always reservoir when using ESN_Maker
+                    network.nodes[1].Win = init_win.astype(self.dtype)
                     
             except:
                 print("invalid distribution")
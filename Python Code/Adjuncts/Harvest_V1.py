@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 12 10:12:31 2026
+"""
+
+"""
+    functions for collecting the states of a model over a whole input stream, shared
+    by the metrics in Metrics/. running the stream through the model in one batched
+    model.run() call avoids paying the reservoirpy node dispatch on every timestep,
+    which is what dominates at the node counts we sweep.
+
+    Find_Reservoir   --> receives model, returns the name of its reservoir node.
+    Gen_Input_Stream --> receives model, returns random input stream of 4 * units rows
+                         in range [-0.5:0.5].
+    Harvest_States   --> receives model and input stream, returns output matrix of shape
+                         (input length, output dim), in the precision of the reservoir (see
+                         State_Dtype). can write into a preallocated buffer.
+    Harvest_Chunks   --> receives model, input stream and chunk size, yields (start, states)
+                         for consecutive chunks of the stream. the model state carries over
+                         between chunks, so only one chunk of states is ever held in memory.
+    State_Dtype      --> receives model, returns the dtype its reservoir runs in.
+"""
+
+import numpy as np
+from reservoirpy import model
+import Phase_Timer_V1 as PT
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Find_Reservoir (model: model) -> str:
+
+    res_name = model.node_names
+    for name in res_name:
+        if any(x == 'R' for x in name):
+            return name
+
+    raise ValueError("model has no reservoir node.")
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Gen_Input_Stream (model: model) -> np.ndarray:
+
+    stream_length = model.get_node(Find_Reservoir(model)).get_param("units") * 4
+
+    return np.random.random([stream_length,1]) - 0.5 # input range [-0.5:0.5]
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Harvest_States (model: model,
+                    input_stream: np.ndarray,
+                    out: np.ndarray = None) -> np.ndarray:
+
+    # a single model.run() over the whole stream updates the reservoir exactly as
+    # one model.call() per row would, starting from the current model state.
+
+    with PT.Phase("harvest"):
+        states = model.run(input_stream)
+
+    if isinstance(states, dict): # models with several output nodes return a dict
+        states = states[model.output_nodes[-1].name]
+
+    # reservoirpy returns float64 whatever the precision of its nodes
+    states = states.astype(State_Dtype(model), copy=False)
+
+    if out is None:
+        return states
+
+    out[:] = states # preallocated buffer, e.g. numpy.memmap
+    return out
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def State_Dtype (model: model) -> np.dtype:
+
+    dtype = getattr(model, "dtype", None) # nodes and NumPy_ESN
+    if dtype is None: # reservoirpy model
+        dtype = model.get_node(Find_Reservoir(model)).dtype
+
+    return np.dtype(dtype)
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Harvest_Chunks (model: model,
+                    input_stream: np.ndarray,
+                    chunk_size: int = None):
+
+    if chunk_size is None:
+        chunk_size = len(input_stream)
+
+    for start in range(0, len(input_stream), chunk_size):
+        yield start, Harvest_States(model, input_stream[start:start + chunk_size])
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
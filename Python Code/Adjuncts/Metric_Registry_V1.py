@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 15:32:09 2026
+"""
+
+"""
+registry of the metric functions used by GetDataset. a metric is loaded from its .py
+once per process: later loads, in the same run, in later runs or in the worker
+processes that keep running between runs, are served from the registry. a file is
+only imported again if it has changed since.
+
+a metric file declares how it is to be called with a module level dict:
+
+    METRIC = {"function" : "MC_n",     # the metric function in the file
+              "needs_states" : True,   # runs or fits the model on the given input stream only,
+                                       # in order, so it can be served from one shared harvest
+              "needs_training" : True, # needs a ridge readout on the model
+              "input_stream" : True}   # takes the input stream as second argument
+
+files without it are called as before: the function named like the target (or else the
+first function of the file in alphabetical order), with the input stream if there is
+one, and with a model of their own. from the declaration, Plan() chooses how a metric
+is executed when several are evaluated on one point (see Multi_Metric_V1):
+
+    "harvest" --> served from the shared state harvest (or from stored states)
+    "model"   --> given a model of its own
+
+function parameters given as a dict are passed by name when they all match the
+signature of the function, otherwise by position, in dict order.
+"""
+
+import importlib.util
+import sys
+import hashlib
+from os import path, stat
+from inspect import getmembers, isfunction, signature
+from dataclasses import dataclass, field
+
+_REGISTRY = {} # (name, absolute path) --> (file modification time, Metric)
+_MODULES = {} # absolute path --> (file modification time, module), each file imported once
+
+@dataclass
+class Metric ():
+
+    name: str # name given in target_function, names the result folders
+    file: str
+    function: callable
+    needs_states: bool = False
+    needs_training: bool = False
+    input_stream: bool = True
+    declared: bool = False # True if the file has a METRIC declaration
+    parameters: list = field(default_factory=list) # names after model (and input stream)
+    ridges: bool = False # accepts a ridges keyword, see Readout_V1.Ridge_Path
+
+#-----------------------------------PLAN--------------------------------------#
+
+    def Plan(self) -> str:
+
+        if self.needs_states and self.input_stream:
+            return "harvest"
+
+        return "model"
+
+#-----------------------------------CALL--------------------------------------#
+
+    def __call__(self, model, input_stream = None, params = None, **extra):
+
+        # input_stream None --> not passed. params: dict, list or None
+
+        args = [model]
+        if input_stream is not None and self.input_stream:
+            args.append(input_stream)
+
+        if params is None:
+            return self.function(*args, **extra)
+
+        if type(params) == dict:
+            if all(name in self.parameters for name in params):
+                return self.function(*args, **params, **extra)
+            params = list(params.values()) # names don't match, dict order as before
+
+        return self.function(*args, *params, **extra)
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Load (target_function: tuple) -> Metric:
+
+    # target_function: (name, path to its .py)
+
+    name, file = target_function
+    file = path.abspath(file)
+    modified = stat(file).st_mtime_ns
+
+    if (name, file) in _REGISTRY and _REGISTRY[(name, file)][0] == modified:
+        return _REGISTRY[(name, file)][1]
+
+    module = _Import(file, modified)
+    declaration = getattr(module, "METRIC", None)
+
+    if declaration is not None:
+        function = getattr(module, declaration["function"])
+    elif isfunction(getattr(module, name, None)):
+        function = getattr(module, name)
+    else:
+        function = getmembers(module, isfunction)[0][1] # first in alphabetical order
+
+    declaration = declaration or {}
+    parameters = list(signature(function).parameters)
+    skip = 2 if declaration.get("input_stream", True) else 1 # model (and input stream)
+
+    metric = Metric(name=name,
+                    file=file,
+                    function=function,
+                    needs_states=declaration.get("needs_states", False),
+                    needs_training=declaration.get("needs_training", False),
+                    input_stream=declaration.get("input_stream", True),
+                    declared=bool(declaration),
+                    parameters=parameters[skip:],
+                    ridges="ridges" in parameters)
+
+    _REGISTRY[(name, file)] = (modified, metric)
+
+    return metric
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def _Import (file: str, modified: int):
+
+    if file in _MODULES and _MODULES[file][0] == modified:
+        return _MODULES[file][1]
+
+    module_name = "metric_" + hashlib.sha256(file.encode()).hexdigest()[:16] # one per file
+    spec = importlib.util.spec_from_file_location(name=module_name, location=file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+
+    _MODULES[file] = (modified, module)
+
+    return module
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 16 14:21:37 2026
+"""
+
+"""
+evaluates several metrics on one model and one input stream, with a single state
+harvest. used by GetDataset when target_function is a list. metrics are Metric
+entries of the registry (see Metric_Registry_V1), executed as their Plan() says:
+
+    "harvest" --> the reservoir of the model is run once over the input stream, then
+                  each of these metrics receives its own Replay_ESN (see NumPy_Reservoir_V1):
+                  a model with the same weights and readout, whose runs and fits are
+                  served from the harvest.
+    "model"   --> the metric receives a model of its own, from build() (or the model
+                  given, if no harvest used it).
+
+    metrics = Multi_Metric([MR.Load(("Shannon", ...)), MR.Load(("MC_n", ...))])
+    metrics(model, input_stream, {params of Shannon}, {params of MC_n})
+        --> [result of Shannon, result of MC_n]
+
+with ridges=[...] every metric is called with the ridge path, and the results are
+returned per ridge value: [[metric 1, metric 2, ...] for each ridge value].
+
+    Harvest_Reservoir --> receives model and input stream, returns (reservoir node, states)
+                          as the metrics would see them.
+    Evaluate          --> evaluates the metrics on states harvested beforehand, e.g. read
+                          back from a State_Cache, without the model. "model" metrics
+                          then need build.
+"""
+
+from reservoirpy import model
+import numpy as np
+import Harvest_V1 as HV
+from NumPy_Reservoir_V1 import Replay_ESN
+
+class Multi_Metric ():
+
+#----------------------------------INIT---------------------------------------#
+
+    def __init__(self, metrics: list):
+
+        self.metrics = list(metrics)
+
+#-----------------------------------CALL--------------------------------------#
+
+    def __call__(self, model: model, input_stream: np.ndarray, *params, ridges: list = None, build = None):
+
+        if not any(metric.Plan() == "harvest" for metric in self.metrics):
+            return self.Evaluate(input_stream, None, *params, ridges=ridges, model=model, build=build)
+
+        reservoir, states = Harvest_Reservoir(model, input_stream) # the only run of the reservoir
+        ridge = getattr(model.output_nodes[-1], "ridge", None)
+
+        return self.Evaluate(input_stream, states, *params, ridge=ridge, ridges=ridges,
+                             weights=(reservoir.W, reservoir.Win, reservoir.bias), lr=reservoir.lr,
+                             build=build, dtype=HV.State_Dtype(reservoir))
+
+    def Evaluate(self, input_stream: np.ndarray, states: np.ndarray, *params, ridge: float = None,
+                 ridges: list = None, weights: tuple = (None, None, None), lr: float = 0.1,
+                 model: model = None, build = None, dtype = np.float64):
+
+        # model: unused model a "model" metric can have, build: returns a new one.
+        # dtype: precision the metrics are evaluated in, that of the reservoir
+
+        if len(params) != len(self.metrics):
+            raise ValueError("Multi_Metric needs one set of parameters per metric.")
+
+        path = {} if ridges is None else {"ridges" : ridges}
+
+        results = []
+        for metric, metric_params in zip(self.metrics, params):
+            if metric.Plan() == "harvest":
+                target = Replay_ESN(*weights, input_stream, states, lr=lr, ridge=ridge, dtype=dtype)
+            elif model is not None:
+                target, model = model, None # each model is used by one metric only
+            elif build is not None:
+                target = build()
+            else:
+                raise ValueError(f"{metric.name} needs a model of its own, it cannot be evaluated on harvested states.")
+            results.append(metric(target, input_stream, metric_params, **path))
+
+        if ridges is None:
+            return results
+
+        return [list(values) for values in zip(*results)] # per ridge value, then per metric
+
+#-----------------------------------------------------------------------------#
+
+def Harvest_Reservoir (model: model, input_stream: np.ndarray):
+
+    reservoir = model.get_node(HV.Find_Reservoir(model))
+
+    # a reservoirpy model that has not been run as a whole yet is initialised on its
+    # first run or fit, which resets the reservoir state. the harvest must match.
+
+    if not getattr(model, "is_initialized", True):
+        reservoir.reset()
+
+    return reservoir, HV.Harvest_States(reservoir, input_stream)
+
+#-----------------------------------------------------------------------------#
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 13 10:26:52 2026
+"""
+
+"""
+lightweight leaky-tanh reservoir, selected from ESN_Maker with backend='numpy'. W is
+held as a scipy.sparse CSR matrix, Win and bias as dense arrays, and the update
+
+    x[t+1] = (1 - lr) * x[t] + lr * tanh( W.x[t] + Win.u[t+1] + bias )
+
+runs in a tight loop over a preallocated state buffer. the input projection Win.u is
+computed for the whole stream in one matrix product, written into the buffer, and
+overwritten in place by the states as the loop goes.
+
+the class mimics the parts of a reservoirpy.model used by GetDataset and the metrics,
+so that they work unchanged:
+
+    run(X)          --> states of shape (len(X), units), or readout output once fitted
+    call(x)         --> run() of a single timestep
+    fit(X, Y)       --> ridge readout on the states of X (see Readout_V1), returns self.
+                        with chunk_size, X is run in chunks and only X^T.X is kept
+    model >> Ridge  --> attaches a ridge readout, taking its ridge value
+    node_names, get_node(name).get_param("units"), nodes[-1].output_dim
+
+NumPy_Ensemble simulates K reservoirs of equal size together: their W matrices form one
+block diagonal CSR matrix and their states one (K * units) vector, so a single sparse
+product per timestep updates the whole ensemble. each member is exposed as an
+Ensemble_Member, a NumPy_ESN whose states are slices of the ensemble run. members are
+meant to be used in turn by the same metric: the first member to run an input runs the
+whole ensemble on it, the others are served their slice, provided they run the same
+inputs in the same order. batches are dropped once every member has been served.
+
+Replay_ESN is a NumPy_ESN whose states were recorded beforehand (see Multi_Metric_V1):
+runs and fits are served from the recording, provided they go through the recorded
+input stream in order, so several metrics can share one harvest of the same reservoir.
+without weights (W, Win and bias None) it runs from stored states alone, see State_Cache_V1.
+"""
+
+import numpy as np
+from scipy import sparse
+import Readout_V1 as RO
+
+class NumPy_ESN ():
+
+#----------------------------------INIT---------------------------------------#
+
+    def __init__(
+                 self,
+                 W, # (units, units) reservoir weights, dense or sparse
+                 Win, # (units, input dim) input weights, dense or sparse
+                 bias, # (units,) or (units, 1) reservoir bias
+                 lr: float = 0.1, # leak rate
+                 ridge: float = None, # if not None, ridge value of the readout
+                 dtype = np.float64,
+                 name: str = "Reservoir-NumPy"
+                ):
+
+                    self.dtype = np.dtype(dtype)
+                    self.W = sparse.csr_matrix(W, dtype=self.dtype)
+
+                    self.Win = _dense(Win).astype(self.dtype).reshape(self.W.shape[0],-1)
+                    self.bias = _dense(bias).astype(self.dtype).reshape(-1)
+                    self.lr = lr
+                    self.ridge = ridge
+                    self.name = name
+
+                    self.Wout = None
+                    self.bout = None
+                    self.reset()
+
+#--------------------------RESERVOIRPY-LIKE SURFACE---------------------------#
+
+    @property
+    def units(self) -> int:
+        return self.W.shape[0]
+
+    @property
+    def output_dim(self) -> int:
+        if self.Wout is None:
+            return self.units
+        return self.Wout.shape[1]
+
+    @property
+    def node_names(self) -> list:
+        return [self.name]
+
+    @property
+    def nodes(self) -> list:
+        return [self]
+
+    @property
+    def output_nodes(self) -> list:
+        return [self]
+
+    def get_node(self, name: str):
+        return self
+
+    def get_param(self, name: str):
+        if name == "units":
+            return self.units
+        return getattr(self, name)
+
+    def reset(self):
+        self.state = np.zeros(self.units, dtype=self.dtype)
+        return self
+
+    def __rshift__(self, readout):
+        # accepts a reservoirpy Ridge node or a plain ridge value
+        self.ridge = getattr(readout, "ridge", readout)
+        return self
+
+#--------------------------------STATE UPDATE---------------------------------#
+
+    def _states(self, X: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+
+        X = np.asarray(X, dtype=self.dtype).reshape(len(X),-1)
+
+        if out is None:
+            out = np.empty([len(X), self.units], dtype=self.dtype)
+
+        np.matmul(X, self.Win.T, out=out) # input projection of the whole stream
+        out += self.bias
+
+        x = self.state
+        W = self.W
+        lr = self.lr
+        for t in range(len(X)):
+            pre = out[t]
+            pre += W @ x
+            np.tanh(pre, out=pre)
+            pre *= lr
+            pre += (1 - lr) * x
+            x = pre
+
+        if len(X) > 0:
+            self.state = np.array(x)
+
+        return out
+
+#--------------------------------RUN AND FIT----------------------------------#
+
+    def run(self, X: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+
+        states = self._states(X, out)
+
+        if self.Wout is None:
+            return states
+
+        return states @ self.Wout + self.bout
+
+    def call(self, x: np.ndarray) -> np.ndarray:
+
+        return self.run(np.asarray(x).reshape(1,-1))
+
+    def fit(self, X: np.ndarray, Y: np.ndarray, warmup: int = 0, chunk_size: int = None):
+
+        if self.ridge is None:
+            raise ValueError("this NumPy_ESN has no readout. attach one with model >> Ridge(ridge=...)")
+
+        Y = np.asarray(Y).reshape(len(Y),-1)
+
+        if chunk_size is None:
+            states = self._states(X)
+            self._Set_Readout(*RO.Ridge_Solve(states[warmup:], Y[warmup:], self.ridge))
+            return self
+
+        readout = RO.Streaming_Ridge()
+        buffer = np.empty([chunk_size, self.units], dtype=self.dtype) # reused by every chunk
+        for start in range(0, len(X), chunk_size):
+            stop = min(start + chunk_size, len(X))
+            states = self._states(X[start:stop], buffer[:stop - start])
+            first = max(warmup - start, 0)
+            readout.Update(states[first:], Y[start + first:stop])
+        self._Set_Readout(*readout.Solve(self.ridge))
+
+        return self
+
+    def _Set_Readout(self, Wout: np.ndarray, bout: np.ndarray):
+
+        # solved in float64 (see Readout_V1), applied in the precision of the states
+        self.Wout = Wout.astype(self.dtype, copy=False)
+        self.bout = bout.astype(self.dtype, copy=False)
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+class NumPy_Ensemble ():
+
+#----------------------------------INIT---------------------------------------#
+
+    def __init__(
+                 self,
+                 weights: list, # one (W, Win, bias) tuple per member, all of the same size
+                 lr: list, # one leak rate per member
+                 dtype = np.float64
+                ):
+
+                    self.dtype = np.dtype(dtype)
+                    self.size = len(weights)
+                    self.units = weights[0][0].shape[0]
+
+                    if any(W.shape[0] != self.units for W, Win, bias in weights):
+                        raise ValueError("ensemble members must share the node count.")
+
+                    self.W = sparse.block_diag([W for W, Win, bias in weights], format='csr', dtype=self.dtype)
+                    self.Win = np.vstack([_dense(Win).reshape(self.units,-1) for W, Win, bias in weights]).astype(self.dtype)
+                    self.bias = np.concatenate([_dense(bias).reshape(-1) for W, Win, bias in weights]).astype(self.dtype)
+                    self.lr = np.repeat(np.asarray(lr, dtype=self.dtype), self.units)
+
+                    self.members = [Ensemble_Member(self, index, W, Win, bias, lr[index], dtype)
+                                    for index, (W, Win, bias) in enumerate(weights)]
+                    self.reset()
+
+    def reset(self):
+        self.state = np.zeros(self.size * self.units, dtype=self.dtype)
+        self._history = [] # batches not yet served to every member: (inputs, states)
+        self._offset = 0 # call number of the first batch in _history
+        for member in self.members:
+            member._cursor = 0
+        return self
+
+#--------------------------------STATE UPDATE---------------------------------#
+
+    def _states(self, X: np.ndarray) -> np.ndarray:
+
+        out = np.empty([len(X), self.size * self.units], dtype=self.dtype)
+
+        np.matmul(X, self.Win.T, out=out) # input projection of the whole stream, every member
+        out += self.bias
+
+        x = self.state
+        W = self.W
+        lr = self.lr
+        for t in range(len(X)):
+            pre = out[t]
+            pre += W @ x
+            np.tanh(pre, out=pre)
+            pre *= lr
+            pre += (1 - lr) * x
+            x = pre
+
+        if len(X) > 0:
+            self.state = np.array(x)
+
+        return out.reshape(len(X), self.size, self.units)
+
+    def _member_states(self, index: int, X: np.ndarray) -> np.ndarray:
+
+        member = self.members[index]
+        call = member._cursor - self._offset
+
+        if call == len(self._history): # first member to get here runs the whole ensemble
+            self._history.append((np.array(X), self._states(X)))
+
+        inputs, states = self._history[call]
+        if inputs.shape != X.shape or not np.array_equal(inputs, X):
+            raise ValueError("ensemble members must be run on the same inputs, in the same order.")
+        member._cursor += 1
+
+        while self._history and min(m._cursor for m in self.members) > self._offset:
+            self._history.pop(0)
+            self._offset += 1
+
+        return states[:, index, :]
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+class Ensemble_Member (NumPy_ESN):
+
+    def __init__(self, ensemble: NumPy_Ensemble, index: int, W, Win, bias, lr, dtype = np.float64):
+
+        super().__init__(W, Win, bias, lr=lr, dtype=dtype, name=f"Reservoir-NumPy-{index}")
+        self.ensemble = ensemble
+        self.index = index
+        self._cursor = 0
+
+    def _states(self, X: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+
+        X = np.asarray(X, dtype=self.dtype).reshape(len(X),-1)
+        states = self.ensemble._member_states(self.index, X)
+
+        if out is None:
+            return states
+
+        out[:] = states
+        return out
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+class Replay_ESN (NumPy_ESN):
+
+    def __init__(
+                 self,
+                 W, Win, bias, # weights of the recorded reservoir, or None if unknown
+                 inputs: np.ndarray, # (T, input dim) recorded input stream
+                 states: np.ndarray, # (T, units) states recorded for inputs
+                 lr: float = 0.1,
+                 ridge: float = None,
+                 dtype = np.float64,
+                 name: str = "Reservoir-Replay"
+                ):
+
+                    if W is None: # all zero stand-ins of the right shapes
+                        units = states.shape[1]
+                        W = sparse.csr_matrix((units, units))
+                        Win = np.zeros([units, np.asarray(inputs).reshape(len(inputs),-1).shape[1]])
+                        bias = np.zeros(units)
+
+                    super().__init__(W, Win, bias, lr=lr, ridge=ridge, dtype=dtype, name=name)
+                    self.inputs = np.asarray(inputs, dtype=self.dtype).reshape(len(inputs),-1)
+                    self.states = states
+                    self._cursor = 0 # next recorded timestep
+
+    def _states(self, X: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+
+        X = np.asarray(X, dtype=self.dtype).reshape(len(X),-1)
+        stop = self._cursor + len(X)
+
+        if stop > len(self.inputs) or not np.array_equal(self.inputs[self._cursor:stop], X):
+            raise ValueError("a replayed model can only be run on its recorded input stream, in order.")
+
+        states = self.states[self._cursor:stop]
+        self._cursor = stop
+        if len(X) > 0:
+            self.state = np.array(states[-1])
+
+        if out is None:
+            return np.array(states, dtype=self.dtype) # a copy, the recording is shared
+
+        out[:] = states
+        return out
+
+#-----------------------------------------------------------------------------#
+
+def _dense(matrix) -> np.ndarray:
+    if sparse.issparse(matrix):
+        return matrix.toarray()
+    return np.asarray(matrix)
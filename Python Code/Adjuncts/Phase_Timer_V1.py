@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 17:05:22 2026
+"""
+
+"""
+per phase instrumentation of GetDataset sweeps. code marks its phases with
+
+    with PT.Phase("harvest"):
+        ...
+
+which does nothing unless a Recorder is active in the process (see GetDataset,
+instrument=). phases are timed exclusively: time spent in a phase nested in another
+counts for the inner one only, so the phases of a point add up to its wall time.
+with memory=True the tracemalloc peak of every phase (nested phases included) and of
+the whole point is recorded too, tracemalloc slows python code down noticeably.
+
+    build   --> building the model (ESN_Maker, weights and nodes)
+    warmup  --> the init=True random step of ESN_Maker
+    harvest --> running reservoirs over input streams
+    fit     --> training readouts
+    metric  --> the metric, except its harvests and fits
+    io      --> result store, result cache and state cache reads and writes
+    other   --> anything not in a phase, e.g. input generation
+
+    Recorder --> Point() context records one point: {"wall" : s, "phases" : {phase : s},
+                 "peak" : {phase : bytes}, "peak total" : bytes}, returned by Last().
+                 Activate() makes it the recorder of the process, Close() deactivates it
+                 and stops tracemalloc if it was started by it.
+    Summary  --> receives the records of a run, returns count, total and mean time per
+                 phase, their share of the total and the largest peaks.
+"""
+
+import tracemalloc
+from time import perf_counter
+from contextlib import nullcontext
+
+_ACTIVE = None # Recorder of this process, None --> Phase() does nothing
+_NULL = nullcontext()
+
+class Recorder ():
+
+#----------------------------------INIT---------------------------------------#
+
+    def __init__(self, memory: bool = False):
+
+        self.memory = memory
+        self.stack = [] # [name, start, time of nested phases, peak]
+        self.record = None
+        self.tracing = memory and not tracemalloc.is_tracing() # started here, stopped by Close()
+
+        if self.tracing:
+            tracemalloc.start()
+
+#---------------------------------POINTS--------------------------------------#
+
+    def Point(self):
+        return _Phase(self, "other", point=True)
+
+    def Last(self) -> dict:
+        return self.record
+
+    def Activate(self):
+
+        global _ACTIVE
+        _ACTIVE = self
+
+    def Deactivate(self):
+
+        global _ACTIVE
+        if _ACTIVE is self:
+            _ACTIVE = None
+
+    def Close(self):
+
+        self.Deactivate()
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+#---------------------------------PHASES--------------------------------------#
+
+    def _Enter(self, name: str):
+
+        peak = 0
+        if self.memory:
+            if self.stack: # the peak so far belongs to the enclosing phase
+                self.stack[-1][3] = max(self.stack[-1][3], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        self.stack.append([name, perf_counter(), 0.0, peak])
+
+    def _Exit(self):
+
+        name, start, nested, peak = self.stack.pop()
+        elapsed = perf_counter() - start
+
+        phases = self.record["phases"]
+        phases[name] = phases.get(name, 0.0) + elapsed - nested
+
+        if self.memory:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            self.record["peak"][name] = max(self.record["peak"].get(name, 0), peak)
+
+        if self.stack:
+            self.stack[-1][2] += elapsed
+            if self.memory:
+                self.stack[-1][3] = max(self.stack[-1][3], peak)
+
+        return elapsed, peak
+
+#-----------------------------------------------------------------------------#
+
+class _Phase ():
+
+    def __init__(self, recorder: Recorder, name: str, point: bool = False):
+
+        self.recorder = recorder
+        self.name = name
+        self.point = point
+
+    def __enter__(self):
+
+        if self.point:
+            self.recorder.stack = []
+            self.recorder.record = {"wall" : 0.0, "phases" : {}}
+            if self.recorder.memory:
+                self.recorder.record["peak"] = {}
+        self.recorder._Enter(self.name)
+
+        return self.recorder
+
+    def __exit__(self, *exception):
+
+        elapsed, peak = self.recorder._Exit()
+
+        if self.point:
+            self.recorder.record["wall"] = elapsed
+            if self.recorder.memory:
+                self.recorder.record["peak total"] = peak
+
+        return False
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Phase (name: str):
+
+    if _ACTIVE is None or not _ACTIVE.stack: # not recording, or outside a point
+        return _NULL
+
+    return _Phase(_ACTIVE, name)
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Summary (records: list) -> dict:
+
+    phases = {}
+    for record in records:
+        for name, elapsed in record["phases"].items():
+            phases.setdefault(name, []).append(elapsed)
+
+    wall = sum(record["wall"] for record in records)
+    summary = {"records" : len(records),
+               "wall" : wall,
+               "phases" : {name : {"total" : sum(times),
+                                   "mean" : sum(times) / len(records),
+                                   "max" : max(times),
+                                   "share" : sum(times) / wall if wall > 0 else 0.0}
+                           for name, times in sorted(phases.items(), key=lambda item: -sum(item[1]))}}
+
+    peaks = [record for record in records if "peak" in record]
+    if peaks:
+        summary["peak total"] = max(record["peak total"] for record in peaks)
+        summary["peak"] = {name : max(record["peak"].get(name, 0) for record in peaks) for name in phases}
+
+    return summary
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 13 09:41:07 2026
+"""
+
+"""
+    linear readout training outside of reservoirpy, used by the NumPy reservoir engine
+    and by metrics that work directly on harvested states. the maths is the same as
+    reservoirpy.nodes.Ridge: a bias column of ones is prepended to the states, and the
+    ridge penalty is applied to every weight including the bias. X^T.X is always
+    accumulated and solved in float64, float32 states are upcast chunk by chunk.
+
+    Gram        --> receives states X and targets Y, returns X^T.X and Y^T.X with bias.
+    Solve_Gram  --> receives X^T.X, Y^T.X and ridge value, returns (Wout, bias).
+    Ridge_Solve --> receives states X, targets Y and ridge value, returns (Wout, bias).
+                    Y can hold several targets as columns, all solved together.
+
+    Ridge_Path  --> receives X^T.X, Y^T.X and a list of ridge values, returns one
+                    (Wout, bias) per ridge value. X^T.X is eigendecomposed once, each
+                    further ridge value only costs a matrix product.
+
+    Streaming_Ridge --> accumulates X^T.X and Y^T.X over chunks of states as they are
+                        produced, Solve(ridge) returns (Wout, bias), Solve_Path(ridges)
+                        the Ridge_Path of the accumulated matrices. memory is
+                        O(units^2 + targets * units) whatever the stream length.
+"""
+
+import numpy as np
+from scipy import linalg
+import Phase_Timer_V1 as PT
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Gram (X: np.ndarray, Y: np.ndarray, bias: bool = True):
+
+    X = np.asarray(X, dtype=np.float64).reshape(len(X),-1)
+    Y = np.asarray(Y, dtype=np.float64).reshape(len(Y),-1)
+
+    with PT.Phase("fit"):
+        if bias:
+            X = np.hstack([np.ones([len(X),1], dtype=X.dtype), X])
+
+        return X.T @ X, Y.T @ X
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Solve_Gram (XXT: np.ndarray, YXT: np.ndarray, ridge: float, bias: bool = True):
+
+    with PT.Phase("fit"):
+        ridgeid = ridge * np.eye(XXT.shape[0], dtype=XXT.dtype)
+        Wout_raw = linalg.solve(XXT + ridgeid, YXT.T, assume_a="sym")
+
+    if bias:
+        return Wout_raw[1:,:], Wout_raw[0,:]
+
+    return Wout_raw, np.zeros(Wout_raw.shape[1], dtype=Wout_raw.dtype)
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Ridge_Path (XXT: np.ndarray, YXT: np.ndarray, ridges: list, bias: bool = True) -> list:
+
+    # XXT = V.diag(eigenvalues).V^T, so (XXT + ridge.I)^-1 = V.diag(1 / (eigenvalues + ridge)).V^T
+    # for every ridge value at once. V^T.YXT^T is shared by all of them.
+
+    with PT.Phase("fit"):
+        eigenvalues, V = linalg.eigh(XXT)
+        projected = V.T @ YXT.T
+
+        readouts = []
+        for ridge in ridges:
+            Wout_raw = V @ (projected / (eigenvalues + ridge)[:,np.newaxis])
+            if bias:
+                readouts.append((Wout_raw[1:,:], Wout_raw[0,:]))
+            else:
+                readouts.append((Wout_raw, np.zeros(Wout_raw.shape[1], dtype=Wout_raw.dtype)))
+
+    return readouts
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def Ridge_Solve (X: np.ndarray, Y: np.ndarray, ridge: float, bias: bool = True):
+
+    XXT, YXT = Gram(X, Y, bias)
+
+    return Solve_Gram(XXT, YXT, ridge, bias)
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+class Streaming_Ridge ():
+
+    def __init__(self, bias: bool = True):
+
+        self.bias = bias
+        self.XXT = None
+        self.YXT = None
+        self.count = 0 # rows seen so far
+
+    def Update(self, X: np.ndarray, Y: np.ndarray):
+
+        if len(X) == 0:
+            return self
+
+        XXT, YXT = Gram(X, Y, self.bias)
+
+        if self.XXT is None:
+            self.XXT, self.YXT = XXT, YXT
+        else:
+            self.XXT += XXT
+            self.YXT += YXT
+        self.count += len(X)
+
+        return self
+
+    def Solve(self, ridge: float):
+
+        if self.XXT is None:
+            raise ValueError("Streaming_Ridge has not received any states.")
+
+        return Solve_Gram(self.XXT, self.YXT, ridge, self.bias)
+
+    def Solve_Path(self, ridges: list) -> list:
+
+        if self.XXT is None:
+            raise ValueError("Streaming_Ridge has not received any states.")
+
+        return Ridge_Path(self.XXT, self.YXT, ridges, self.bias)
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 14 11:05:18 2026
+"""
+
+"""
+persistent, content addressed cache of sweep point results for GetDataset. every
+result is stored under the sha256 of everything that determines it:
+
+    ESN parameters, seed, metric name, sha256 of the metric source file,
+    function parameters, training, gen_input, backend, sparse_W, reduced simulation precision
+    and reduced state precision
+
+so a rerun with the same seeds skips every point already computed, whether the previous
+run finished or died halfway, and extending a sweep range or adding datasets only costs
+the new points. files are written to a temporary name and renamed, so a crash can never
+leave a half written entry behind.
+
+    cache_dir/ab/abcdef....json --> {"point": what was hashed, "result": f_call return value}
+
+To_JSON is the json default= of the files written here and by Result_Store_V1 and
+State_Cache_V1: numpy scalars and arrays as python numbers and lists, anything else as
+its str.
+"""
+
+import json
+import hashlib
+from os import path, makedirs, replace, getpid
+
+class Result_Cache ():
+
+#----------------------------------INIT---------------------------------------#
+
+    def __init__(
+                 self,
+                 cache_dir: str, # created if it doesn't exist
+                 target_function: tuple, # (function name, path to its .py)
+                 training: bool = False,
+                 gen_input: bool = False,
+                 backend: str = 'reservoirpy',
+                 sparse_W: bool = False,
+                 state_dtype: str = None, # precision of stored states, see State_Cache_V1
+                 dtype: str = 'float64' # precision of the simulation, see ESN_Maker_V4
+                ):
+
+                    self.cache_dir = cache_dir
+                    makedirs(cache_dir, exist_ok=True)
+
+                    with open(target_function[1], 'rb') as source:
+                        source_hash = hashlib.sha256(source.read()).hexdigest()
+
+                    self.metric = {"metric" : target_function[0],
+                                   "source" : source_hash,
+                                   "training" : training,
+                                   "gen_input" : gen_input,
+                                   "backend" : backend}
+                    if sparse_W: # only when set, so existing entries keep their keys
+                        self.metric["sparse_W"] = sparse_W
+                    if state_dtype is not None and state_dtype != 'float64': # float64 states give the same results
+                        self.metric["state_dtype"] = state_dtype
+                    if dtype != 'float64':
+                        self.metric["dtype"] = dtype
+
+#-----------------------------------KEYS--------------------------------------#
+
+    def Point_Key(self, esn_params: dict, func_params, seed: int) -> str:
+
+        point = self.Point(esn_params, func_params, seed)
+        text = json.dumps(point, sort_keys=True, separators=(',',':'))
+
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def Point(self, esn_params: dict, func_params, seed: int) -> dict:
+
+        point = {"esn" : esn_params, "function" : func_params, "seed" : seed}
+        point.update(self.metric)
+
+        return json.loads(json.dumps(point, default=To_JSON)) # numpy scalars --> python
+
+    def _file(self, key: str) -> str:
+        return path.join(self.cache_dir, key[:2], key + ".json")
+
+#------------------------------READ AND WRITE---------------------------------#
+
+    def Has(self, key: str) -> bool:
+        return path.exists(self._file(key))
+
+    def Get(self, key: str):
+        with open(self._file(key), 'r') as infile:
+            return json.load(infile)["result"]
+
+    def Put(self, key: str, result, point: dict = None):
+
+        file = self._file(key)
+        makedirs(path.dirname(file), exist_ok=True)
+
+        temp = f"{file}.{getpid()}.tmp"
+        with open(temp, 'w') as outfile:
+            json.dump({"point" : point, "result" : result}, outfile, default=To_JSON)
+        replace(temp, file) # atomic, readers see the old state or the whole entry
+
+#-----------------------------------------------------------------------------#
+
+def To_JSON(value):
+    if hasattr(value, "tolist"): # numpy scalars and arrays, JSON dislikes np.int32 etc.
+        return value.tolist()
+    return str(value)
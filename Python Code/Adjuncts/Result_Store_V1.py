@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 14 15:47:40 2026
+"""
+
+"""
+append-only result store for GetDataset, one per (dataset, combo). replaces the build
+folder of one JSON file per sweep point. the store is a JSON-lines file:
+
+    line 1     --> {"test bed": test bed conditions}
+    line 2...  --> one f_call return value per line, in sweep order
+
+each result is appended and flushed as soon as it is available. Finalise() converts
+the store, in a single pass, into the .JSON list (test bed, result, result, ...) that
+Plot_HM reads. there is no limit on the number of points. Finalise_Columns() does the
+same for stores holding several metrics side by side, one .JSON per metric.
+"""
+
+import json
+from os import remove
+from Result_Cache_V1 import To_JSON
+
+class Result_Store ():
+
+#----------------------------------INIT---------------------------------------#
+
+    def __init__(self, file: str, test_bed: dict):
+
+        self.file = file
+        self.count = 0
+
+        with open(self.file, 'w') as outfile: # a new store, any previous one is overwritten
+            outfile.write(json.dumps({"test bed" : test_bed}, default=To_JSON) + "\n")
+
+#------------------------------WRITE AND READ---------------------------------#
+
+    def Append(self, result):
+
+        with open(self.file, 'a') as outfile:
+            outfile.write(json.dumps(result, default=To_JSON) + "\n")
+        self.count += 1
+
+    def Read(self):
+
+        # returns (test bed, list of results)
+
+        with open(self.file, 'r') as infile:
+            test_bed = json.loads(infile.readline())["test bed"]
+            results = [json.loads(line) for line in infile if line.strip()]
+
+        return test_bed, results
+
+#--------------------------------FINALISE-------------------------------------#
+
+    def Finalise(self, entry_path: str):
+
+        test_bed, results = self.Read()
+
+        with open(entry_path, 'w') as output_file:
+            json.dump([test_bed] + results, output_file, sort_keys=False, indent=0, separators=(',',':'))
+
+    def Finalise_Columns(self, entry_paths: list):
+
+        # for stores of several metrics side by side (see GetDataset): the test bed is a
+        # list of test beds and every result a list of results, one per metric. each
+        # metric is saved to its own .JSON, as Finalise would.
+
+        test_beds, results = self.Read()
+
+        for column, (entry_path, test_bed) in enumerate(zip(entry_paths, test_beds)):
+            with open(entry_path, 'w') as output_file:
+                json.dump([test_bed] + [result[column] for result in results], output_file, 
+                          sort_keys=False, indent=0, separators=(',',':'))
+
+    def Remove(self):
+        remove(self.file)
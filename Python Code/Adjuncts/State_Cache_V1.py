@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:08:45 2026
+"""
+
+"""
+persistent cache of harvested reservoir states for GetDataset, so that new metrics can
+be evaluated over a whole behaviour space without simulating a single reservoir. each
+entry holds the input stream and the state matrix harvested for it, as .npy files read
+back memory mapped, under the sha256 of what determines them:
+
+    ESN parameters (except ridge, the readout doesn't change the states), seed, backend,
+    sparse_W, training (a reservoirpy model with a readout starts from a zero state) and
+    the precision of the simulation, if not float64
+
+    state_dir/ab/abcdef....states.npy --> (input length, units) states, in dtype
+    state_dir/ab/abcdef....inputs.npy --> (input length, input dim) input stream, float64
+    state_dir/ab/abcdef....json       --> what was hashed
+
+states can be stored as float16 or float32 to save space, the metrics are then always
+evaluated on the stored values, whether the entry was just written or read back. the
+directory is kept under max_bytes: when a new entry goes over, the least recently used
+entries (by time of last Get or Put) are deleted, never the one just stored, even if it
+is larger than max_bytes on its own. the size of the directory is kept as a running
+total per process, from one walk of it when first used and the bytes of every Put since:
+the directory is only walked again (and entries evicted) once the total goes over
+max_bytes, or WALK_EVERY x max_bytes have been written since the last walk, so that
+entries written by other processes are counted too. eviction then goes down to
+(1 - WALK_EVERY) x max_bytes, so a full directory is not walked again on the next Put.
+files are written to a temporary name and renamed, so a crash never leaves a half
+written entry.
+"""
+
+import json
+import hashlib
+import numpy as np
+from os import path, makedirs, replace, remove, getpid, utime, walk
+from Result_Cache_V1 import To_JSON
+
+WALK_EVERY = 0.1 # fraction of max_bytes written by this process between two walks of the directory
+_TOTALS = {} # absolute state_dir --> [bytes in it, bytes written since the last walk], this process
+
+class State_Cache ():
+
+#----------------------------------INIT---------------------------------------#
+
+    def __init__(
+                 self,
+                 state_dir: str, # created if it doesn't exist
+                 max_bytes: int = 10 * 2**30, # size bound of the directory
+                 dtype: str = 'float64' # 'float64', 'float32' or 'float16'
+                ):
+
+                    if np.dtype(dtype) not in (np.float64, np.float32, np.float16):
+                        raise ValueError("states can be stored as float64, float32 or float16.")
+
+                    self.state_dir = state_dir
+                    self.max_bytes = max_bytes
+                    self.dtype = np.dtype(dtype)
+                    makedirs(state_dir, exist_ok=True)
+                    if path.abspath(state_dir) not in _TOTALS:
+                        self.Evict() # first use in this process, sizes the directory
+
+#-----------------------------------KEYS--------------------------------------#
+
+    def Key(self, esn_params: dict, seed: int, backend: str, sparse_W: bool, training: bool,
+            precision: str = 'float64') -> str:
+
+        point = self.Point(esn_params, seed, backend, sparse_W, training, precision)
+        text = json.dumps(point, sort_keys=True, separators=(',',':'))
+
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def Point(self, esn_params: dict, seed: int, backend: str, sparse_W: bool, training: bool,
+              precision: str = 'float64') -> dict:
+
+        esn_params = {name : value for name, value in esn_params.items() if name != "ridge"}
+        point = {"esn" : esn_params, "seed" : seed, "backend" : backend,
+                 "sparse_W" : sparse_W, "training" : training, "dtype" : self.dtype.name}
+        if precision != 'float64': # only when set, so existing entries keep their keys
+            point["precision"] = precision
+
+        return json.loads(json.dumps(point, default=To_JSON)) # numpy scalars --> python
+
+    def _file(self, key: str, kind: str) -> str:
+        return path.join(self.state_dir, key[:2], key + kind)
+
+#------------------------------READ AND WRITE---------------------------------#
+
+    def Get(self, key: str):
+
+        # returns (input stream, memory mapped states), or None if not stored
+
+        states_file = self._file(key, ".states.npy")
+        try:
+            states = np.load(states_file, mmap_mode='r')
+            inputs = np.load(self._file(key, ".inputs.npy"))
+        except (FileNotFoundError, ValueError): # not stored, or evicted meanwhile
+            return None
+
+        utime(states_file) # most recently used
+        return inputs, states
+
+    def Put(self, key: str, inputs: np.ndarray, states: np.ndarray, point: dict = None):
+
+        makedirs(path.dirname(self._file(key, "")), exist_ok=True)
+        inputs = np.asarray(inputs, dtype=np.float64).reshape(len(inputs),-1)
+
+        # states last: an entry counts as stored once its states file exists
+
+        temp = self._temp(key, ".json")
+        with open(temp, 'w') as outfile:
+            json.dump(point, outfile, default=To_JSON)
+        replace(temp, self._file(key, ".json")) # atomic
+
+        temp = self._temp(key, ".inputs.npy")
+        with open(temp, 'wb') as outfile:
+            np.save(outfile, inputs)
+        replace(temp, self._file(key, ".inputs.npy"))
+
+        temp = self._temp(key, ".states.npy")
+        stored = np.lib.format.open_memmap(temp, mode='w+', dtype=self.dtype, shape=states.shape)
+        stored[:] = states
+        stored.flush()
+        del stored
+        replace(temp, self._file(key, ".states.npy"))
+
+        written = sum(path.getsize(self._file(key, kind)) for kind in (".states.npy", ".inputs.npy", ".json"))
+        totals = _TOTALS.setdefault(path.abspath(self.state_dir), [0, 0])
+        totals[0] += written
+        totals[1] += written
+        if totals[0] > self.max_bytes or totals[1] > WALK_EVERY * self.max_bytes:
+            self.Evict(keep=key)
+
+        return self.Get(key)
+
+    def _temp(self, key: str, kind: str) -> str:
+        return f"{self._file(key, kind)}.{getpid()}.tmp"
+
+#--------------------------------EVICTION-------------------------------------#
+
+    def Evict(self, keep: str = None):
+
+        # if the directory is over max_bytes, deletes least recently used entries until
+        # it fits in (1 - WALK_EVERY) x max_bytes. resets the running total of the
+        # directory to what is left
+
+        entries = {} # key --> [last use, bytes]
+        for folder, _, files in walk(self.state_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                key = name.split(".")[0]
+                file = path.join(folder, name)
+                try:
+                    entry = entries.setdefault(key, [0.0, 0])
+                    entry[1] += path.getsize(file)
+                    if name.endswith(".states.npy"):
+                        entry[0] = path.getmtime(file)
+                except FileNotFoundError: # evicted by another process
+                    continue
+
+        total = sum(size for last_use, size in entries.values())
+        bound = self.max_bytes if total <= self.max_bytes else (1 - WALK_EVERY) * self.max_bytes # room for the next Puts
+        for key, (last_use, size) in sorted(entries.items(), key=lambda entry: entry[1][0]):
+            if total <= bound:
+                break
+            if key == keep:
+                continue
+            for kind in (".states.npy", ".inputs.npy", ".json"): # states first, see Put
+                try:
+                    remove(self._file(key, kind))
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+        _TOTALS[path.abspath(self.state_dir)] = [total, 0]
@@ -6,28 +6,76 @@ Created on Tue Aug 22 15:15:04 2023
 """
 
 """
-derived from calc sent by Chester Wringe, intended for use with GenDataset_V7.
+derived from calc sent by Chester Wringe, intended for use with GenDataset_V7, declared to it by METRIC.
 receives:
     
     model        --> reservoirpy.model, needs to have a ridge node as output
     input_stream --> numpy ndarray of shape (x,1)
     nc           --> number of neurons in reservoirpy.Reservoir node
     order        --> order
+    all_orders   --> if True, MC_n of every order 1 .. order from one fit and run of the model:
+                     the CALC FUTURE target of each order is a column of one target matrix, all
+                     scored against the same predictions. returns {"NMSE" : one per order, "total"}
+    legendre_profile --> if True, returns the Legendre capacity profile instead, see below.
+                         a separate measure, not MC_n per delay and order
+    max_delay    --> legendre_profile only, longest delay k. default nc
+    ridges       --> list of ridge values. if given, the readout is trained for all of them
+                     from one eigendecomposition (see Readout_V1.Ridge_Path) and a list of
+                     results is returned, one per ridge value. the model's own ridge is ignored
+    chunk_size   --> if given, the stream is run chunk_size steps at a time and no state matrix
+                     is kept: memory is O(nc^2), not O(len(input_stream)). the readout is then
+                     trained from the streamed states (see Readout_V1.Streaming_Ridge) with the
+                     model's ridge, as with ridges, instead of by model.fit()
+
+legendre_profile mode is a separate measure, the capacity profile of Dambre et al. (2012):
+MC_n scores one readout, trained to predict u(t + 1), by an NMSE against the polynomial
+target of CALC FUTURE, while the profile scores one readout per delay and degree by a
+squared correlation. its "order capacity"[d-1] is not MC_n(order=d), nor comparable to it,
+all_orders gives those.
+it harvests the reservoir states once, for the whole input stream, and builds the targets
+of every delay k = 1 .. max_delay and every degree d = 1 .. order as the columns of one
+target matrix:
+
+    y_k,d(t) = P_d( u(t - k) )     P_d = Legendre polynomial of degree d, u scaled to [-1:1]
+
+all readouts are trained together by one multi-target ridge solve (one factorisation,
+see Readout_V1) on the first half of the stream, after max_delay washout steps. the
+capacity of each target is the squared correlation between target and prediction on
+the second half. returns a dict:
+
+    "capacity"       --> list of max_delay lists of order capacities, [k-1][d-1]
+    "order capacity" --> list of capacities summed over delays, one per order
+    "total"          --> sum of all capacities
 """
 
 from reservoirpy import model
-from numpy import zeros, ndarray
-from scipy.special import binom
+from numpy import zeros, ndarray, asarray, arange, newaxis, stack, sum as npsum
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.special import binom, eval_legendre
+import Harvest_V1 as HV
+import Readout_V1 as RO
+import Phase_Timer_V1 as PT
+
+# how GetDataset calls it, see Metric_Registry_V1. runs and fits the model on the input stream, in order
+METRIC = {"function" : "MC_n", "needs_states" : True, "needs_training" : True, "input_stream" : True}
 
 #-----------------------------------------------------------------------------#
 
 def MC_n(model: model, 
          input_stream: ndarray, 
          nc: int, 
-         order : int = 1) -> float:
+         order : int = 1,
+         legendre_profile: bool = False,
+         max_delay: int = None,
+         chunk_size: int = None,
+         ridges: list = None,
+         all_orders: bool = False) -> float:
+    
+    if legendre_profile:
+        return _Legendre_Profile(model, input_stream, nc, order, max_delay, chunk_size, ridges)
     
     n = len(input_stream)
-    testing = False
+    orders = arange(1, order + 1) if all_orders else [order] # one column of targets each
  
 # TRAIN ESN #
 
@@ -40,52 +88,208 @@ def MC_n(model: model,
     Y_train = input_stream[1:m+1]
     assert len(X_train) == len(Y_train)
 
-    model = model.fit(X_train, Y_train, warmup=0) #training step
-    Y_pred = model.run(input_stream[m:]) #observed trained output
-    future = zeros([Y_pred.shape[0]]) # v(t + i) 
+    u = asarray(input_stream).reshape(n,-1)[:m,0] # inputs of CALC FUTURE
+    
+    if ridges is None and chunk_size is None:
+        with PT.Phase("fit"): # with the runs over X_train
+            model = model.fit(X_train, Y_train, warmup=0) #training step
+        with PT.Phase("harvest"):
+            Y_pred = model.run(input_stream[m:]) #observed trained output
+        Y_pred = Y_pred.reshape(len(Y_pred),-1)[:,:1] # one column per ridge value
+        sums = _Error_Sums(Y_pred, 0, u, orders, nc, m)
+    else:
+        # same states as fit() then run(), harvested from the reservoir node chunk_size
+        # steps at a time (whole stream if None). training chunks only update X^T.X and
+        # Y^T.X, test chunks are predicted and only update the error sums, so no chunk
+        # is kept. one readout per ridge value, the model's own if no ridges
+        _Initialise(model, X_train, Y_train)
+        reservoir = model.get_node(HV.Find_Reservoir(model))
+        if ridges is None:
+            ridge = getattr(model.output_nodes[-1], "ridge", None)
+        readout = RO.Streaming_Ridge()
+        readouts = None
+        sums = 0
+        for start, states in HV.Harvest_Chunks(reservoir, input_stream, chunk_size):
+            split = min(max(m - start, 0), len(states))
+            readout.Update(states[:split], Y_train[start:start + split])
+            if split == len(states):
+                continue
+            if readouts is None:
+                if ridges is None:
+                    readouts = [readout.Solve(1e-7 if ridge is None else ridge)]
+                else:
+                    readouts = readout.Solve_Path(ridges) # one eigendecomposition, all ridge values
+            Y_pred = stack([(states[split:] @ Wout + bout)[:,0] for Wout, bout in readouts], axis=1)
+            Y_pred = Y_pred.astype(states.dtype, copy=False) # precision of the reservoir
+            sums = sums + _Error_Sums(Y_pred, start + split - m, u, orders, nc, m)
 
-# CALC FUTURE #
+# CALC MSE #
+    
+    # one value per order (rows) and column of Y_pred, i.e. per ridge value (columns)
+    
+    sum_term, mean_term = sums
+    MSE = sum_term / m
+    MSE_av = (sum_term + mean_term) / m
+    
+# CALC NMSE #
 
-    first_term = 1 / ( 2**order )
-    sum_term = 0
+    NMSE = MSE / MSE_av
     
-    # future array is same length as the training set, and each list element is 
-    # updated singularly, as many times per element as is equal to the order. 
+    if all_orders:
+        results = [{"NMSE" : NMSE[:,column].tolist(), "total" : float(npsum(NMSE[:,column]))} for column in range(NMSE.shape[1])]
+    else:
+        results = NMSE[0].tolist()
     
-    for i in range(m): # for each element up to m in list of inputs
-        for j in range(order): # for each summation term (see n^th deg memory capacity formula)
-            binomial_term = binom(order,j) ** 2 # scipy.special function, returns result of binomial
-            first_term = (input_stream[i] - 1) ** (order - j) # (u(t) - 1)^(n-k)
-            second_term = (input_stream[i] + 1) ** j # (u(t) + 1) ^ k
-            sum_term = first_term * binomial_term * first_term * second_term
-            future[i] = future[i] + sum_term #update each list element as many times as order
+    if ridges is None:
+        return results[0]
     
-    if testing:
-        assert len(future) == len(Y_pred)
+    return results
 
-# CALC MSE #
-            
-    sum_term = 0
+#-----------------------------------------------------------------------------#
+
+def _Error_Sums(Y_pred: ndarray, offset: int, u: ndarray, orders: list, nc: int, m: int) -> ndarray:
     
-    for i in range(nc):
-        sum_term = sum_term + ( future[i] - Y_pred[i] ) ** 2
+    # CALC FUTURE and the two sums of squared errors of the NMSE over the test steps
+    # offset .. offset + len(Y_pred). the future array has one column per order, its
+    # first m elements are built from the first m inputs u(t), see _Future, the others
+    # are zero. returns [sum over t < nc, sum over t < m of the error to Y_pred / m],
+    # each per order (rows) and column of Y_pred (columns). sums of consecutive chunks
+    # add up to those of the whole test set.
     
-    MSE = sum_term / m
-    y_pred_mean = Y_pred / m
+    steps = arange(offset, offset + len(Y_pred))
+    future = zeros([len(steps), len(orders)], dtype=Y_pred.dtype) # v(t + i), in the precision of the reservoir
+    future[steps < m] = _Future(u[steps[steps < m]], orders)
     
-    for i in range(m):
-        sum_term = sum_term + ( future[i] - y_pred_mean[i] ) ** 2
+    future = future[:,:,newaxis]
+    Y_pred = Y_pred[:,newaxis,:]
+    sum_term = npsum( ( future[steps < nc] - Y_pred[steps < nc] ) ** 2, axis=0 )
     
-    MSE_av = sum_term / m
+    y_pred_mean = Y_pred / m
+    mean_term = npsum( ( future[steps < m] - y_pred_mean[steps < m] ) ** 2, axis=0 )
     
-# CALC NMSE #
+    return stack([sum_term, mean_term])
 
-    NMSE = MSE / MSE_av
+#-----------------------------------------------------------------------------#
+
+def _Future(u: ndarray, orders: list) -> ndarray:
+    
+    # CALC FUTURE target of every order, as columns, for the inputs u(t). for each
+    # order, in one expression over the whole array: each summation term j (see n^th
+    # deg memory capacity formula) is a row of terms, and the rows are added together.
+    # binomial coefficients are computed once, for all j.
     
-    return NMSE[0]
+    columns = []
+    for order in orders:
+        j = arange(order)[:,newaxis] # summation terms, one row each
+        
+        binomial_term = binom(order,j) ** 2 # scipy.special function, returns result of binomial
+        first_term = (u - 1) ** (order - j) # (u(t) - 1)^(n-k)
+        second_term = (u + 1) ** j # (u(t) + 1) ^ k
+        columns.append((first_term * binomial_term * first_term * second_term).sum(axis=0))
+    
+    return stack(columns, axis=1)
 
+#-----------------------------------------------------------------------------#
 
+def _Legendre_Profile(model: model,
+                input_stream: ndarray,
+                nc: int,
+                order: int = 1,
+                max_delay: int = None,
+                chunk_size: int = None,
+                ridges: list = None) -> dict:
+    
+    if max_delay is None:
+        max_delay = nc
+    
+    u = asarray(input_stream).reshape(len(input_stream),-1)[:,0]
+    n = len(u)
+    m = int( n / 2 )
+    
+    if m - max_delay < 2:
+        raise ValueError(f"input stream of length {n} is too short for max_delay = {max_delay}.")
+    
+    path = ridges is not None
+    if not path:
+        ridge = getattr(model.output_nodes[-1], "ridge", None)
+        ridges = [1e-7 if ridge is None else ridge]
+    
+    u_min, u_max = u.min(), u.max()
+    degrees = arange(1, order + 1)
+    
+    _Initialise(model, input_stream[:1], input_stream[1:2])
+    reservoir = model.get_node(HV.Find_Reservoir(model))
+    readout = RO.Streaming_Ridge()
+    readouts = None
+    sums = zeros([len(ridges), 5, max_delay * order]) # per ridge value, test set sums of p, y, p^2, y^2, p*y
+    
+# HARVEST, TRAIN AND TEST #
 
+    # the stream is run through the reservoir once, chunk_size steps at a time (whole 
+    # stream if None). training chunks only update X^T.X and Y^T.X, test chunks only
+    # update the sums needed for the correlations, so no chunk is kept.
+    
+    for start, states in HV.Harvest_Chunks(reservoir, input_stream, chunk_size):
+        
+        stop = start + len(states)
+        first = max(start, max_delay) # max_delay washout steps
+        if first >= stop:
+            continue
+        states = states[first - start:]
+        
+        # targets of every delay and order, for every timestep of the chunk at once.
+        # lagged[i, k-1] = u(first + i - k), columns run over delays first, then
+        # orders: column (k-1) * order + (d-1)
+        
+        scaled = 2 * (u[first - max_delay:stop - 1] - u_min) / (u_max - u_min + 1e-16) - 1
+        lagged = sliding_window_view(scaled, max_delay)[:,::-1]
+        targets = eval_legendre(degrees, lagged[:,:,newaxis]).reshape(len(lagged),-1)
+        
+        split = min(max(m - first, 0), len(states))
+        readout.Update(states[:split], targets[:split])
+        
+        if split == len(states):
+            continue
+        if readouts is None:
+            if path:
+                readouts = readout.Solve_Path(ridges) # one eigendecomposition, all ridge values
+            else:
+                readouts = [readout.Solve(ridges[0])] # one solve, all targets
+        
+        Y_test = targets[split:]
+        for index, (Wout, bout) in enumerate(readouts):
+            Y_pred = states[split:] @ Wout + bout
+            sums[index] += [npsum(Y_pred, axis=0), npsum(Y_test, axis=0), npsum(Y_pred ** 2, axis=0),
+                            npsum(Y_test ** 2, axis=0), npsum(Y_pred * Y_test, axis=0)]
+    
+# CAPACITY #
 
+    # squared correlation of every column at once
+    
+    count = n - m
+    results = []
+    for p, y, p2, y2, py in sums:
+        covariance = py - p * y / count
+        variance = (p2 - p ** 2 / count) * (y2 - y ** 2 / count)
+        
+        capacity = (covariance ** 2 / (variance + 1e-16)).reshape(max_delay, order)
+        
+        results.append({"capacity" : capacity.tolist(),
+                        "order capacity" : npsum(capacity, axis=0).tolist(),
+                        "total" : float(npsum(capacity))})
+    
+    if path:
+        return results
+    
+    return results[0]
 
+#-----------------------------------------------------------------------------#
 
+def _Initialise(model: model, X: ndarray, Y: ndarray):
+    
+    # model.fit() initialises a reservoirpy model that has not been run as a whole yet,
+    # which resets its reservoir state to zero. states harvested from the reservoir node
+    # alone must start from the same state.
+    
+    if not getattr(model, "is_initialized", True):
+        model.initialize(X[:1], Y[:1])
@@ -7,7 +7,7 @@ Created on Thu Aug 17 15:04:45 2023
 
 """ 
 function for calculating the shannon entropy of the output matrix of an ESN.
-intended for use with GetDataset_V7.
+intended for use with GetDataset_V7, declared to it by METRIC.
 receives:
     
     model          --> reservoirpy.model, needs to have a ridge node as output
@@ -15,37 +15,87 @@ receives:
     columnwise     --> boolean, if true output matrix columns are concatenated. if false, rows.
     history length --> number of output matrix elements to consider as history when determining events
     bucket_count   --> inverse of size of event thresholds. example: bucket_count = 10 -> event thresholds are 0.1 wide.
+    sparse         --> boolean, if true only observed events are stored and unobserved events are accounted
+                       for in closed form. memory scales with stream length, not bucket_count^(history_length+1).
+    chunk_size     --> if given, the states are harvested, scaled, bucketed and counted chunk_size rows
+                       at a time (columnwise: in blocks of columns of the same size). neither the
+                       flattened matrix nor its scaled copy is ever built. same result as without.
+    memmap_dir     --> if given, the states are harvested into a numpy.memmap in a temporary folder
+                       there, deleted afterwards, instead of into memory. chunk_size defaults to 1024.
     
+columnwise, history_length and bucket_count can also be lists (or tuples), e.g.
+columnwise = [False, True], history_length = [1,2,3], bucket_count = [10,20]. the states are
+then harvested once and the whole table is returned, as a dict:
+    
+    "columnwise"     --> list of orderings
+    "history_length" --> list of history lengths
+    "bucket_count"   --> list of bucket counts
+    "entropy"        --> entropies, [ordering][history length][bucket count], in the orders above
+    
+the events are counted once per ordering and bucket count, with the longest history length.
+the histograms of shorter histories are its marginals, plus the few events at the start of
+the stream that are too short for the longest history. the entropies are the same as those
+of separate calls.
+
+Streaming_Entropy is a generator of the entropy of a sliding window over states as they
+are produced, for streams too long (or unbounded) to be held or harvested first:
+    
+    states         --> iterable of state vectors (units,) or chunks of them (n, units), e.g.
+                       (states for start, states in HV.Harvest_Chunks(model, input_stream, 100))
+    window         --> number of timesteps in the window. window * units must exceed
+                       history_length, so that a window holds an event (ValueError otherwise)
+    history_length --> as above
+    bucket_count   --> as above
+    low, high      --> range scaled to [0:1] before bucketing, fixed since the min and max of
+                       an unbounded stream are not known. default [-1:1], the range of tanh
+                       states. values outside it fall in the first or last bucket.
+    stride         --> timesteps between two entropies
+    
+yields the entropy of the last window timesteps, rowwise, as Shannon_Entropy(sparse=True)
+would give for them with this scaling, once window timesteps have been seen and then every
+stride timesteps. the histogram is updated with the events entering and leaving the
+window, and its entropy from sum(c * log(c)), updated alongside: O(1) per symbol,
+whatever the window length, bucket_count and history_length.
 """
 
 import numpy as np
+import tempfile
+from collections import deque
+import shutil
+from os import path
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy.stats import entropy
-from itertools import product
+from math import log
 from reservoirpy import model
+import Harvest_V1 as HV
+
+# how GetDataset calls it, see Metric_Registry_V1. only harvests the states of the input stream
+METRIC = {"function" : "Shannon_Entropy", "needs_states" : True, "needs_training" : False, "input_stream" : True}
 
 def Shannon_Entropy (model: model = None,
                      input_stream: np.ndarray = None,
                      columnwise : bool = False, 
                      history_length : int = 2,
-                     bucket_count: int = 10):
+                     bucket_count: int = 10,
+                     sparse: bool = False,
+                     chunk_size: int = None,
+                     memmap_dir: str = None):
     
 #----------------#GENERATE INPUT STREAM AND OUTPUT MATRIX#--------------------#
     
     if input_stream is None: # create random input stream if none provided
-        # get reservoir neuron count:
-        res_name = model.node_names 
-        for name in res_name:
-            if any(x == 'R' for x in name):
-                res_name = name
-                break
-        stream_length = model.get_node(f"{res_name}").get_param("units") * 4                   
-        input_stream = np.random.random([stream_length,1]) - 0.5 # input range [-0.5:0.5]
-        
-    output_matrix = np.zeros([input_stream.shape[0], 
-                              model.nodes[-1].output_dim]) # matrix of zeros, of size (input length, neurons)
-    
-    for index, data in enumerate(input_stream): # initialise reservoir with 1 input datapoint
-        output_matrix[index] = model.call(data)[0] # creates row of the output of n output nodes.
+        input_stream = HV.Gen_Input_Stream(model) # 4 * reservoir neuron count, range [-0.5:0.5]
+    
+    table = any(isinstance(value, (list, tuple, np.ndarray)) for value in (columnwise, history_length, bucket_count))
+    
+    if table or chunk_size is not None or memmap_dir is not None: # one harvest, see _Entropy_Table
+        entropies = _Entropy_Table(model, input_stream, _Values(columnwise, bool), _Values(history_length, int),
+                                   _Values(bucket_count, int), sparse, chunk_size, memmap_dir)
+        if table:
+            return entropies
+        return entropies["entropy"][0][0][0]
+        
+    output_matrix = HV.Harvest_States(model, input_stream) # one batched run, of size (input length, neurons)
    
 #------------#RESHAPE MATRIX, PLACE ELEMENTS IN EVENT INTERVALS#--------------#
         
@@ -56,53 +106,123 @@ def Shannon_Entropy (model: model = None,
 
     output_matrix = (output_matrix - output_matrix.min()) / (output_matrix.max() - output_matrix.min() + 1e-16) # scale
 
-    for index, value in enumerate(output_matrix):          
-        output_matrix[index] = int(value * bucket_count) + 1 # replace matrix element with number of bucket within which it falls
-        
-        if output_matrix[index] == bucket_count + 1: # avoids elements exactly equal to upper threshold of final bucket generating error
-            output_matrix[index] = bucket_count
+    symbols = _Bucket_Symbols(output_matrix, bucket_count) # bucket of every element, numbered from 0
+    
+    if sparse:
+        _, counts = _Observed_Events(symbols, bucket_count, history_length)
+        return _Sparse_Entropy(counts, bucket_count, history_length)
         
-#------------------------#GENERATE POSSIBLE EVENTS#---------------------------#
+#-------------------------#COUNT EVENT OCCURENCES#----------------------------#
+
+    """
+    every event (history_length + 1 consecutive symbols) is encoded as a single
+    base-bucket_count integer, most significant digit first. this is exactly the
+    index the event would have in the lexicographically ordered list of all
+    possible events, so np.bincount with a minlength of bucket_count^(h+1) gives
+    the same occurences list as counting over product(buckets, repeat=h+1).
+    """
 
-    buckets = np.arange(1,bucket_count+1) # numbers each bucket
+    codes = _Event_Codes(symbols, bucket_count, history_length)
+    occurences = np.bincount(codes, minlength=bucket_count ** (history_length + 1))
     
-    possible_events = list(product(buckets,repeat=(history_length+1))) # itertools.permutations does not allow repititions
-    possible_events = list(np.unique(possible_events,axis=0)) # remove repeated events
+    return _Dense_Entropy(occurences, bucket_count, history_length)
+                 
+#-----------------------------------------------------------------------------#
 
-    event_index = {tuple(y): x for x, y in enumerate(possible_events)} # create dict with all possible events for rapid lookup
+def Streaming_Entropy (states,
+                       window: int,
+                       history_length: int = 2,
+                       bucket_count: int = 10,
+                       low: float = -1.0,
+                       high: float = 1.0,
+                       stride: int = 1):
     
-#-------------------------#COUNT EVENT OCCURENCES#----------------------------#
+    if window < 1 or stride < 1:
+        raise ValueError("window and stride must be at least 1.")
+    
+    codes = bucket_count ** (history_length + 1) <= np.iinfo(np.int64).max # else rows of symbols, as tuples
+    counts = {} # event --> occurences in the window
+    events = deque() # events in the window, oldest first
+    carry = np.zeros(0, dtype=np.int64) # last history_length symbols
+    c_log_c = 0.0
+    seen = 0
+    since_sum = 0 # steps since c_log_c was last summed from scratch
+    
+    for chunk in states:
+        chunk = np.asarray(chunk)
+        chunk = chunk.reshape(1, -1) if chunk.ndim == 1 else chunk.reshape(len(chunk), -1)
+        capacity = window * chunk.shape[1] - history_length # events in a full window
+        if capacity <= 0:
+            raise ValueError(f"a window of {window} steps of {chunk.shape[1]} units holds no event of "
+                             f"history_length {history_length}: window * units must exceed history_length.")
+        
+        for row in chunk:
+            scaled = np.clip((row - low) / (high - low + 1e-16), 0, 1)
+            symbols = np.concatenate([carry, _Bucket_Symbols(scaled, bucket_count)])
+            carry = symbols[max(len(symbols) - history_length, 0):]
+            
+            if codes:
+                entering = _Event_Codes(symbols, bucket_count, history_length).tolist()
+            else:
+                entering = [tuple(event) for event in sliding_window_view(symbols, history_length + 1)] \
+                           if len(symbols) > history_length else []
+                
+#---------------------------#MOVE THE WINDOW#---------------------------------#
+            
+            # c --> c + 1 adds (c + 1) log(c + 1) - c log(c) to sum(c * log(c)), and
+            # c --> c - 1 takes it away again
+            
+            for event in entering:
+                count = counts.get(event, 0)
+                counts[event] = count + 1
+                c_log_c += _C_Log_C(count + 1) - _C_Log_C(count)
+                events.append(event)
+            
+            while len(events) > capacity:
+                event = events.popleft()
+                count = counts[event]
+                c_log_c += _C_Log_C(count - 1) - _C_Log_C(count)
+                if count == 1:
+                    del counts[event]
+                else:
+                    counts[event] = count - 1
+            
+            seen += 1
+            since_sum += 1
+            if seen < window or (seen - window) % stride:
+                continue
+            
+            if since_sum >= window: # the window has turned over, rounding errors are dropped
+                c_log_c = sum(_C_Log_C(count) for count in counts.values())
+                since_sum = 0
+                
+            yield _Closed_Form(float(len(events)), len(counts), c_log_c, bucket_count, history_length)
+    
+#-----------------------------------------------------------------------------#
 
-    scrolling_window = []
-    occurences = [0] * len(possible_events) # list for counting event occurences, begins as list of zeros
+def _C_Log_C(count: int) -> float:
+    return count * log(count) if count > 1 else 0.0
 
-    for index, value in enumerate(output_matrix):  
+#-----------------------------------------------------------------------------#
 
-            scrolling_window.append(value)
-            
-            if len(scrolling_window) > history_length + 1: 
-                scrolling_window.pop(0)
-            
-            if len(scrolling_window) == history_length + 1: # history 1, history 2, current
-                occurences[event_index[tuple(scrolling_window)]] += 1 #check event index for occurence, if true return index, increment occurences
-                 
-                 
+def _Dense_Entropy(occurences: np.ndarray, bucket_count: int, history_length: int) -> float:
+    
 #------------------#ADD NO HISTORY EVENTS AND OCCURENCES#---------------------#
 
     """ 
     for a set of symbols, a number of extra states arise from the addition of a
     "no history" prefix - a fourth symbol, which cannot however appear in all 
     possible positions in the sequence. the only events observed with no history
-    are those where scrolling_window has a length less than history_length + 1. 
+    are those where the event window has a length less than history_length + 1. 
     for example:
         
         events = a b c
         history length = 2
         
-    the first value appended to scrolling_window can only be either a, b or c.
+    the first value in the event window can only be either a, b or c.
     so we get 1 observed event with no history, with 3 possible events.
     
-    the second value appended to scrolling_window can again only be either 
+    the second value in the event window can again only be either 
     a, b or c, meaning that we get 1 observed event with partial history, from a
     possible 9 events. 
     
@@ -116,29 +236,288 @@ def Shannon_Entropy (model: model = None,
     
     the position of where these occurences and possible events are stored in the
     occurences list doesn't influence the entropy calculation, so they are appended
-    after all the scrolling_window loops for simpliocity. This is what the 
+    after all the counted events for simpliocity. This is what the 
     following block is doing:
         """
 
+    no_history = []
     for i in range(1,history_length+1,1):
-        occurences.append(1)
-        states = (bucket_count) ** i
-        for j in range(states):
-            occurences.append(0)
+        states = np.zeros((bucket_count) ** i + 1) 
+        states[0] = 1 # 1 observed event, followed by the possible events with i symbols of history
+        no_history.append(states)
+
+    occurences = np.concatenate([occurences] + no_history).astype(float)
 
 #--------------------------#ENTROPY CALCULATION#------------------------------#
 
-    for i in range(len(occurences)):
-        if occurences[i] == 0:
-            occurences[i] = 1e-10
+    occurences[occurences == 0] = 1e-10
     
     H = entropy(occurences,base=len(occurences)) # from scipy.stats
     
-    return H        
+    return H
 
+#-----------------------------------------------------------------------------#
 
+def _Entropy_Table(model: model, input_stream: np.ndarray, orders: list, history_lengths: list,
+                   bucket_counts: list, sparse: bool, chunk_size: int, memmap_dir: str) -> dict:
+    
+    """
+    the states are harvested once, into memory, chunk by chunk (chunk_size) or into
+    a memory map in a temporary folder (memmap_dir), and read back for the global
+    min and max. then, for every ordering and bucket count, the flat sequence is
+    visited piece by piece in its own order:
+        
+        rowwise    --> chunk_size consecutive rows, flattened in C order
+        columnwise --> blocks of whole columns of about as many elements, in F order
+        
+    and the events of the longest history length are counted (see _Count_Events).
+    every history length is then evaluated from that one histogram. without chunk_size
+    and memmap_dir a piece is the whole matrix, as in the in memory path.
+    """
+    
+    folder = tempfile.mkdtemp(prefix="shannon_", dir=memmap_dir) if memmap_dir is not None else None
+    try:
+        if chunk_size is None and folder is None:
+            states = HV.Harvest_States(model, input_stream)
+            chunk_size = max(len(states), 1)
+        else:
+            chunk_size = chunk_size or 1024
+            states = _Harvest_Matrix(model, input_stream, chunk_size, folder)
+        
+        low, high = np.inf, -np.inf
+        for piece in _Pieces(states, False, chunk_size)():
+            low, high = min(low, piece.min()), max(high, piece.max())
+        
+        longest = max(history_lengths)
+        table = []
+        for columnwise in orders:
+            pieces = _Pieces(states, columnwise, chunk_size)
+            entropies = np.zeros([len(history_lengths), len(bucket_counts)])
+            for j, bucket_count in enumerate(bucket_counts):
+                counts, head = _Count_Events(pieces, low, high, bucket_count, longest, sparse)
+                for i, history_length in enumerate(history_lengths):
+                    marginal = _Marginal(counts, head, bucket_count, longest, history_length, sparse)
+                    if sparse:
+                        entropies[i, j] = _Sparse_Entropy(marginal, bucket_count, history_length)
+                    else:
+                        entropies[i, j] = _Dense_Entropy(marginal, bucket_count, history_length)
+            table.append(entropies.tolist())
+        
+        return {"columnwise" : orders, "history_length" : history_lengths, "bucket_count" : bucket_counts,
+                "entropy" : table}
+    
+    finally:
+        states = pieces = None # closes the memory map before its file is removed
+        if folder is not None:
+            shutil.rmtree(folder, ignore_errors=True)
+
+#-----------------------------------------------------------------------------#
+
+def _Values(value, kind) -> list:
+    
+    # a scalar or a list of them --> list of python scalars
+    
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [kind(item) for item in value]
+    return [kind(value)]
 
+#-----------------------------------------------------------------------------#
 
+def _Count_Events(pieces, low, high, bucket_count: int, history_length: int, sparse: bool):
+    
+    # scales, buckets and counts the events of every piece. the last history_length
+    # symbols of a piece are prepended to the next, so the events spanning two pieces
+    # are counted once. returns the dense occurences, or (observed events, counts) if
+    # sparse, and the first history_length symbols of the sequence (see _Marginal).
+    
+    carry = np.zeros(0, dtype=np.int64) # symbols preceding the current piece
+    head = np.zeros(0, dtype=np.int64)
+    occurences = np.zeros(bucket_count ** (history_length + 1) if not sparse else 0, dtype=np.int64)
+    observed = []
+    for piece in pieces():
+        scaled = (piece - low) / (high - low + 1e-16)
+        symbols = np.concatenate([carry, _Bucket_Symbols(scaled, bucket_count)])
+        if len(head) < history_length:
+            head = np.concatenate([head, symbols[len(carry):]])[:history_length]
+        if sparse:
+            observed.append(_Observed_Events(symbols, bucket_count, history_length))
+        else:
+            occurences += np.bincount(_Event_Codes(symbols, bucket_count, history_length),
+                                      minlength=len(occurences))
+        carry = symbols[max(len(symbols) - history_length, 0):]
+    
+    if not sparse:
+        return occurences, head
+    
+    return _Merge_Events([events for events, counts in observed], [counts for events, counts in observed]), head
 
+#-----------------------------------------------------------------------------#
 
+def _Merge_Events(events: list, counts: list):
+    
+    # sums the counts of equal events, returns them sorted as _Observed_Events does
+    
+    events, counts = np.concatenate(events), np.concatenate(counts)
+    merged, inverse = np.unique(events, axis=0 if events.ndim > 1 else None, return_inverse=True)
+    
+    return merged, np.bincount(inverse.reshape(-1), weights=counts, minlength=len(merged)).astype(np.int64)
 
+#-----------------------------------------------------------------------------#
+
+def _Marginal(counts, head: np.ndarray, bucket_count: int, longest: int, history_length: int, sparse: bool):
+    
+    """
+    histogram of the events of history_length from that of the longest history. an
+    event of the longest history is (longest + 1) symbols, most significant first,
+    and ends with the event of history_length, so summing over its first
+    longest - history_length symbols gives the events of history_length that end
+    at position longest or later. the longest - history_length events before those
+    lie in head, the first longest symbols of the sequence, and are added. returns
+    the dense occurences, or the counts of the observed events, sorted, if sparse.
+    """
+    
+    drop = longest - history_length
+    if not sparse:
+        occurences = counts.reshape(bucket_count ** drop, -1).sum(axis=0)
+        return occurences + np.bincount(_Event_Codes(head, bucket_count, history_length),
+                                        minlength=len(occurences))
+    
+    events, counts = counts
+    first_events, first_counts = _Observed_Events(head, bucket_count, history_length)
+    if events.ndim > 1: # rows of symbols, see _Observed_Events
+        events = events[:, drop:]
+        if first_events.ndim == 1: # the shorter events fit in an int64, back to rows of symbols
+            first_events = sliding_window_view(head, history_length + 1) if len(head) > history_length \
+                           else np.zeros([0, history_length + 1], dtype=np.int64)
+            first_counts = np.ones(len(first_events), dtype=np.int64)
+    else:
+        events = events % bucket_count ** (history_length + 1)
+    
+    return _Merge_Events([events, first_events], [counts, first_counts])[1]
+
+#-----------------------------------------------------------------------------#
+
+def _Harvest_Matrix(model: model, input_stream: np.ndarray, chunk_size: int, folder: str) -> np.ndarray:
+    
+    # harvests chunk_size rows at a time into a (T, units) matrix, a .npy memory map
+    # in folder if given. only one chunk of states is held in memory besides it.
+    
+    states = None
+    for start, chunk in HV.Harvest_Chunks(model, input_stream, chunk_size):
+        if states is None:
+            shape = (len(input_stream), chunk.shape[1])
+            if folder is None:
+                states = np.empty(shape, dtype=chunk.dtype)
+            else:
+                states = np.lib.format.open_memmap(path.join(folder, "states.npy"), mode='w+',
+                                                   dtype=chunk.dtype, shape=shape)
+        states[start:start + len(chunk)] = chunk
+    
+    return states
+
+#-----------------------------------------------------------------------------#
+
+def _Pieces(states: np.ndarray, columnwise: bool, chunk_size: int):
+    
+    # returns a generator function over consecutive pieces of the flattened states,
+    # each about chunk_size rows worth of elements, as 1D arrays in memory.
+    
+    rows, units = states.shape
+    
+    if not columnwise:
+        def pieces():
+            for start in range(0, rows, chunk_size):
+                yield np.asarray(states[start:start + chunk_size]).reshape(-1)
+        return pieces
+    
+    width = max(chunk_size * units // max(rows, 1), 1) # columns per block
+    def pieces():
+        for start in range(0, units, width):
+            yield np.asarray(states[:, start:start + width]).reshape(-1, order='F')
+    return pieces
+
+#-----------------------------------------------------------------------------#
+
+def _Bucket_Symbols(scaled: np.ndarray, bucket_count: int) -> np.ndarray:
+    
+    # scaled values lie in [0:1]. elements exactly equal to the upper threshold of
+    # the final bucket are placed in the final bucket.
+    
+    symbols = (scaled * bucket_count).astype(np.int64)
+    symbols[symbols == bucket_count] = bucket_count - 1
+    
+    return symbols
+
+#-----------------------------------------------------------------------------#
+
+def _Event_Codes(symbols: np.ndarray, bucket_count: int, history_length: int) -> np.ndarray:
+    
+    # horner's scheme over the h+1 shifted views of the symbol sequence, so the
+    # loop runs history_length + 1 times whatever the stream length.
+    
+    event_count = max(len(symbols) - history_length, 0)
+    codes = np.zeros(event_count, dtype=np.int64)
+    
+    for shift in range(history_length + 1):
+        codes = codes * bucket_count + symbols[shift:shift + event_count]
+        
+    return codes
+
+#-----------------------------------------------------------------------------#
+
+def _Observed_Events(symbols: np.ndarray, bucket_count: int, history_length: int):
+    
+    # returns only the events that occur and their occurences, as a sorted array of
+    # event codes. if bucket_count^(h+1) does not fit in an int64 the events are 
+    # kept as rows of symbols instead, sorted lexicographically.
+    
+    if bucket_count ** (history_length + 1) <= np.iinfo(np.int64).max:
+        codes = _Event_Codes(symbols, bucket_count, history_length)
+        return np.unique(codes, return_counts=True)
+    
+    if len(symbols) <= history_length:
+        return np.zeros([0, history_length + 1], dtype=np.int64), np.zeros(0, dtype=np.int64)
+    
+    windows = sliding_window_view(symbols, history_length + 1)
+    return np.unique(windows, axis=0, return_counts=True)
+
+#-----------------------------------------------------------------------------#
+
+def _Sparse_Entropy(counts: np.ndarray, bucket_count: int, history_length: int,
+                    eps: float = 1e-10) -> float:
+    
+    """
+    closed form of entropy(occurences, base=len(occurences)) for the dense
+    occurences list, without building it. the dense list holds:
+        
+        observed events           --> their counts c
+        no history events         --> history_length ones
+        every other possible event --> eps
+        
+    with S the sum of the list and L its length, the entropy is:
+        
+        H = ( log(S) - ( sum(c * log(c)) + zeros * eps * log(eps) ) / S ) / log(L)
+        
+    L and the number of zeros are python ints, so they do not overflow for large
+    bucket_count and history_length.
+    """
+    
+    counts = np.asarray(counts, dtype=float)
+    
+    return _Closed_Form(counts.sum(), len(counts), np.sum(counts * np.log(counts)), bucket_count, history_length, eps)
+
+#-----------------------------------------------------------------------------#
+
+def _Closed_Form(event_count: float, observed: int, c_log_c: float, bucket_count: int, history_length: int,
+                 eps: float = 1e-10) -> float:
+    
+    # _Sparse_Entropy from the sum of the counts, the number of observed events and
+    # sum(c * log(c)), which Streaming_Entropy keeps up to date as the window moves.
+    
+    length = history_length + sum(bucket_count ** i for i in range(1, history_length + 2))
+    zeros = length - observed - history_length
+    
+    total = event_count + history_length + zeros * eps
+    c_log_c = c_log_c + zeros * eps * log(eps)
+    
+    return (log(total) - c_log_c / total) / log(length)
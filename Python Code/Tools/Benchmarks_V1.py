@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 19:14:37 2026
+"""
+
+"""
+benchmark suite for the metrics, reservoir construction and GetDataset. every case is
+run over a grid of sizes with fixed seeds, on the CPU, without network access, and
+timed as the best of repeats runs after one untimed warm up run. its throughput (runs
+per second) is compared with a stored baseline:
+
+    Shannon_Entropy --> bucket_count x history_length x columnwise, fixed model and stream
+    MC_n            --> order x stream length, a new model for every run (MC_n fits it)
+    ESN_Maker       --> node count x connectivity x backend, weight cache emptied every run
+    GetDataset      --> a 2D sweep (leak rate x spectral radius) of Shannon_Entropy, 100 nodes
+
+receives:
+
+    baseline_path --> .json of baseline throughputs. default ~/.esn_benchmarks/benchmark_baseline.json,
+                      outside the repository. written if it doesn't exist or update is True.
+    threshold     --> largest accepted throughput loss against the baseline, 0.25 --> 25 %
+    update        --> if True, the results become the new baseline
+    grid          --> 'small' (about a minute) or 'full'
+    repeats       --> timed runs per case
+    cases         --> names of the cases to run, any of the above. None --> all
+
+returns a dict {case : {"seconds", "throughput", "baseline", "ratio", "regressed"}} and
+raises a Regression listing the regressed cases, if any. case names hold the sizes they
+run at, and a baseline is only compared with runs of the grid it was written for (an
+Exception otherwise, unless update). baselines are only comparable on the machine they
+were written on, its description is stored with them and a warning printed if it
+differs. from a shell:
+
+    python Benchmarks_V1.py [--threshold 0.25] [--update] [--grid full] [--repeats 5]
+
+exits with status 3 on a regression. any other error is raised as usual (status 1).
+"""
+
+import json
+import platform
+import tempfile
+import shutil
+import contextlib
+import io
+from os import path, cpu_count, makedirs
+from time import perf_counter
+import numpy as np
+
+GRIDS = {"small" : {"shannon" : {"bucket_count" : (10, 20), "history_length" : (1, 2, 3), "columnwise" : (False, True),
+                                 "nc" : 100},
+                    "mc" : {"order" : (1, 2, 3), "stream_length" : (400, 2000), "nc" : 100},
+                    "esn" : {"nc" : (100, 500, 2000), "cny" : (0.05, 0.2), "backend" : ('numpy', 'reservoirpy')},
+                    "sweep" : {"leak rate" : (0.1, 0.5, 0.2), "spectral radius" : (0.5, 1.5, 0.5)}},
+         "full" : {"shannon" : {"bucket_count" : (10, 20, 50), "history_length" : (1, 2, 3), "columnwise" : (False, True),
+                                "nc" : 500},
+                   "mc" : {"order" : (1, 2, 3, 5), "stream_length" : (400, 2000, 10000), "nc" : 200},
+                   "esn" : {"nc" : (100, 500, 2000, 10000), "cny" : (0.01, 0.05, 0.2), "backend" : ('numpy', 'reservoirpy')},
+                   "sweep" : {"leak rate" : (0.1, 0.9, 0.2), "spectral radius" : (0.25, 1.75, 0.25)}}}
+
+SEED = 42
+METRICS = path.join(path.dirname(path.abspath(__file__)), "..", "Metrics")
+SHANNON = ("Shannon_Entropy", path.join(METRICS, "Shannon Entropy", "shannon_entropy_V15.py"))
+MC = ("MC_n", path.join(METRICS, "Memory Capacity", "memory_capacity_V2.py"))
+BASELINE = path.join(path.expanduser("~"), ".esn_benchmarks", "benchmark_baseline.json") # outside the repository
+
+class Regression (Exception):
+    pass # a throughput below the threshold, as opposed to a failing run
+
+def Run_Benchmarks (baseline_path: str = None,
+                    threshold: float = 0.25,
+                    update: bool = False,
+                    grid: str = 'small',
+                    repeats: int = 3,
+                    cases: list = None) -> dict:
+
+    if grid not in GRIDS:
+        raise Exception(f"grid options are {list(GRIDS)}.")
+
+    if baseline_path is None:
+        baseline_path = BASELINE
+
+    benchmarks = {**_Shannon_Cases(GRIDS[grid]["shannon"]),
+                  **_MC_Cases(GRIDS[grid]["mc"]),
+                  **_ESN_Cases(GRIDS[grid]["esn"]),
+                  **_Sweep_Cases(GRIDS[grid]["sweep"])}
+    if cases is not None:
+        benchmarks = {name : case for name, case in benchmarks.items() if name.split("[")[0] in cases}
+
+    baseline = {"machine" : _Machine(), "throughput" : {}}
+    if path.exists(baseline_path):
+        with open(baseline_path, 'r') as infile:
+            baseline = json.load(infile)
+        if baseline["machine"] != _Machine():
+            print(f"baseline written on another machine, {baseline['machine']}: comparison is unreliable.")
+        if baseline.get("grid", grid) != grid and not update:
+            raise Exception(f"baseline written for grid '{baseline['grid']}', not '{grid}': use its grid or update.")
+
+#----------------------------------#RUN#--------------------------------------#
+
+    results = {}
+    for name, (setup, run) in benchmarks.items():
+        seconds = _Time(setup, run, repeats)
+        throughput = 1 / seconds
+        reference = baseline["throughput"].get(name)
+        ratio = throughput / reference if reference else None
+
+        results[name] = {"seconds" : seconds,
+                         "throughput" : throughput,
+                         "baseline" : reference,
+                         "ratio" : ratio,
+                         "regressed" : ratio is not None and ratio < 1 - threshold}
+        print(f"{name:60} {seconds:10.5f} s  " + (f"{ratio:6.2f} x baseline" if ratio else "no baseline")
+              + ("  REGRESSED" if results[name]["regressed"] else ""))
+
+#--------------------------#BASELINE AND VERDICT#-----------------------------#
+
+    if update or not path.exists(baseline_path):
+        baseline = {"machine" : _Machine(), "threshold" : threshold, "grid" : grid,
+                    "throughput" : {**baseline["throughput"], **{name : result["throughput"] for name, result in results.items()}}}
+        makedirs(path.dirname(path.abspath(baseline_path)), exist_ok=True)
+        with open(baseline_path, 'w') as outfile:
+            json.dump(baseline, outfile, indent=0)
+        print(f"baseline written to {baseline_path}")
+        return results
+
+    regressed = [name for name, result in results.items() if result["regressed"]]
+    if regressed:
+        raise Regression(f"throughput regressed by more than {100 * threshold:.0f} % in: {regressed}")
+
+    return results
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def _Time (setup, run, repeats: int) -> float:
+
+    # setup() returns the arguments of run(), it is not timed. best of repeats,
+    # after one warm up run (imports, caches of reservoirpy, first allocations).
+
+    best = np.inf
+    for repeat in range(repeats + 1):
+        arguments = setup()
+        start = perf_counter()
+        run(*arguments)
+        if repeat > 0:
+            best = min(best, perf_counter() - start)
+
+    return best
+
+def _Model (nc: int, training: bool = False, backend: str = 'numpy'):
+
+    from ESN_Maker_V4 import ESN_Maker as M
+    from reservoirpy.nodes import Ridge
+
+    model = M(nn=1, out=False, nc=nc, init_W='uniform', rep=True, seed=SEED, backend=backend).networks[0]
+    if training:
+        model = model >> Ridge(ridge=1e-7)
+
+    return model
+
+def _Stream (length: int) -> np.ndarray:
+    return np.random.default_rng(SEED).random([length,1]) - 0.5
+
+def _Machine () -> dict:
+    return {"platform" : platform.platform(), "processor" : platform.processor() or platform.machine(),
+            "cpus" : cpu_count(), "python" : platform.python_version(), "numpy" : np.__version__}
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def _Shannon_Cases (grid: dict) -> dict:
+
+    import Metric_Registry_V1 as MR
+
+    metric = MR.Load(SHANNON)
+    stream = _Stream(4 * grid["nc"])
+
+    cases = {}
+    for bucket_count in grid["bucket_count"]:
+        for history_length in grid["history_length"]:
+            for columnwise in grid["columnwise"]:
+                params = {"columnwise" : columnwise, "history_length" : history_length, "bucket_count" : bucket_count}
+                name = f"Shannon_Entropy[nc={grid['nc']},b={bucket_count},h={history_length},col={columnwise}]"
+                cases[name] = (lambda: (_Model(grid["nc"]),),
+                               lambda model, params=params: metric(model, stream, params))
+
+    return cases
+
+def _MC_Cases (grid: dict) -> dict:
+
+    import Metric_Registry_V1 as MR
+
+    metric = MR.Load(MC)
+
+    cases = {}
+    for order in grid["order"]:
+        for stream_length in grid["stream_length"]:
+            stream = _Stream(stream_length)
+            params = {"nc" : grid["nc"], "order" : order}
+            cases[f"MC_n[nc={grid['nc']},order={order},T={stream_length}]"] = (lambda: (_Model(grid["nc"], training=True),),
+                                                               lambda model, stream=stream, params=params: metric(model, stream, params))
+
+    return cases
+
+def _ESN_Cases (grid: dict) -> dict:
+
+    import ESN_Maker_V4
+
+    def setup():
+        ESN_Maker_V4._WEIGHT_CACHE.clear() # every run draws its weights
+        return ()
+
+    cases = {}
+    for backend in grid["backend"]:
+        for nc in grid["nc"]:
+            for cny in grid["cny"]:
+                cases[f"ESN_Maker[nc={nc},cny={cny},{backend}]"] = (setup,
+                    lambda nc=nc, cny=cny, backend=backend: ESN_Maker_V4.ESN_Maker(nn=1, out=False, nc=nc, cny=cny, init_W='uniform',
+                                                                                    rep=True, seed=SEED, backend=backend))
+
+    return cases
+
+def _Sweep_Cases (grid: dict) -> dict:
+
+    import GetDatasets_V7 as GD
+
+    def setup():
+        return (tempfile.mkdtemp(prefix="benchmark_"),)
+
+    def run(dir_path):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()): # GetDataset prints its progress
+                GD.GetDataset(datasets=1, dir_path=dir_path, double_sweep=True, gen_input=True, target_function=SHANNON,
+                              parameters={"leak rate" : grid["leak rate"], "spectral radius" : grid["spectral radius"]},
+                              function_params={"columnwise" : False, "history_length" : 2, "bucket_count" : 10},
+                              backend='numpy', seeds=[SEED])
+        finally:
+            shutil.rmtree(dir_path, ignore_errors=True)
+
+    points = [len(np.arange(start, stop + step, step)) for start, stop, step in (grid["leak rate"], grid["spectral radius"])]
+    return {f"GetDataset[leak rate x spectral radius,{points[0]}x{points[1]}]" : (setup, run)}
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+
+    import sys
+    import argparse
+
+    here = path.dirname(path.abspath(__file__)) # the repository's modules, as set up in Spyder
+    sys.path[:0] = [here, path.join(here, "..", "Adjuncts")]
+
+    parser = argparse.ArgumentParser(description="benchmarks with regression thresholds, see header.")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--update", action="store_true")
+    parser.add_argument("--grid", default='small', choices=list(GRIDS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--cases", nargs="*", default=None)
+    args = parser.parse_args()
+
+    try:
+        Run_Benchmarks(args.baseline, args.threshold, args.update, args.grid, args.repeats, args.cases)
+    except Regression as e: # anything else is a failing run, raised as usual
+        print(e)
+        sys.exit(3)
@@ -35,13 +35,97 @@ receives:
     datasets        --> how many .txt files of the same sweep to generate, each with different seed
     dir_path        --> directory of where to save .txt files
     double_sweep    --> give True if sweeping two parameters
-    training        --> if True, add ridge output node to model
+    training        --> if True, add ridge output node to model, with ridge value "ridge" (see
+                        defaults). "ridge" can be swept like any ESN parameter: if the metric has
+                        a ridges keyword (see MC_n), points that differ only in ridge are evaluated
+                        by one call, f_call(..., ridges=[...]), which returns one result per value,
+                        so the reservoir is built and run once per ridge path.
+                        metrics declaring needs_training (see Metric_Registry_V1) set it to True.
     gen_input       --> if true, generate randomised input datastream
-    target_function --> tuple of 2 strings: function name and path to its .py
+    target_function --> tuple of 2 strings: function name and path to its .py, loaded through the
+                        metric registry (see Metric_Registry_V1), once per process. can be a list of
+                        such tuples, then every point builds and runs its model once and all the
+                        metrics that need only its states are evaluated on that one harvest (see
+                        Multi_Metric_V1), the others on models of their own. needs gen_input=True
+                        and no model_list. names must differ, e.g. two entries for the same .py with
+                        different parameters. results are stored side by side, and one .JSON per
+                        metric is saved in that metric's own folder.
     parameters      --> dictionary of parameters to sweep. names are keys, values tuple of (start,stop,step)
-    function_params --> variables specific and required for the calculation of metric. 
+    function_params --> variables specific and required for the calculation of metric. as a dict,
+                        passed by name if the names are those of the metric's parameters.
+                        with a list of metrics, a list holding the function_params of each.
     model_list      --> use only if you have a list of reservoirpy.model for specific ESNs.
-    keep_buildpath  --> if true, the directory used for build steps of .txt files won't be discarded
+    keep_buildpath  --> if true, the JSON-lines store used to build the .txt files won't be discarded
+    backend         --> 'reservoirpy' or 'numpy', reservoir engine used by ESN_Maker. with either, points
+                        that share node count, connectivities and seed rescale one cached draw of the
+                        weights (see ESN_Maker_V4), and both give the same weights.
+    ensemble        --> if True, each sweep row (second parameter of a double sweep, or the whole
+                        of a single sweep) is built as one NumPy_Ensemble and simulated in a single
+                        batched pass. needs backend='numpy' and gen_input=True, and the row must not
+                        sweep node count. the row shares one input stream.
+    workers         --> number of worker processes. if > 1, sweep points (rows in ensemble mode) are
+                        spread over a ProcessPoolExecutor. results are collected in sweep order, so
+                        the saved files are the same as for a serial run. the pool is kept for later
+                        runs with as many workers, whose metrics are then already loaded, replaced if
+                        one of its workers died, and shut down when the interpreter exits.
+    chunksize       --> number of points (or rows) sent to a worker at a time.
+    seeds           --> list of seeds, one per dataset. if None, each dataset draws a random seed.
+    cache_dir       --> if given, every point result is cached there (see Result_Cache_V1), keyed
+                        on ESN parameters, seed, metric source and function parameters. points
+                        already in the cache are not recomputed, so with fixed seeds an interrupted
+                        or extended sweep resumes where it left off.
+    sparse_W        --> if True, ESN_Maker builds W directly in sparse form (see Sparse_Weights_V1),
+                        for node counts of 10k - 100k. init_W='uniform' then sets the distribution
+                        of W, which is scaled to the spectral radius.
+    state_dir       --> if given, the states harvested at every point are kept there (see
+                        State_Cache_V1) with their input stream, and the metrics are evaluated on
+                        them through Replay_ESN models. points whose states are stored are evaluated
+                        without building or running any reservoir, e.g. for a new metric over an old
+                        sweep. needs gen_input=True and no model_list, not used in ensemble mode.
+    state_dir_bytes --> size bound of state_dir, least recently used states are deleted beyond it.
+    state_dtype     --> 'float64', 'float32' or 'float16', precision of the stored states. None --> dtype.
+    instrument      --> None, 'time' or 'memory'. if given, the wall time of every job (one point,
+                        or one ensemble row or ridge path) is split into phases: build, warmup,
+                        harvest, fit, metric, io and other (see Phase_Timer_V1), and with 'memory'
+                        the tracemalloc peak of each phase is recorded too. one line per job is
+                        written to dir_path/phases.jsonl, the last line holding the run summary,
+                        which is also printed.
+    dtype           --> 'float64' or 'float32', precision of the simulation (see ESN_Maker_V4): weights,
+                        states, harvests and the metrics working on them. readouts are still solved
+                        in float64. not for model_list.
+    validate_dtype  --> if True, every point computed is also computed in float64, with the same seed,
+                        and the deviation of its result written to dir_path/dtype_deviation.jsonl, one
+                        line per point, the last line holding the largest and mean deviations, which
+                        are also printed. results saved are those in dtype.
+    dtype_tolerance --> see validate_dtype, largest accepted absolute deviation from float64, in units
+                        of the metric. points beyond it are marked "exceeds" in dtype_deviation.jsonl
+                        and counted in the summary, and a warning is printed. None --> no check, the
+                        deviations are only reported. float32 runs of the metrics here deviate by
+                        1e-4 to 1e-2, depending on the metric and the sweep.
+    adaptive        --> number of refinement levels. if > 0, the sweep starts from a coarse grid, every
+                        2^adaptive-th value of each parameter (and its last), and cells, quadtree-style
+                        for double sweeps, are split recursively down to the given step where the metric
+                        changes across the cell by more than refine_tolerance, relative to its range
+                        over the coarse grid, and by more than the seed noise, from the std across the
+                        datasets' seeds (see _Adaptive_Sweep). all datasets are evaluated together, each
+                        level's new points as one batch (over the workers). points not evaluated are
+                        interpolated from the corners of their cell, so the .JSON holds the full grid,
+                        as read by Plot_HM; the evaluated ones are listed in its test bed, under
+                        "adaptive". not for ensemble or model_list, ridge paths are evaluated point
+                        by point.
+    refine_tolerance --> see adaptive, 0.1 --> 10 % of the range of the metric
+    sequential      --> number of seeds every point starts with. if > 0, datasets becomes the largest
+                        number of seeds per point: one more seed is given to every point whose 95 %
+                        confidence interval (Student t) on the mean of the metric is wider than
+                        ci_tolerance on either side, until none is or they have reached it (see
+                        _Sequential_Seeds). instead of one .JSON per dataset, three are saved per
+                        metric, in folders named after the metric followed by "mean", "std" (across
+                        the seeds of the point) and "seeds" (their number), each read by Plot_HM as
+                        usual. the seeds, in order of use, are in their test bed under "sequential". they
+                        must differ, if not given they are drawn without repeats.
+                        not for ensemble, model_list or adaptive.
+    ci_tolerance    --> see sequential, half width of the confidence interval, in units of the metric.
+                        for results holding several numbers, the widest.
     
     
 """
@@ -50,15 +134,24 @@ import numpy as np
 from itertools import product
 from reservoirpy import model
 from reservoirpy.nodes import Ridge
-from random import randint
-from os import path, mkdir, listdir
-from typing import Union
-import importlib.util
-import sys
-from inspect import getmembers, isfunction
+from random import randint, sample
+from os import path, mkdir
+from typing import Union, NamedTuple
+from functools import partial, lru_cache
+from time import perf_counter
+from scipy.stats import t as student_t, studentized_range
 import json
-import shutil
-import string
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import atexit
+import reservoirpy as res
+import Harvest_V1 as HV
+import Multi_Metric_V1 as MM
+import Metric_Registry_V1 as MR
+import Result_Cache_V1 as RC
+import State_Cache_V1 as SC
+import Result_Store_V1 as RS
+import Phase_Timer_V1 as PT
 
 def GetDataset   (datasets: int = 1, 
                   dir_path: str = None,
@@ -69,7 +162,25 @@ def GetDataset   (datasets: int = 1,
                   parameters: dict = None,
                   function_params: Union[list,dict] = None,
                   model_list: list[model] = None,
-                  keep_buildpath: bool = True):
+                  keep_buildpath: bool = True,
+                  backend: str = 'reservoirpy',
+                  ensemble: bool = False,
+                  workers: int = 1,
+                  chunksize: int = 1,
+                  seeds: list = None,
+                  cache_dir: str = None,
+                  sparse_W: bool = False,
+                  state_dir: str = None,
+                  state_dir_bytes: int = 10 * 2**30,
+                  state_dtype: str = None,
+                  instrument: str = None,
+                  dtype: str = 'float64',
+                  validate_dtype: bool = False,
+                  dtype_tolerance: float = None,
+                  adaptive: int = 0,
+                  refine_tolerance: float = 0.1,
+                  sequential: int = 0,
+                  ci_tolerance: float = 0.01):
     
 #-----------------------------------------------------------------------------#
 #-------------------------------VALIDITY CHECK--------------------------------#
@@ -87,24 +198,77 @@ def GetDataset   (datasets: int = 1,
             print("\n\nYou haven't provided an ESN_model of type reservoirpy.model\
                   and ESN_Maker cannot be found.")
             
+    if ensemble and (backend != 'numpy' or not gen_input or model_list is not None):
+        raise Exception("ensemble mode needs backend='numpy', gen_input=True and no model_list.")
+            
+    if seeds is not None and len(seeds) < datasets:
+        raise Exception("seeds needs one seed per dataset.")
+    
+    if state_dir is not None and (not gen_input or model_list is not None):
+        raise Exception("state_dir needs gen_input=True and no model_list.")
+    
+    if adaptive and (ensemble or model_list is not None):
+        raise Exception("adaptive sweeps need no ensemble and no model_list.")
+    
+    if sequential and (ensemble or model_list is not None or adaptive or sequential > datasets):
+        raise Exception("sequential seeds need no ensemble, no model_list, no adaptive and at most datasets seeds to start.")
+    
+    if (adaptive or sequential) and seeds is not None and len(set(seeds[:datasets])) < datasets:
+        raise Exception("adaptive and sequential sweeps need distinct seeds, repeated ones are repeated samples.")
+    
+    if dtype not in ('float64', 'float32'):
+        raise Exception("dtype options are 'float64' or 'float32'.")
+    
+    if dtype_tolerance is not None and not validate_dtype:
+        raise Exception("dtype_tolerance needs validate_dtype=True.")
+    
+    if dtype != 'float64' and model_list is not None:
+        raise Exception("the precision of a model_list is that of its models, dtype cannot be set.")
+    
+    if state_dtype is None:
+        state_dtype = dtype
+    
+    state_cache = None
+    if state_dir is not None: # State_Cache arguments, each process opens its own
+        state_cache = (state_dir, state_dir_bytes, state_dtype)
+        SC.State_Cache(*state_cache) # checks the arguments once, creates the directory
+    
+    if instrument not in (None, 'time', 'memory'):
+        raise Exception("instrument options are None, 'time' or 'memory'.")
+    
+    if cache_dir is not None and model_list is not None:
+        raise Exception("results of a model_list cannot be cached, the models cannot be hashed.")
+            
     if not path.exists(dir_path):
         raise Exception("dir_path is invalid, cannot find where you want to save test data.")
     
-    if path.exists(target_function[1]): # imports function from name and path. 
-        try:
-            spec = importlib.util.spec_from_file_location(name=target_function[0],location=target_function[1])
-            loader = importlib.util.LazyLoader(spec.loader)
-            spec.loader = loader
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[target_function[0]] = module
-            loader.exec_module(module)
-            f_call = getmembers(module,isfunction)[0][1]
-            
-        except Exception as e:
-            print(f"Exception raised, see python built-in message: \n\n {e}")
+    multi = type(target_function) == list # several metrics, one harvest per point
+    metrics = [tuple(metric) for metric in target_function] if multi else [target_function]
+    metric_params = list(function_params) if multi else [function_params]
     
-    else:
-        raise Exception("target_funcion path or name is invalid.")
+    if multi:
+        if not gen_input or model_list is not None:
+            raise Exception("a list of metrics needs gen_input=True and no model_list.")
+        if len(metric_params) != len(metrics):
+            raise Exception("with a list of metrics, function_params needs one entry per metric.")
+        if len({name for name, file in metrics}) != len(metrics):
+            raise Exception("metric names must differ, their results are saved under their names.")
+        target_function = tuple(metrics) # hashable, see _Load_Function
+    
+    for metric in metrics:
+        if not path.exists(metric[1]):
+            raise Exception("target_funcion path or name is invalid.")
+    
+    try: # imports function from name and path, see Metric_Registry_V1
+        f_call = _Load_Function(target_function)
+        
+    except Exception as e:
+        print(f"Exception raised, see python built-in message: \n\n {e}")
+    
+    declared = getattr(f_call, "metrics", [f_call])
+    if not training and any(metric.needs_training for metric in declared):
+        training = True # the metric trains a readout, e.g. MC_n
+        print("a metric needs training, a ridge readout is added to the models.")
     
     try:
         import Useful_Funcs_V4 as UF
@@ -122,7 +286,8 @@ def GetDataset   (datasets: int = 1,
                      "spectral radius" : 1.0,
                      "connectivity" : 0.1,
                      "input scaling" : 1.0,
-                     "input connectivity" : 0.1}
+                     "input connectivity" : 0.1,
+                     "ridge" : 1e-7} # ridge value suggested as default by reservoirpy, used if training
     
 #-----------------------------------------------------------------------------#
 #-----------------------------GENERATE DATASETS-------------------------------#
@@ -151,225 +316,894 @@ def GetDataset   (datasets: int = 1,
         UF.Sect_Div() # purely for console print aesthetic
     print("LOOP START - GENERATING DATASETS")
     
-    for index,combo in enumerate(combos): # for every combination of 2 parameters to sweep
-        print(f"working on {combo}")
+    executor = None
+    if workers > 1: # one pool for the whole run and later ones, workers import the metric once each
+        executor = _Executor(workers)
+    
+    records = [] # one per job, see Phase_Timer_V1
+    if instrument is not None:
+        run_start = perf_counter()
+        phase_log = open(path.join(dir_path, "phases.jsonl"), 'w')
+    
+    deviations = [] # one per point, see validate_dtype
+    if validate_dtype:
+        deviation_log = open(path.join(dir_path, "dtype_deviation.jsonl"), 'w')
+    
+    try:
+        caches = [] # one per metric
+        if cache_dir is not None:
+            stored_dtype = state_dtype if state_dir is not None and not ensemble else None
+            caches = [RC.Result_Cache(cache_dir, metric, training, gen_input, backend, sparse_W, stored_dtype, dtype) 
+                      for metric in metrics]
+    
+        for index,combo in enumerate(combos): # for every combination of 2 parameters to sweep
+            print(f"working on {combo}")
         
-        if index == 0: # at first iteration, the default values are saved separately, for accurate test condition reporting when writing to .JSON
-            original_defaults = {}
-            for entry in defaults_list:
-                original_defaults[entry] = defaults_list[entry]
-            original_func_params = {}
-            for entry in function_params:
-                original_func_params[entry] = function_params[entry]
+            if index == 0: # at first iteration, the default values are saved separately, for accurate test condition reporting when writing to .JSON
+                original_defaults = {}
+                for entry in defaults_list:
+                    original_defaults[entry] = defaults_list[entry]
+                original_func_params = [] # one dict per metric
+                for params in metric_params:
+                    original_func_params.append({})
+                    if type(params) == dict:
+                        for entry in params:
+                            original_func_params[-1][entry] = params[entry]
         
-        if double_sweep: # sets sweep start, stop and step
-            sweep_param1 = np.arange(parameters[combo[0]][0],
-                                     parameters[combo[0]][1] + parameters[combo[0]][2],
-                                     parameters[combo[0]][2])
-            sweep_param2 = np.arange(parameters[combo[1]][0],
-                                     parameters[combo[1]][1] + parameters[combo[1]][2],
-                                     parameters[combo[1]][2])
-        else:
-            sweep_param1 = np.arange(parameters[combo][0],
-                                     parameters[combo][1] + parameters[combo][2],
-                                     parameters[combo][2])
-            sweep_param2 = [0]
+            if double_sweep: # sets sweep start, stop and step
+                sweep_param1 = np.arange(parameters[combo[0]][0],
+                                         parameters[combo[0]][1] + parameters[combo[0]][2],
+                                         parameters[combo[0]][2])
+                sweep_param2 = np.arange(parameters[combo[1]][0],
+                                         parameters[combo[1]][1] + parameters[combo[1]][2],
+                                         parameters[combo[1]][2])
+            else:
+                sweep_param1 = np.arange(parameters[combo][0],
+                                         parameters[combo][1] + parameters[combo][2],
+                                         parameters[combo][2])
+                sweep_param2 = [0]
+            sweep_names = combo if double_sweep else (combo,)
+        
+            test_beds = [] # one per metric
+            for func_params in original_func_params:
+                test_bed = {} # create dict for storing test bed conditions
+                test_bed.update(original_defaults) # add default ESN parameters
+                test_bed.update(func_params) # add default function parameters
+                for entry in sweep_names:
+                    test_bed[entry] = parameters[entry] # replace default ESN parameters with sweep parameter bounds          
+                test_beds.append(test_bed)
+        
+            precomputed = None # results of every dataset, when they are all evaluated here at once
+            labels = [str(dataset + 1) for dataset in range(datasets)] # name the dataset folders
+            settings = {"target_function" : target_function, "training" : training, "gen_input" : gen_input, "backend" : backend,
+                        "sparse_W" : sparse_W, "state_cache" : state_cache, "dtype" : dtype, "validate" : validate_dtype,
+                        "instrument" : instrument} # the same in every job, see Job
+            if adaptive or sequential:
+                grid_seeds = sample(range(0, 2**31), datasets) if seeds is None else list(seeds[:datasets]) # distinct
+                grid_points = [_Point_Params(sweep_names, values, original_defaults, original_func_params, metric_params, multi) 
+                               for row in _Sweep_Rows(sweep_param1, sweep_param2, double_sweep) for values in row]
+                evaluate = partial(_Evaluate_Grid, points=grid_points, seeds=grid_seeds, settings=settings, executor=executor,
+                                   chunksize=chunksize, caches=caches, multi=multi)
         
-        for datasets_completed in range(datasets): # for each combination, generate x datasets
+            if adaptive: # the spread across seeds decides the refinement too
+                precomputed, evaluated, logs = _Adaptive_Sweep((len(sweep_param1), len(sweep_param2)), adaptive, 
+                                                               refine_tolerance, datasets, evaluate)
+                print(f"adaptive sweep: {len(evaluated)} of {len(grid_points)} points evaluated")
+                for test_bed in test_beds:
+                    test_bed["adaptive"] = {"levels" : adaptive, "tolerance" : refine_tolerance, "evaluated" : evaluated}
+        
+            elif sequential: # more seeds only where the mean is still uncertain
+                precomputed, counts, logs = _Sequential_Seeds(len(grid_points), sequential, datasets, ci_tolerance, multi, evaluate)
+                labels = ["mean", "std", "seeds"]
+                print(f"sequential seeds: {sum(counts)} of {datasets * len(grid_points)} evaluations, "
+                      f"{sum(count == datasets for count in counts)} of {len(grid_points)} points at {datasets} seeds")
+                for test_bed in test_beds:
+                    test_bed["sequential"] = {"initial" : sequential, "max" : datasets, "tolerance" : ci_tolerance, "seeds" : grid_seeds}
+        
+            if precomputed is not None:
+                for point, dataset, record, deviation in logs:
+                    if validate_dtype and deviation is not None: # None --> read from the cache
+                        deviation.update({"dataset" : dataset + 1, "combo" : str(combo), "point" : point},
+                                         **_Exceeds(deviation, dtype_tolerance))
+                        deviations.append(deviation)
+                        deviation_log.write(json.dumps(deviation) + "\n")
+                    if instrument is not None:
+                        cached = record is None
+                        record = record or {"wall" : 0.0, "phases" : {}}
+                        record.update({"dataset" : dataset + 1, "combo" : str(combo), "job" : "point", 
+                                       "points" : [point], "cached" : cached})
+                        records.append(record)
+                        phase_log.write(json.dumps(record) + "\n")
+        
+            for datasets_completed, label in enumerate(labels): # for each combination, generate x datasets
             
-            seed = randint(0,100) # new seed for each dataset
+                if precomputed is not None: # evaluated above
+                    seed = None
+                elif seeds is None:
+                    seed = randint(0,100) # new seed for each dataset
+                else:
+                    seed = seeds[datasets_completed]
                 
-#--------------------------------PERFORM SWEEPS-------------------------------#        
-            iteration_no = 0 # counter for ordering .JSON files in SAVE DATA TO .JSON
-
-            for index1,value1 in enumerate( sweep_param1 ):
-                for index2,value2 in enumerate( sweep_param2 ): # will only execute once if double_sweep = False
-                
-                    if type(function_params) == dict: # allows function params to be sweep parameters.
-                        count = 0
-                        param_found =False
-                        for entry in combo: # makes sure current sweep value assigned to correct function_params entry
-                            for param in function_params:
-                                try:
-                                    if param == entry:
-                                        param_found = True
-                                        if count == 0:
-                                            function_params[entry] = value1
-                                        else:
-                                            function_params[entry] = value2
-                                        break
-                                except:
-                                    pass
-                            count +=1
-                        if param_found == False:
-                            func_params = list(original_func_params.values()) # saves values as list, for passing to f_call
-                        else:          
-                            func_params = list(function_params.values())
-                        
-                    else:
-                        func_params = function_params # if function params is not a dict, those params cannot be swept, and will only be passed to f_call                
-                    if double_sweep:
-                        defaults_list[combo[0]] = value1 
-                        defaults_list[combo[1]] = value2
-                    else:
-                        defaults_list[combo] = value1 
-                    
+    #--------------------------------PERFORM SWEEPS-------------------------------#        
+                # every point starts from the original defaults, with only its own sweep values applied
+                rows = [[_Point_Params(sweep_names, values, original_defaults, original_func_params, metric_params, multi) 
+                         for values in row] for row in _Sweep_Rows(sweep_param1, sweep_param2, double_sweep)]
+            
+                points = [point for row in rows for point in row]
+                ridge_path = (training and not ensemble and precomputed is None and model_list is None and "ridge" in sweep_names
+                              and all(metric.ridges for metric in declared))
+            
+                if ensemble: # whole rows simulated as one batched ensemble each
+                    groups = np.split(np.arange(len(points)), np.cumsum([len(row) for row in rows])[:-1])
+                    jobs = [Job("row", row, None, seed, **settings) for row in rows]
+                elif ridge_path: # points differing only in ridge value evaluated together
+                    groups = _Ridge_Groups(points)
+                    jobs = [Job("path", [points[index] for index in group], None, seed, **settings) for group in groups]
+                else:
+                    groups = [[index] for index in range(len(points))]
                     if model_list is None:
-                        AN_ESN = M(nn=1,
-                                   out=False,
-                                   nc=defaults_list["node count"], 
-                                   lr=defaults_list["leak rate"],
-                                   sr=defaults_list["spectral radius"],
-                                   cny=defaults_list["connectivity"],
-                                   ins=defaults_list["input scaling"],
-                                   ins_cny=defaults_list["input connectivity"],
-                                   init_W='uniform',
-                                   rep=True,
-                                   seed=seed)
-                        
-                        model = AN_ESN.networks[0]
-                        if training:
-                            readout = Ridge(ridge=1e-7) # ridge value suggested as default by reservoirpy.
-                            model = model >> readout # ESN comprised of input node, reservoir node of nc neurons, and Ridge output layer
-                    
+                        jobs = [Job("point", point, None, seed, **settings) for point in points]
                     else:
-                        model = model_list[iteration_no]
-                        
-                    if gen_input: # generate input if required
-                        
-                        res_name = model.node_names
-                        for name in res_name:
-                            if any(x == 'R' for x in name):
-                                res_name = name
-                                break
-                        stream_length = model.get_node(f"{res_name}").get_param("units") * 4                   
-                        input_stream = np.random.random([stream_length,1]) - 0.5 # input range [-0.5:0.5]
-                        
-                        result = f_call(model,
-                                        input_stream,
-                                        *func_params) #function call with input stream
-                                              
-                    else:
-                        result = f_call(model,
-                                        *func_params
-                                       ) #function call without input stream                               
-                    model = None # to free up memory
-                    del AN_ESN # to free up memory
+                        jobs = [Job("point", point, model_list[index], seed, **settings) for index, point in enumerate(points)]
             
-#-----------------------------------------------------------------------------#
-#-----------------------------SAVE DATA TO .JSON------------------------------#
-#-----------------------------------------------------------------------------#
+                job_keys = [[] for job in jobs] # cache keys of the points of each job, one per metric
+                if caches and precomputed is None:
+                    job_keys = [[[cache.Point_Key(esn_params, params, seed) 
+                                  for cache, params in zip(caches, _Per_Metric(func_params, multi))]
+                                 for esn_params, func_params in _Job_Points(job)] for job in jobs]
+                pending = [index for index, keys in enumerate(job_keys) 
+                           if not caches or not all(cache.Has(key) for point_keys in keys for cache, key in zip(caches, point_keys))]
+                if precomputed is not None: # evaluated above
+                    pending = []
+                elif caches:
+                    print(f"dataset {datasets_completed + 1}: {len(jobs) - len(pending)} of {len(jobs)} jobs found in cache")
+            
+                if executor is None:
+                    outputs = map(_Evaluate_Job, [jobs[index] for index in pending])
+                else:
+                    outputs = executor.map(_Evaluate_Job, [jobs[index] for index in pending], chunksize=chunksize) # keeps sweep order
+            
+    #-----------------------------------------------------------------------------#
+    #-----------------------------SAVE DATA TO .JSON------------------------------#
+    #-----------------------------------------------------------------------------#
 
-                    """
-the code creates a parent folder with the name of the function (f_call) --> test_suite.
-it then creates a build folder, where each return value of f_call is saved in its own file.
-when the sweep is finished, a test_bed file with the test conditions is created. All the 
-files in build are then stitched together and saved in an adjacent directory, called
-"function name" + "dataset number". If keep_buildpath is False, build is deleted.
-                    """
+                """
+the code creates a parent folder with the name of the function (f_call) --> test_suite,
+and in it a folder called "function name" + "dataset number". each return value of f_call
+is appended, in sweep order and as soon as it is available, to a JSON-lines store whose
+first line is the test bed (see Result_Store_V1). when the sweep is finished the store is
+converted, once, into the .JSON list (test bed first, then results) read by Plot_HM, saved
+next to it. If keep_buildpath is False, the store is deleted.
 
-                    function_name = target_function[0] 
+with a list of metrics the store is kept in a folder named after all of them, joined by
+'+', each line holding the results of every metric. it is converted into one .JSON per
+metric, saved in the folders the metric would have had on its own.
+                """
+
+                entry_paths = [] # one per metric, then the store's
+                for function_name in [name for name, file in metrics] + (["+".join(name for name, file in metrics)] if multi else []):
                     test_suite = path.join(dir_path,function_name) # parent folder with function name
-                    test_name = target_function[0] + str(datasets_completed + 1) 
-                    
+                    test_name = function_name + label
+                
                     if not path.exists(test_suite):
                         mkdir(test_suite)
-                        
+                    
                     test_path = path.join(test_suite,test_name)
                     if not path.exists(test_path):
                         mkdir(test_path)
-                        
-                    entry_path = path.join(test_path,str(combo))
-                    build_path = path.join(test_suite, f"build{combo}")
-                    if not path.exists(build_path):
-                        mkdir(build_path)
-                    
-                    """
-I kept getting bugs where the files in build were being put together in the wrong order.
-This was the quickest fix I could come up with, where instead of numbering each file
-with decimal numbers, they are ordered with letters:
-    
-    data + aaaaaa
-    data + aaaaab
-    data + aaaaac
-    data + aaaaad
-    data + aaaaae
-    data + aaaaaf
-    data + aaaaba
-    data + aaaabb
-    .
-    .
-    ..
-
-with 6 letters --> 46656 files can have independent names. if more files are needed,
-devise a better solution as this will significantly slow down the program.
-                    """
-                    
-                    suffixes = []
-                    for i in range(6):
-                        suffixes.append(chr(ord('a') + i))
-                    suffix_combos = list((product(suffixes,repeat=len(suffixes))))
-
-                    for i in range(len(suffix_combos)): #convert from array of arrays of strings to array of strings
-                       suffix_combos[i] = [word.strip(string.punctuation) for word in str(suffix_combos[i]).split() if word.strip(string.punctuation).isalnum()]
-                       dummy = ''
-                       for letter in suffix_combos[i]:
-                           dummy = dummy + letter
-                       suffix_combos[i]= dummy
-                    data_loc = path.join(build_path,f"data_{suffix_combos[iteration_no]}")
                     
-                    with open(data_loc, "w") as outfile: # create file and save result
-                        json.dump(result, outfile)
-                        outfile.close()
-                    
-                    iteration_no +=1
-                    
-            del suffix_combos # free up memory
-            test_bed = {} # create dict for storing test bed conditions
-            test_bed.update(original_defaults) # add default ESN parameters
-            test_bed.update(original_func_params) # add default function parameters
+                    entry_paths.append(path.join(test_path,str(combo)))
             
-            for entry in combo:
-                test_bed[entry] = parameters[entry] # replace default ESN parameters with sweep parameter bounds          
-            for entry in test_bed:
-                if (type(test_bed[entry])) == np.int32: # JSON dislikes np.int32 and throws serialization error     
-                    test_bed[entry] = int(test_bed[entry])
+                store = RS.Result_Store(entry_paths[-1] + ".jsonl", test_beds if multi else test_beds[0])
             
-            test_bed_loc = path.join(build_path,"test bed") # create test bed file in build  
-            with open(test_bed_loc, "w") as outfile:
-                json.dump(test_bed, outfile)
-                outfile.close()
-            
-            files = list()
-            for filename in listdir(build_path): 
-                    
-                if filename != "test bed": # more legible if inserted at top of file
-                    files.append(path.join(build_path,filename)) # list of all files to stitch together
-                    
-            files.insert(0, test_bed_loc) # add test bed to top
+                pending = set(pending)
+                finished = {} # results waiting for the points before them, ridge paths can span rows
+                next_point = 0
+                for index, job in enumerate(jobs):
+                    record = None
+                    if index in pending:
+                        output, record, deviation = next(outputs)
+                        if validate_dtype:
+                            for point, point_deviation in zip(groups[index], deviation):
+                                point_deviation.update({"dataset" : datasets_completed + 1, "combo" : str(combo), "point" : int(point)},
+                                                       **_Exceeds(point_deviation, dtype_tolerance))
+                                deviations.append(point_deviation)
+                                deviation_log.write(json.dumps(point_deviation) + "\n")
+                    io_start = perf_counter()
+                    if index in pending:
+                        for point_keys, result, (esn_params, func_params) in zip(job_keys[index], output, _Job_Points(job)):
+                            # cached as soon as computed, so a crash loses nothing finished
+                            for cache, key, metric_result, params in zip(caches, point_keys, _Per_Metric(result, multi), 
+                                                                         _Per_Metric(func_params, multi)):
+                                cache.Put(key, metric_result, cache.Point(esn_params, params, seed))
+                    elif precomputed is not None:
+                        output = [precomputed[datasets_completed][point] for point in groups[index]]
+                    else:
+                        output = [[cache.Get(key) for cache, key in zip(caches, point_keys)] for point_keys in job_keys[index]]
+                        if not multi:
+                            output = [results[0] for results in output]
+                
+                    finished.update(zip(groups[index], output))
+                    while next_point in finished: # appended in sweep order
+                        store.Append(finished.pop(next_point))
+                        next_point += 1
+                
+                    if instrument is not None and precomputed is None: # main process I/O of the job counts as its own
+                        record = _Add_IO(record, perf_counter() - io_start)
+                        record.update({"dataset" : datasets_completed + 1, "combo" : str(combo), "job" : job.kind,
+                                       "points" : [int(point) for point in groups[index]], "cached" : index not in pending})
+                        records.append(record)
+                        phase_log.write(json.dumps(record) + "\n")
             
-            newfile = list()            
-            for f2 in files: # stitch all the files together
-                with open(f2, 'r') as infile:
-                    newfile.append(json.load(infile))
-                    infile.close()
-    
-                with open(entry_path, 'w') as output_file:
-                    json.dump(newfile, output_file,sort_keys=False, indent=0,separators=(',',':'))
-                    output_file.close()
+                io_start = perf_counter()
+                if multi:
+                    store.Finalise_Columns(entry_paths[:-1])
+                else:
+                    store.Finalise(entry_paths[0])
+                if not keep_buildpath: 
+                    store.Remove() # delete build store
             
-            if not keep_buildpath: 
-                shutil.rmtree(build_path) # delete build
+                if instrument is not None:
+                    record = _Add_IO(None, perf_counter() - io_start)
+                    record.update({"dataset" : datasets_completed + 1, "combo" : str(combo), "job" : "finalise"})
+                    records.append(record)
+                    phase_log.write(json.dumps(record) + "\n")
+    
+    finally: # the logs get their summary and are closed, whether the sweep finished or not
+        if instrument is not None:
+            summary = PT.Summary(records)
+            summary.update({"instrument" : instrument, "run wall" : perf_counter() - run_start})
+            phase_log.write(json.dumps({"summary" : summary}) + "\n")
+            phase_log.close()
+            _Print_Summary(summary)
+        _Process_Recorder(None) # stops tracemalloc if this run started it
+    
+        if validate_dtype:
+            summary = _Deviation_Summary(deviations, dtype, dtype_tolerance)
+            deviation_log.write(json.dumps({"summary" : summary}) + "\n")
+            deviation_log.close()
+            print(f"{dtype} against float64 over {summary['points']} points: largest deviation {summary['max abs']:.3e} "
+                  f"(relative {summary['max rel']:.3e}), mean {summary['mean abs']:.3e}")
+            if summary.get("exceeding"):
+                print(f"WARNING: {summary['exceeding']} points deviate by more than {dtype_tolerance:.3e}, "
+                      f"marked \"exceeds\" in dtype_deviation.jsonl")
+    
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+# names of the ESN parameters in GetDataset, and the matching ESN_Maker arguments
+ESN_ARGS = {"node count" : "nc",
+            "leak rate" : "lr",
+            "spectral radius" : "sr",
+            "connectivity" : "cny",
+            "input scaling" : "ins",
+            "input connectivity" : "ins_cny"}
+
+#-----------------------------------------------------------------------------#
+
+def _Load_Function (target_function: tuple):
+    
+    # a Metric of the registry, or a Multi_Metric of them for a list of metrics. the
+    # registry imports each file once per process, this is called for every job.
+    
+    if isinstance(target_function[0], tuple): # list of metrics
+        return MM.Multi_Metric([MR.Load(metric) for metric in target_function])
+    
+    return MR.Load(target_function)
+
+#-----------------------------------------------------------------------------#
+
+_EXECUTORS = {} # workers --> ProcessPoolExecutor, kept between runs, shut down at exit
+
+def _Executor (workers: int) -> ProcessPoolExecutor:
+    
+    # a kept pool is checked with a no-op job: if a worker died since (or the pool was
+    # shut down), it is replaced.
+    
+    executor = _EXECUTORS.get(workers)
+    if executor is not None:
+        try:
+            executor.submit(int).result()
+            return executor
+        except (BrokenProcessPool, RuntimeError):
+            executor.shutdown(wait=False)
+    
+    executor = ProcessPoolExecutor(max_workers=workers)
+    _EXECUTORS[workers] = executor
+    
+    return executor
+
+@atexit.register
+def _Shutdown_Executors ():
+    
+    for executor in _EXECUTORS.values():
+        executor.shutdown(wait=True, cancel_futures=True)
+    _EXECUTORS.clear()
+
+#-----------------------------------------------------------------------------#
+
+class Job (NamedTuple):
+    
+    # one unit of work sent to _Evaluate_Job: a point, a row of points (ensemble) or the
+    # points of a ridge path (path), with everything needed to evaluate it in a worker.
+    
+    kind: str # 'point', 'row' or 'path'
+    payload: Union[tuple, list] # (ESN parameters, f_call parameters), or a list of them
+    model: model # model_list entry of a point, else None
+    seed: int
+    target_function: Union[tuple, list]
+    training: bool
+    gen_input: bool
+    backend: str
+    sparse_W: bool
+    state_cache: tuple
+    dtype: str
+    validate: bool # also evaluated in float64, see validate_dtype
+    instrument: str
+
+def _Evaluate_Job (job: Job) -> list:
+    
+    # runs in the worker processes as well as in the main one. everything it needs
+    # is in the job, the metric is re-imported from its path when not loaded yet.
+    
+    # returns (results, phase record of the job or None, deviation of each point's
+    # result from float64 or None), see Phase_Timer_V1 and validate_dtype
+    
+    recorder = _Process_Recorder(job.instrument)
+    if recorder is None:
+        results, record = _Run_Job(job), None
+    else:
+        with recorder.Point():
+            results = _Run_Job(job)
+        record = recorder.Last()
+    
+    deviation = None
+    if job.validate: # the same job in float64, outside the record and without stored states
+        reference = _Run_Job(job._replace(state_cache=None, dtype='float64', validate=False))
+        deviation = [_Deviation(result, reference_result) for result, reference_result in zip(results, reference)]
+    
+    return results, record, deviation
+
+def _Run_Job (job: Job) -> list:
+    
+    f_call = _Load_Function(job.target_function)
+    
+    if job.kind == "row":
+        return _Evaluate_Ensemble(job.payload, job.seed, f_call, job.training, job.sparse_W, job.dtype)
+    
+    if job.kind == "path":
+        return _Evaluate_Path(job.payload, job.seed, f_call, job.gen_input, job.backend, job.sparse_W, job.state_cache, job.dtype)
+    
+    esn_params, func_params = job.payload
+    return [_Evaluate_Point(esn_params, func_params, job.seed, f_call, job.training, job.gen_input, job.backend, job.model, 
+                            sparse_W=job.sparse_W, state_cache=job.state_cache, dtype=job.dtype)]
+
+#-----------------------------------------------------------------------------#
+
+_RECORDER = None # Phase_Timer_V1 recorder of this process, kept between jobs
+
+def _Process_Recorder (instrument: str):
+    
+    global _RECORDER
+    
+    memory = instrument == 'memory'
+    if _RECORDER is not None and (instrument is None or _RECORDER.memory != memory):
+        _RECORDER.Close()
+        _RECORDER = None
+    
+    if instrument is not None and _RECORDER is None:
+        _RECORDER = PT.Recorder(memory)
+        _RECORDER.Activate()
+    
+    return _RECORDER
+
+def _Add_IO (record: dict, elapsed: float) -> dict:
+    
+    if record is None: # cached job, or finalising
+        record = {"wall" : 0.0, "phases" : {}}
+    
+    record["wall"] += elapsed
+    record["phases"]["io"] = record["phases"].get("io", 0.0) + elapsed
+    
+    return record
+
+def _Deviation (result, reference) -> dict:
+    
+    # largest absolute and relative difference between two results, of any nesting
+    
+    result = np.asarray(_Numbers(result), dtype=np.float64)
+    reference = np.asarray(_Numbers(reference), dtype=np.float64)
+    if len(result) == 0:
+        return {"abs" : 0.0, "rel" : 0.0}
+    
+    difference = np.abs(result - reference)
+    relative = difference / np.maximum(np.abs(reference), np.finfo(np.float64).tiny)
+    
+    return {"abs" : float(np.max(difference)), "rel" : float(np.max(relative))}
+
+def _Numbers (value) -> list:
+    
+    if isinstance(value, dict):
+        return [number for entry in value.values() for number in _Numbers(entry)]
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [number for entry in value for number in _Numbers(entry)]
+    
+    return [float(value)]
+
+def _Exceeds (deviation: dict, tolerance: float) -> dict:
+    
+    # {"exceeds" : bool} of a point deviation, or nothing without a tolerance
+    
+    if tolerance is None:
+        return {}
+    
+    return {"exceeds" : deviation["abs"] > tolerance}
+
+def _Deviation_Summary (deviations: list, dtype: str, tolerance: float = None) -> dict:
+    
+    absolute = [deviation["abs"] for deviation in deviations] or [0.0]
+    relative = [deviation["rel"] for deviation in deviations] or [0.0]
+    
+    summary = {"dtype" : dtype, "points" : len(deviations), "max abs" : max(absolute), 
+               "mean abs" : float(np.mean(absolute)), "max rel" : max(relative)}
+    if tolerance is not None:
+        summary.update({"tolerance" : tolerance, "exceeding" : sum(deviation["exceeds"] for deviation in deviations)})
+    
+    return summary
+
+def _Print_Summary (summary: dict):
+    
+    print(f"phases of {summary['records']} records (jobs and finalising), {summary['wall']:.3f} s recorded, {summary['run wall']:.3f} s run:")
+    for name, phase in summary["phases"].items():
+        peak = f", peak {summary['peak'][name] / 2**20:.1f} MB" if "peak" in summary else ""
+        print(f"    {name:8} {phase['total']:10.3f} s {100 * phase['share']:6.1f} %   max {phase['max']:.4f} s{peak}")
+
+#-----------------------------------------------------------------------------#
+
+def _Job_Points (job: Job) -> list:
+    
+    # (ESN parameters, f_call parameters) of every point a job evaluates, in order
+    
+    if job.kind in ("row", "path"):
+        return job.payload
+    
+    return [job.payload]
+
+#-----------------------------------------------------------------------------#
+
+def _Sweep_Rows (sweep_param1, sweep_param2, double_sweep: bool) -> list:
+    
+    # one row per value of the first parameter for double sweeps, a single row
+    # holding every point for 1D sweeps. points keep their usual order.
+    
+    if double_sweep:
+        return [[(value1, value2) for value2 in sweep_param2] for value1 in sweep_param1]
+    
+    return [[(value1,) for value1 in sweep_param1]]
+
+#-----------------------------------------------------------------------------#
+
+def _Point_Params (sweep_names, values, defaults: dict, func_defaults: list, function_params: list, multi: bool = False):
+    
+    # sweep values are assigned to function_params entries of the same name (of every
+    # metric that has one), otherwise to the ESN parameters. returns (ESN parameters, 
+    # f_call parameters), the latter one entry per metric if multi.
+    
+    esn_params = dict(defaults)
+    func_params = [dict(params) for params in func_defaults]
+    
+    for name, value in zip(sweep_names, values):
+        if any(name in params for params in func_params):
+            for params in func_params:
+                if name in params:
+                    params[name] = value
+        else:
+            esn_params[name] = value
+    
+    values = []
+    for params, given in zip(func_params, function_params):
+        if type(given) != dict: # if function params is not a dict, those params cannot be swept, and will only be passed to f_call
+            values.append(given)
+        else:
+            values.append(params) # by name or in order, see Metric_Registry_V1
+    
+    if multi:
+        return esn_params, values
+    
+    return esn_params, values[0]
+
+#-----------------------------------------------------------------------------#
+
+def _Per_Metric (value, multi: bool) -> list:
+    
+    # f_call parameters or results of a point, as one entry per metric
+    
+    if multi:
+        return value
+    
+    return [value]
+
+#-----------------------------------------------------------------------------#
+
+def _Evaluate_Point (esn_params: dict, func_params, seed: int, f_call, training: bool, 
+                     gen_input: bool, backend: str, model = None, ridges: list = None, sparse_W: bool = False,
+                     state_cache: tuple = None, dtype: str = 'float64'):
+    
+    multi = isinstance(f_call, MM.Multi_Metric)
+    
+    # stored states only serve metrics that need nothing but states
+    if (state_cache is not None and model is None 
+        and any(metric.Plan() == "harvest" for metric in getattr(f_call, "metrics", [f_call]))):
+        return _Evaluate_Stored(esn_params, func_params, seed, f_call, training, backend, ridges, sparse_W, state_cache, dtype)
+    
+    res.set_seed(seed) # every point starts from the same random state, wherever it runs
+    
+    if model is None:
+        model = _Build_Model(esn_params, seed, training, backend, sparse_W, dtype)
             
-                    
+    path = {} if ridges is None else {"ridges" : ridges} # ridge path, see _Evaluate_Path
+    
+    if multi: # metrics needing a model of their own get a fresh one, built as this one
+        build = partial(_Fresh_Model, esn_params, seed, training, backend, sparse_W, dtype)
+        input_stream = HV.Gen_Input_Stream(model)
+        with PT.Phase("metric"):
+            return f_call(model, input_stream, *func_params, build=build, **path)
+    
+    input_stream = None
+    if gen_input: # generate input if required
+        input_stream = HV.Gen_Input_Stream(model) # 4 * node count, range [-0.5:0.5]
+    
+    with PT.Phase("metric"):
+        return f_call(model, input_stream, func_params, **path) # without input stream if None
 
+#-----------------------------------------------------------------------------#
 
+def _Build_Model (esn_params: dict, seed: int, training: bool, backend: str, sparse_W: bool = False, 
+                  dtype: str = 'float64'):
+    
+    from ESN_Maker_V4 import ESN_Maker as M
+    
+    with PT.Phase("build"):
+        AN_ESN = M(nn=1,
+                   out=False,
+                   init_W='uniform',
+                   rep=True,
+                   seed=seed,
+                   backend=backend,
+                   sparse_W=sparse_W,
+                   dtype=dtype,
+                   **{ESN_ARGS[name] : esn_params[name] for name in ESN_ARGS})
+        
+        model = AN_ESN.networks[0]
+        if training:
+            readout = Ridge(ridge=esn_params["ridge"])
+            model = model >> readout # ESN comprised of input node, reservoir node of nc neurons, and Ridge output layer
+    
+    return model
 
+def _Fresh_Model (esn_params: dict, seed: int, training: bool, backend: str, sparse_W: bool = False, 
+                  dtype: str = 'float64'):
+    
+    res.set_seed(seed) # the same model as the point's first
+    
+    return _Build_Model(esn_params, seed, training, backend, sparse_W, dtype)
 
+#-----------------------------------------------------------------------------#
 
+def _Evaluate_Stored (esn_params: dict, func_params, seed: int, f_call, training: bool, backend: str, 
+                      ridges: list = None, sparse_W: bool = False, state_cache: tuple = None, dtype: str = 'float64'):
+    
+    # the point's states are harvested once and stored, the metrics always run on the
+    # stored states through Replay_ESN models, never on the reservoir itself.
+    
+    states_cache = SC.State_Cache(*state_cache)
+    key = states_cache.Key(esn_params, seed, backend, sparse_W, training, dtype)
+    
+    with PT.Phase("io"):
+        stored = states_cache.Get(key)
+    if stored is None:
+        res.set_seed(seed) # same model and input stream as without state_dir
+        model = _Build_Model(esn_params, seed, training, backend, sparse_W, dtype)
+        input_stream = HV.Gen_Input_Stream(model)
+        reservoir, states = MM.Harvest_Reservoir(model, input_stream)
+        with PT.Phase("io"):
+            stored = states_cache.Put(key, input_stream, states, 
+                                      states_cache.Point(esn_params, seed, backend, sparse_W, training, dtype))
+    input_stream, states = stored
+    
+    multi = isinstance(f_call, MM.Multi_Metric)
+    metrics = f_call if multi else MM.Multi_Metric([f_call])
+    build = partial(_Fresh_Model, esn_params, seed, training, backend, sparse_W, dtype) # for "model" metrics
+    
+    with PT.Phase("metric"):
+        results = metrics.Evaluate(input_stream, states, *_Per_Metric(func_params, multi), 
+                                   ridge=esn_params["ridge"] if training else None, ridges=ridges, 
+                                   lr=esn_params["leak rate"], build=build, dtype=dtype)
+    
+    if multi:
+        return results
+    if ridges is None:
+        return results[0]
+    return [values[0] for values in results]
 
+#-----------------------------------------------------------------------------#
 
+def _Evaluate_Ensemble (points: list, seed: int, f_call, training: bool, sparse_W: bool = False, 
+                        dtype: str = 'float64') -> list:
+    
+    # ESN parameters may differ between members in anything but node count.
+    # each member is handed to f_call on its own, all with the same input stream.
+    
+    from ESN_Maker_V4 import ESN_Maker as M
+    
+    res.set_seed(seed)
+    
+    node_counts = {esn_params["node count"] for esn_params, func_params in points}
+    if len(node_counts) > 1:
+        raise Exception("ensemble mode cannot sweep node count along a row.")
+    
+    members = [{ESN_ARGS[name] : esn_params[name] for name in ESN_ARGS if name != "node count"} 
+               for esn_params, func_params in points]
+    
+    with PT.Phase("build"):
+        AN_ESN = M(nn=1,
+                   out=False,
+                   nc=node_counts.pop(),
+                   init_W='uniform',
+                   rep=True,
+                   seed=seed,
+                   backend='numpy',
+                   ensemble=members,
+                   sparse_W=sparse_W,
+                   dtype=dtype)
+    
+    input_stream = HV.Gen_Input_Stream(AN_ESN.networks[0]) # shared by the whole row
+    
+    results = []
+    for model, (esn_params, func_params) in zip(AN_ESN.networks, points):
+        if training:
+            model = model >> Ridge(ridge=esn_params["ridge"])
+        with PT.Phase("metric"):
+            if isinstance(f_call, MM.Multi_Metric):
+                results.append(f_call(model, input_stream, *func_params))
+            else:
+                results.append(f_call(model, input_stream, func_params))
+    
+    return results
+
+#-----------------------------------------------------------------------------#
+
+def _Ridge_Groups (points: list) -> list:
+    
+    # indices of the points, grouped by everything but the ridge value. groups are
+    # in order of their first point, indices in sweep order within each group.
+    
+    groups = {}
+    for index, (esn_params, func_params) in enumerate(points):
+        key = repr(([(name, value) for name, value in esn_params.items() if name != "ridge"], func_params))
+        groups.setdefault(key, []).append(index)
+    
+    return list(groups.values())
+
+#-----------------------------------------------------------------------------#
+
+def _Evaluate_Path (points: list, seed: int, f_call, gen_input: bool, backend: str, sparse_W: bool = False,
+                    state_cache: tuple = None, dtype: str = 'float64') -> list:
+    
+    # one model and one f_call for the whole ridge path, the metric trains its readout
+    # for every ridge value itself. the readout node only tells it there is one.
+    
+    esn_params, func_params = points[0]
+    ridges = [point_esn_params["ridge"] for point_esn_params, point_func_params in points]
+    
+    return _Evaluate_Point(esn_params, func_params, seed, f_call, True, gen_input, backend, ridges=ridges, 
+                           sparse_W=sparse_W, state_cache=state_cache, dtype=dtype)
+
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
+
+def _Evaluate_Grid (requests: list, points: list, seeds: list, settings: dict, executor, chunksize: int,
+                    caches: list, multi: bool) -> list:
+    
+    # (result, phase record, deviation) of every (point index, dataset index) in requests,
+    # in order. results in the caches are read back, the other points are evaluated as
+    # "point" jobs, all at once, spread over the executor if there is one.
+    
+    keys = [[cache.Point_Key(points[point][0], params, seeds[dataset]) 
+             for cache, params in zip(caches, _Per_Metric(points[point][1], multi))] for point, dataset in requests]
+    pending = [index for index, point_keys in enumerate(keys) 
+               if not caches or not all(cache.Has(key) for cache, key in zip(caches, point_keys))]
+    
+    jobs = [Job("point", points[requests[index][0]], None, seeds[requests[index][1]], **settings) for index in pending]
+    if executor is None:
+        computed = dict(zip(pending, map(_Evaluate_Job, jobs)))
+    else:
+        computed = dict(zip(pending, executor.map(_Evaluate_Job, jobs, chunksize=chunksize)))
+    
+    outputs = []
+    for index, ((point, dataset), point_keys) in enumerate(zip(requests, keys)):
+        if index in computed:
+            results, record, deviation = computed[index]
+            result, deviation = results[0], deviation[0] if deviation else None # a point job, one result
+            for cache, key, metric_result, params in zip(caches, point_keys, _Per_Metric(result, multi), 
+                                                         _Per_Metric(points[point][1], multi)):
+                cache.Put(key, metric_result, cache.Point(points[point][0], params, seeds[dataset]))
+        else:
+            result = [cache.Get(key) for cache, key in zip(caches, point_keys)]
+            result, record, deviation = result if multi else result[0], None, None
+        outputs.append((result, record, deviation))
+    
+    return outputs
+
+#-----------------------------------------------------------------------------#
+
+def _Adaptive_Sweep (shape: tuple, levels: int, tolerance: float, datasets: int, evaluate) -> tuple:
+    
+    """
+    quadtree refinement of a (n1, n2) sweep grid, n2 = 1 for 1D sweeps, in grid indices.
+    the coarse grid takes every 2^levels-th point of each axis, and its last. a cell
+    (the rectangle between neighbouring evaluated points) is split in four (two on an
+    axis it cannot split) when, for any number in the result, the spread of its corners'
+    seed means is both
+    
+        > tolerance x the range of the metric over the coarse grid       (gradient)
+        > the 95 % quantile of the spread of as many means of seed noise (not noise)
+        
+    the quantile is the studentized range's, with the std across seeds pooled over the
+    corners, so cells whose corners only differ by seed noise stay coarse, bar 5 % of
+    them (with one dataset, the gradient alone decides). new corners of a level are
+    evaluated together, every dataset's seed at once: evaluate(requests) with requests a
+    list of (point index, dataset index), returns (result, record, deviation) of each.
+    points never evaluated are filled bilinearly from the corners of the smallest cell
+    holding them.
+    
+    returns the full grid of results of every dataset, in sweep order, the evaluated
+    points, as [i, j], and (point index, dataset, record, deviation) of every evaluation.
+    """
+    
+    n1, n2 = shape
+    stride = 2 ** levels
+    axes = [sorted(set(range(0, n, stride)) | {n - 1}) for n in shape]
+    pairs = [list(zip(axis, axis[1:])) or [(0, 0)] for axis in axes]
+    
+    values = {} # (i, j) --> result of every dataset
+    logs = []
+    def run(corners):
+        new = sorted({corner for corner in corners if corner not in values})
+        requests = [(i * n2 + j, dataset) for i, j in new for dataset in range(datasets)]
+        outputs = evaluate(requests)
+        for number, (i, j) in enumerate(new):
+            values[(i, j)] = [result for result, record, deviation in outputs[number * datasets:(number + 1) * datasets]]
+        logs.extend((point, dataset, record, deviation) for (point, dataset), (result, record, deviation) in zip(requests, outputs))
+    
+    cells = [(a, b, c, d) for a, b in pairs[0] for c, d in pairs[1]]
+    run([corner for cell in cells for corner in _Corners(cell)])
+    
+    numbers = {corner : np.array([_Numbers(result) for result in results]) for corner, results in values.items()}
+    means = np.array([point.mean(axis=0) for point in numbers.values()])
+    scale = np.ptp(means, axis=0)
+    scale[scale == 0] = 1.0 # flat over the coarse grid, absolute differences
+    
+#-------------------------------#REFINE#--------------------------------------#
+    
+    leaves = []
+    while cells:
+        split = []
+        for cell in cells:
+            a, b, c, d = cell
+            corners = [numbers[corner] for corner in _Corners(cell)]
+            spread = np.ptp([point.mean(axis=0) for point in corners], axis=0)
+            noise = 0 * spread # one dataset, no noise estimate
+            if datasets > 1 and len(corners) > 1:
+                pooled = np.sqrt(np.mean([point.var(axis=0, ddof=1) for point in corners], axis=0))
+                noise = _Range_Quantile(len(corners), len(corners) * (datasets - 1)) * pooled / np.sqrt(datasets)
+            if (b - a > 1 or d - c > 1) and np.any((spread > tolerance * scale) & (spread > noise)):
+                split.append(cell)
+            else:
+                leaves.append(cell)
+        
+        cells = [child for cell in split for child in _Split(cell)]
+        run([corner for cell in cells for corner in _Corners(cell)])
+        numbers.update({corner : np.array([_Numbers(result) for result in results]) 
+                        for corner, results in values.items() if corner not in numbers})
+    
+#--------------------------------#FILL#---------------------------------------#
+    
+    grid = dict(values)
+    for a, b, c, d in sorted(leaves, key=lambda cell: (cell[1] - cell[0]) * (cell[3] - cell[2])): # finest first
+        for i in range(a, b + 1):
+            for j in range(c, d + 1):
+                if (i, j) in grid:
+                    continue
+                t1 = (i - a) / (b - a) if b > a else 0.0
+                t2 = (j - c) / (d - c) if d > c else 0.0
+                weights = {}
+                for corner, weight in (((a, c), (1 - t1) * (1 - t2)), ((b, c), t1 * (1 - t2)), 
+                                       ((a, d), (1 - t1) * t2), ((b, d), t1 * t2)): # corners repeat in 1D
+                    weights[corner] = weights.get(corner, 0.0) + weight
+                corners = [corner for corner in weights if weights[corner] > 0]
+                grid[(i, j)] = [_Blend([values[corner][dataset] for corner in corners], [weights[corner] for corner in corners])
+                                for dataset in range(datasets)]
+    
+    results = [[grid[(i, j)][dataset] for i in range(n1) for j in range(n2)] for dataset in range(datasets)]
+    
+    return results, [[i, j] for i, j in sorted(values)], logs
 
+def _Sequential_Seeds (count: int, initial: int, maximum: int, tolerance: float, multi: bool, evaluate) -> tuple:
+    
+    # every one of count points gets the first initial seeds, then, round by round, the
+    # next seed while the half width of its 95 % Student t confidence interval is above
+    # tolerance (for any number in the result) and it has fewer than maximum. a round
+    # is one call of evaluate(requests), requests as in _Adaptive_Sweep.
+    
+    # returns [means, stds, seed counts] of the points, in sweep order, the seed count
+    # of every point, and (point index, seed index, record, deviation) of every evaluation
+    
+    results = [[] for point in range(count)]
+    logs = []
+    requests = [(point, seed) for point in range(count) for seed in range(initial)]
+    while requests:
+        for (point, seed), (result, record, deviation) in zip(requests, evaluate(requests)):
+            results[point].append(result) # requests are in seed order for each point
+            logs.append((point, seed, record, deviation))
+        requests = [(point, len(point_results)) for point, point_results in enumerate(results) 
+                    if len(point_results) < maximum and _Half_Width(point_results) > tolerance]
+    
+    counts = [len(point_results) for point_results in results]
+    means = [_Blend(point_results, [1 / len(point_results)] * len(point_results)) for point_results in results]
+    stds = [_Std(point_results) for point_results in results]
+    seed_counts = [[number] * len(results[0][0]) if multi else number for number in counts] # one per metric
+    
+    return [means, stds, seed_counts], counts, logs
 
+def _Half_Width (results: list) -> float:
+    
+    if len(results) < 2:
+        return np.inf
+    
+    numbers = np.array([_Numbers(result) for result in results])
+    
+    return float(np.max(student_t.ppf(0.975, len(results) - 1) * numbers.std(axis=0, ddof=1) / np.sqrt(len(results))))
 
+def _Std (results: list):
+    
+    # std across results of the same structure (numbers, lists, dicts), as _Blend
+    
+    if isinstance(results[0], dict):
+        return {name : _Std([result[name] for result in results]) for name in results[0]}
+    if isinstance(results[0], (list, tuple)):
+        return [_Std(list(entries)) for entries in zip(*results)]
+    
+    return float(np.std(results, ddof=1)) if len(results) > 1 else 0.0
+
+@lru_cache(maxsize=None)
+def _Range_Quantile (means: int, df: int) -> float:
+    
+    return studentized_range.ppf(0.95, means, df) # slow to compute, few (means, df) per sweep
+
+def _Corners (cell: tuple) -> list:
+    
+    a, b, c, d = cell
+    return list(dict.fromkeys([(a, c), (a, d), (b, c), (b, d)])) # without repeats, for 1D cells
+
+def _Split (cell: tuple) -> list:
+    
+    a, b, c, d = cell
+    first = [(a, (a + b) // 2), ((a + b) // 2, b)] if b - a > 1 else [(a, b)]
+    second = [(c, (c + d) // 2), ((c + d) // 2, d)] if d - c > 1 else [(c, d)]
+    
+    return [(a, b, c, d) for a, b in first for c, d in second]
+
+def _Blend (results: list, weights: list):
+    
+    # weighted sum of results of the same structure (numbers, lists, dicts)
+    
+    if isinstance(results[0], dict):
+        return {name : _Blend([result[name] for result in results], weights) for name in results[0]}
+    if isinstance(results[0], (list, tuple)):
+        return [_Blend(list(entries), weights) for entries in zip(*results)]
+    
+    return float(sum(weight * result for weight, result in zip(weights, results)))
 
+#-----------------------------------------------------------------------------#
+#-----------------------------------------------------------------------------#
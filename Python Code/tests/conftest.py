@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:02:11 2026
+"""
+
+"""
+pytest set up for the tests of the adjuncts, metrics and tools. the modules import each
+other by bare name, as with their folders on the Spyder path, so the folders are put on
+sys.path here. run from Python Code/:
+
+    python -m pytest -q tests
+
+fixtures:
+
+    shannon, mc --> (name, path) target_function tuples of the two metrics
+    build       --> build(nc, seed, backend, training, **ESN_Maker kwargs) returns a model,
+                    with the global seeds set first so that two builds are identical
+    stream      --> stream(length, seed) returns an input stream in [-0.5:0.5]
+    sweep       --> sweep(dir_path, **GetDataset kwargs) runs GetDataset in dir_path, created
+                    if need be, and returns {folder name : results} of every .JSON it saved
+"""
+
+import sys
+import json
+from os import path, walk, makedirs
+
+CODE = path.join(path.dirname(path.abspath(__file__)), "..")
+METRICS = path.join(CODE, "Metrics")
+sys.path[:0] = [path.join(CODE, "Adjuncts"), path.join(CODE, "Tools"),
+                path.join(METRICS, "Shannon Entropy"), path.join(METRICS, "Memory Capacity")]
+
+import numpy as np
+import pytest
+import reservoirpy
+
+reservoirpy.verbosity(0)
+
+#-----------------------------------------------------------------------------#
+
+@pytest.fixture
+def shannon():
+    return ("Shannon_Entropy", path.join(METRICS, "Shannon Entropy", "shannon_entropy_V15.py"))
+
+@pytest.fixture
+def mc():
+    return ("MC_n", path.join(METRICS, "Memory Capacity", "memory_capacity_V2.py"))
+
+@pytest.fixture
+def build():
+
+    from ESN_Maker_V4 import ESN_Maker as M
+    from reservoirpy.nodes import Ridge
+
+    def make(nc: int = 30, seed: int = 3, backend: str = 'numpy', training: bool = False, ridge: float = 1e-7, **kwargs):
+        reservoirpy.set_seed(seed)
+        np.random.seed(seed)
+        model = M(nn=1, out=False, nc=nc, rep=True, seed=seed, backend=backend, **kwargs).networks[0]
+        if training:
+            model = model >> Ridge(ridge=ridge)
+        return model
+
+    return make
+
+@pytest.fixture
+def stream():
+
+    def make(length: int = 200, seed: int = 0) -> np.ndarray:
+        return np.random.default_rng(seed).random([length, 1]) - 0.5
+
+    return make
+
+@pytest.fixture
+def sweep():
+
+    import GetDatasets_V7 as GD
+
+    def run(dir_path, **kwargs) -> dict:
+        makedirs(dir_path, exist_ok=True)
+        GD.GetDataset(dir_path=str(dir_path), **kwargs)
+        results = {}
+        for folder, _, files in walk(dir_path):
+            for name in files:
+                if not name.endswith(".jsonl"):
+                    with open(path.join(folder, name), 'r') as infile:
+                        results[path.basename(folder)] = json.load(infile)
+        return results
+
+    return run
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 23:25:09 2026
+"""
+
+"""
+adaptive sweeps: the points evaluated against the same points of a dense sweep, and the
+refinement of cells crossed by an edge in the metric but not of cells holding only seed
+noise.
+"""
+
+import numpy as np
+import GetDatasets_V7 as GD
+
+def test_evaluated_points_equal_dense (sweep, shannon, tmp_path):
+
+    settings = dict(datasets=3, double_sweep=True, gen_input=True, backend='numpy', seeds=[7, 8, 9], target_function=shannon,
+                    function_params={"columnwise" : False, "history_length" : 2, "bucket_count" : 10},
+                    parameters={"leak rate" : (0.1, 0.9, 0.1), "spectral radius" : (0.5, 1.5, 0.25)})
+
+    dense = sweep(tmp_path / "dense", **settings)
+    adaptive = sweep(tmp_path / "adaptive", adaptive=2, **settings)
+
+    for name in dense: # one folder per dataset
+        evaluated = adaptive[name][0]["adaptive"]["evaluated"]
+        assert len(adaptive[name]) == len(dense[name]) == 1 + 9 * 5 # the full grid, in sweep order
+        assert len(evaluated) < 9 * 5
+        for i, j in evaluated:
+            assert adaptive[name][1 + 5 * i + j] == dense[name][1 + 5 * i + j]
+
+def _Evaluated (signal: float, noise: float, seed: int) -> int:
+
+    n1, n2, datasets = 17, 17, 4
+    draws = np.random.default_rng(seed).normal(0, 1, (n1 * n2, datasets))
+    metric = lambda point, dataset: signal * float(point // n2 >= 11) + noise * draws[point, dataset]
+
+    _, evaluated, _ = GD._Adaptive_Sweep((n1, n2), 2, 0.1, datasets, lambda requests: [(metric(*request), None, None) for request in requests])
+
+    return len(evaluated)
+
+def test_edge_refined_noise_not ():
+
+    noise = [_Evaluated(0, 1, seed) for seed in range(10)] # 25 --> the 5 x 5 coarse grid only
+    edge = [_Evaluated(1, 0.05, seed) for seed in range(10)]
+
+    assert np.median(noise) < 40 and min(noise) == 25 # about 5 % of the cells split by chance, at every level
+    assert min(edge) >= 75 and np.mean(edge) > 2 * np.mean(noise) # the cells across the edge, down to the step
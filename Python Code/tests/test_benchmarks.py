@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:51:36 2026
+"""
+
+"""
+the benchmark suite on a one case grid: baseline written on the first run, regressions
+against it raised, baselines of another grid refused.
+"""
+
+import json
+import pytest
+import Benchmarks_V1 as BM
+
+TINY = {"shannon" : {"bucket_count" : (10,), "history_length" : (1,), "columnwise" : (False,), "nc" : 30},
+        "mc" : {"order" : (), "stream_length" : (), "nc" : 30},
+        "esn" : {"nc" : (), "cny" : (), "backend" : ()},
+        "sweep" : {"leak rate" : (0.1, 0.1, 0.1), "spectral radius" : (0.5, 0.5, 0.5)}}
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+
+    monkeypatch.setitem(BM.GRIDS, "small", TINY)
+    baseline_path = tmp_path / "baseline.json"
+
+    def benchmark(**kwargs) -> dict:
+        return BM.Run_Benchmarks(baseline_path=str(baseline_path), repeats=1, cases=["Shannon_Entropy"], **kwargs)
+
+    return benchmark, baseline_path
+
+def test_first_run_writes_baseline (run):
+
+    benchmark, baseline_path = run
+    results = benchmark()
+
+    assert list(results) == ["Shannon_Entropy[nc=30,b=10,h=1,col=False]"] # sizes in the name
+    with open(baseline_path, 'r') as infile:
+        baseline = json.load(infile)
+    assert baseline["grid"] == "small" and set(baseline["throughput"]) == set(results)
+    assert benchmark(threshold=0.99)[list(results)[0]]["baseline"] == baseline["throughput"][list(results)[0]]
+
+def test_regression_raised (run):
+
+    benchmark, baseline_path = run
+    benchmark()
+    with open(baseline_path, 'r') as infile:
+        baseline = json.load(infile)
+    baseline["throughput"] = {name : 1000 * throughput for name, throughput in baseline["throughput"].items()}
+    with open(baseline_path, 'w') as outfile:
+        json.dump(baseline, outfile)
+
+    with pytest.raises(BM.Regression):
+        benchmark()
+
+def test_other_grid_refused (run):
+
+    benchmark, baseline_path = run
+    benchmark()
+    with open(baseline_path, 'r') as infile:
+        baseline = json.load(infile)
+    baseline["grid"] = "full"
+    with open(baseline_path, 'w') as outfile:
+        json.dump(baseline, outfile)
+
+    with pytest.raises(Exception, match="grid"):
+        benchmark()
+    assert benchmark(update=True) # an update replaces it
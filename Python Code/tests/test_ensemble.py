@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:28:03 2026
+"""
+
+"""
+a NumPy_Ensemble of a sweep row against the same reservoirs built and run one at a time.
+"""
+
+import numpy as np
+import pytest
+
+MEMBERS = [{"lr" : 0.1, "sr" : 0.5}, {"lr" : 0.4, "sr" : 0.9}, {"lr" : 0.7, "sr" : 1.3}]
+
+def test_members_equal_single_models (build, stream):
+
+    from ESN_Maker_V4 import ESN_Maker as M
+
+    input_stream = stream(120)
+    networks = M(nn=1, out=False, nc=40, rep=True, seed=3, backend='numpy', init=False, ensemble=MEMBERS).networks
+
+    for network, member in zip(networks, MEMBERS):
+        np.testing.assert_allclose(network.run(input_stream), build(40, init=False, **member).run(input_stream), atol=1e-12)
+
+def test_trained_members_equal_single_models (build, stream):
+
+    from ESN_Maker_V4 import ESN_Maker as M
+    from reservoirpy.nodes import Ridge
+
+    input_stream = stream(300)
+    networks = M(nn=1, out=False, nc=40, rep=True, seed=3, backend='numpy', init=False, ensemble=MEMBERS).networks
+
+    for network, member in zip(networks, MEMBERS):
+        network = network >> Ridge(ridge=1e-6)
+        single = build(40, init=False, training=True, ridge=1e-6, **member)
+        network.fit(input_stream[:150], input_stream[1:151])
+        single.fit(input_stream[:150], input_stream[1:151])
+        np.testing.assert_allclose(network.run(input_stream[150:]), single.run(input_stream[150:]), atol=1e-10)
+
+def test_members_must_run_the_same_inputs (stream):
+
+    from ESN_Maker_V4 import ESN_Maker as M
+
+    networks = M(nn=1, out=False, nc=20, rep=True, seed=3, backend='numpy', init=False, ensemble=MEMBERS).networks
+    networks[0].run(stream(5))
+
+    with pytest.raises(ValueError):
+        networks[1].run(stream(6))
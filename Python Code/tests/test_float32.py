@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:58:03 2026
+"""
+
+"""
+float32 simulation against float64: the dtype of states, results close to float64 ones,
+and the deviation log of validate_dtype with and without a tolerance.
+"""
+
+import json
+import numpy as np
+import pytest
+import Harvest_V1 as HV
+
+SETTINGS = dict(datasets=1, double_sweep=True, gen_input=True, training=True, seeds=[7],
+                parameters={"leak rate" : (0.1, 0.5, 0.2), "ridge" : (1e-6, 2e-6, 1e-6)})
+
+@pytest.fixture
+def metrics(shannon, mc):
+    return dict(target_function=[mc, shannon],
+                function_params=[{"nc" : 30, "order" : 2}, {"columnwise" : False, "history_length" : 2, "bucket_count" : 10}])
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+def test_states_in_dtype (build, stream, backend):
+
+    states = HV.Harvest_States(build(backend=backend, init_W='uniform', dtype='float32'), stream(20))
+
+    assert states.dtype == np.float32
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+def test_float32_close_to_float64 (sweep, metrics, tmp_path, backend):
+
+    double = sweep(tmp_path / "double", backend=backend, **metrics, **SETTINGS)
+    single = sweep(tmp_path / "single", backend=backend, dtype='float32', **metrics, **SETTINGS)
+
+    for name in double:
+        np.testing.assert_allclose(single[name][1:], double[name][1:], atol=5e-2)
+
+@pytest.mark.parametrize("tolerance", [None, 5e-3])
+def test_deviation_log (sweep, metrics, tmp_path, tolerance):
+
+    single = sweep(tmp_path, backend='numpy', dtype='float32', validate_dtype=True, dtype_tolerance=tolerance,
+                   **metrics, **SETTINGS)
+    double = sweep(tmp_path / "double", backend='numpy', **metrics, **SETTINGS)
+
+    with open(tmp_path / "dtype_deviation.jsonl", 'r') as infile:
+        lines = [json.loads(line) for line in infile]
+    points, summary = lines[:-1], lines[-1]["summary"]
+
+    assert summary["points"] == len(points) == 9 # 3 leak rates x 3 ridges, the metrics in one line each
+    assert summary["max abs"] == max(point["abs"] for point in points)
+    assert summary["max abs"] >= max(np.abs(np.subtract(single[name][1:], double[name][1:])).max() for name in double) - 1e-12
+    if tolerance is None:
+        assert "exceeds" not in points[0] and "exceeding" not in summary
+    else:
+        assert summary["exceeding"] == sum(point["exceeds"] for point in points)
+        assert all(point["exceeds"] == (point["abs"] > tolerance) for point in points)
+
+def test_tolerance_needs_validation (sweep, metrics, tmp_path):
+
+    with pytest.raises(Exception, match="validate_dtype"):
+        sweep(tmp_path, dtype='float32', dtype_tolerance=1e-3, **metrics, **SETTINGS)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:15:20 2026
+"""
+
+"""
+batched state harvesting against one model.call per timestep, with both backends.
+"""
+
+import numpy as np
+import pytest
+import Harvest_V1 as HV
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+def test_batched_equals_stepwise (build, stream, backend):
+
+    input_stream = stream(80)
+    model = build(backend=backend)
+    stepwise = np.array([model.call(data)[0] for data in input_stream])
+
+    np.testing.assert_allclose(HV.Harvest_States(build(backend=backend), input_stream), stepwise, rtol=1e-12, atol=1e-14)
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+def test_chunks_equal_whole_stream (build, stream, backend):
+
+    input_stream = stream(100)
+    chunks = [states for start, states in HV.Harvest_Chunks(build(backend=backend), input_stream, 17)]
+
+    np.testing.assert_allclose(np.concatenate(chunks), HV.Harvest_States(build(backend=backend), input_stream),
+                               rtol=1e-12, atol=1e-14)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:44:18 2026
+"""
+
+"""
+instrumented sweeps against plain ones: same results, one phases.jsonl line per job and
+a run summary, also when a metric fails, and the Job tuples the jobs are described by.
+"""
+
+import json
+import pytest
+import GetDatasets_V7 as GD
+
+@pytest.mark.parametrize("instrument", ['time', 'memory'])
+def test_instrumented_equals_plain (sweep, shannon, tmp_path, instrument):
+
+    settings = dict(datasets=1, double_sweep=True, gen_input=True, backend='numpy', seeds=[7], target_function=shannon,
+                    function_params={"columnwise" : False, "history_length" : 2, "bucket_count" : 10},
+                    parameters={"leak rate" : (0.1, 0.5, 0.2), "input scaling" : (0.5, 1.0, 0.5)})
+
+    plain = sweep(tmp_path / "plain", **settings)
+    timed = sweep(tmp_path / "timed", instrument=instrument, **settings)
+
+    assert timed == plain
+
+    with open(tmp_path / "timed" / "phases.jsonl", 'r') as infile:
+        lines = [json.loads(line) for line in infile]
+    jobs, summary = lines[:-1], lines[-1]["summary"]
+
+    assert [line["job"] for line in jobs].count("point") == 6 # 3 leak rates x 2 input scalings
+    for line in jobs:
+        assert sum(line["phases"].values()) == pytest.approx(line["wall"], rel=1e-6, abs=1e-6)
+        assert ("peak total" in line) == (instrument == 'memory' and line["job"] == "point")
+    assert summary["instrument"] == instrument and {"build", "harvest", "metric"} <= set(summary["phases"])
+
+def test_job_fields_by_name (shannon):
+
+    job = GD.Job("point", ((0.1, 0.5), 0), None, 7, shannon, False, True, 'numpy', False, None, 'float32', True, None)
+    reference = job._replace(state_cache=None, dtype='float64', validate=False)
+
+    assert reference.dtype == 'float64' and not reference.validate
+    assert reference._replace(dtype='float32', validate=True) == job
+    assert reference.seed == 7 and reference.target_function == shannon and reference.backend == 'numpy'
+
+FAILING = '''
+CALLS = []
+
+def Failing(model, input_stream):
+    CALLS.append(1)
+    if len(CALLS) > 4: # the third point, after its float32 run
+        raise RuntimeError("metric failed")
+    return 0.5
+'''
+
+def test_logs_summarised_when_a_metric_fails (sweep, tmp_path):
+
+    file = tmp_path / "failing.py"
+    file.write_text(FAILING)
+
+    with pytest.raises(RuntimeError, match="metric failed"):
+        sweep(tmp_path / "sweep", datasets=1, double_sweep=True, gen_input=True, backend='numpy', seeds=[7],
+              target_function=("Failing", str(file)), parameters={"leak rate" : (0.1, 0.5, 0.2), "input scaling" : (0.5, 1.0, 0.5)},
+              instrument='time', dtype='float32', validate_dtype=True)
+
+    for name, points in (("phases.jsonl", "records"), ("dtype_deviation.jsonl", "points")):
+        with open(tmp_path / "sweep" / name, 'r') as infile:
+            lines = [json.loads(line) for line in infile]
+        assert lines[-1]["summary"][points] == len(lines) - 1 == 2 # the points done before it failed
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:55:31 2026
+"""
+
+"""
+MC_n(legendre_profile=True) against one readout trained and scored per delay and degree,
+and with chunked harvesting against the whole stream at once.
+"""
+
+import numpy as np
+import pytest
+from scipy.special import eval_legendre
+import Readout_V1 as RO
+from memory_capacity_V2 import MC_n
+
+NC, DELAYS, ORDER = 30, 8, 3
+
+def _Single_Target (states, input_stream, delay, degree):
+
+    u = input_stream[:,0]
+    scaled = 2 * (u - u.min()) / (u.max() - u.min() + 1e-16) - 1
+    split = len(u) // 2 - DELAYS
+    target = eval_legendre(degree, scaled[DELAYS - delay:len(u) - delay])
+    Wout, bout = RO.Ridge_Solve(states[DELAYS:][:split], target[:split], 1e-7)
+    prediction = (states[DELAYS:][split:] @ Wout + bout)[:,0]
+
+    return np.corrcoef(prediction, target[split:])[0,1] ** 2
+
+def test_profile_equals_single_target_readouts (build, stream):
+
+    input_stream = stream(300)
+    profile = MC_n(build(NC, init=False, training=True), input_stream, NC, ORDER, legendre_profile=True, max_delay=DELAYS)
+    states = build(NC, init=False).run(input_stream)
+
+    for delay in (1, 4, DELAYS):
+        for degree in range(1, ORDER + 1):
+            assert profile["capacity"][delay - 1][degree - 1] \
+                == pytest.approx(_Single_Target(states, input_stream, delay, degree), rel=1e-6, abs=1e-9)
+    assert profile["total"] == pytest.approx(np.sum(profile["capacity"]))
+
+def test_chunked_profile_equals_whole_stream (build, stream):
+
+    input_stream = stream(300)
+    whole = MC_n(build(NC, init=False, training=True), input_stream, NC, ORDER, legendre_profile=True, max_delay=DELAYS)
+    chunked = MC_n(build(NC, init=False, training=True), input_stream, NC, ORDER, legendre_profile=True, max_delay=DELAYS,
+                   chunk_size=37)
+
+    np.testing.assert_allclose(chunked["capacity"], whole["capacity"], rtol=1e-5, atol=1e-9) # summation order
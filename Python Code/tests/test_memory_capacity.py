@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:50:09 2026
+"""
+
+"""
+the vectorised MC_n against the original loops over timesteps and summation terms, and
+every order from one fit against one call per order.
+"""
+
+import numpy as np
+import pytest
+from scipy.special import binom
+from memory_capacity_V2 import MC_n
+
+def _Reference (model, input_stream, nc, order):
+
+    n = len(input_stream)
+    m = int(n / 2)
+    model = model.fit(input_stream[0:m], input_stream[1:m+1], warmup=0)
+    Y_pred = model.run(input_stream[m:])
+
+    future = np.zeros([Y_pred.shape[0]])
+    for i in range(m):
+        for j in range(order):
+            first_term = (input_stream[i,0] - 1) ** (order - j)
+            future[i] += first_term * binom(order, j) ** 2 * first_term * (input_stream[i,0] + 1) ** j
+
+    sum_term = 0
+    for i in range(nc):
+        sum_term += (future[i] - Y_pred[i]) ** 2
+    MSE = sum_term / m
+    for i in range(m):
+        sum_term += (future[i] - Y_pred[i] / m) ** 2
+
+    return (MSE / (sum_term / m))[0]
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+@pytest.mark.parametrize("order, length", [(1, 200), (3, 200), (6, 201)])
+def test_matches_reference_loops (build, stream, backend, order, length):
+
+    input_stream = stream(length, seed=order)
+    expected = _Reference(build(40, backend=backend, init=False, training=True), input_stream, 40, order)
+
+    assert MC_n(build(40, backend=backend, init=False, training=True), input_stream, 40, order) \
+        == pytest.approx(expected, rel=1e-9)
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+def test_all_orders_equal_one_call_per_order (build, stream, backend):
+
+    input_stream = stream(300)
+    expected = [MC_n(build(40, backend=backend, init=False, training=True), input_stream, 40, order) for order in range(1, 7)]
+    result = MC_n(build(40, backend=backend, init=False, training=True), input_stream, 40, 6, all_orders=True)
+
+    np.testing.assert_allclose(result["NMSE"], expected, rtol=1e-12)
+    assert result["total"] == pytest.approx(sum(expected), rel=1e-12)
+
+def test_all_orders_with_ridges (build, stream):
+
+    ridges = [1e-7, 1e-3]
+    input_stream = stream(300)
+    results = MC_n(build(40, init=False, training=True), input_stream, 40, 3, ridges=ridges, all_orders=True)
+
+    for order in range(1, 4):
+        expected = MC_n(build(40, init=False, training=True), input_stream, 40, order, ridges=ridges)
+        np.testing.assert_allclose([result["NMSE"][order - 1] for result in results], expected, rtol=1e-12)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:37:05 2026
+"""
+
+"""
+the metric registry: declared and legacy metric files, binding of function parameters,
+one import per file until it changes.
+"""
+
+import os
+import numpy as np
+import pytest
+import Metric_Registry_V1 as MR
+
+LEGACY = '''
+def Scaled_Sum(model, input_stream, scale, shift=0.0):
+    return float(scale * input_stream.sum() + shift)
+
+def Another(model, input_stream):
+    return 0.0
+'''
+
+@pytest.fixture
+def legacy(tmp_path):
+
+    file = tmp_path / "legacy.py"
+    file.write_text(LEGACY)
+
+    return ("Scaled_Sum", str(file))
+
+def test_declared_metrics (shannon, mc):
+
+    entropy, capacity = MR.Load(shannon), MR.Load(mc)
+
+    assert entropy.declared and entropy.Plan() == "harvest" and not entropy.needs_training
+    assert capacity.needs_training and capacity.ridges
+    assert capacity.parameters[:2] == ["nc", "order"]
+
+def test_legacy_metric_parameters_bound_by_name_or_position (legacy):
+
+    metric = MR.Load(legacy)
+    stream = np.ones([4, 1])
+
+    assert not metric.declared and metric.Plan() == "model"
+    assert metric(None, stream, {"scale" : 2.0, "shift" : 1.0}) == 9.0
+    assert metric(None, stream, {"shift" : 1.0, "scale" : 2.0}) == 9.0 # by name, whatever the order
+    assert metric(None, stream, {"a" : 2.0, "b" : 1.0}) == 9.0 # by position, names unknown
+    assert metric(None, stream, [3.0]) == 12.0
+
+def test_imported_once_until_changed (legacy):
+
+    first = MR.Load(legacy)
+    assert MR.Load(legacy) is first
+
+    with open(legacy[1], 'a') as outfile:
+        outfile.write("\n# changed\n")
+    os.utime(legacy[1], ns=(os.stat(legacy[1]).st_atime_ns, os.stat(legacy[1]).st_mtime_ns + 10**9))
+
+    assert MR.Load(legacy) is not first
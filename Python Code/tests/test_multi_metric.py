@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:24:40 2026
+"""
+
+"""
+several metrics evaluated from one model and harvest per sweep point against a sweep of
+each metric on its own.
+"""
+
+import numpy as np
+import pytest
+
+SHANNON_PARAMS = [{"columnwise" : False, "history_length" : 2, "bucket_count" : 10},
+                  {"columnwise" : True, "history_length" : 1, "bucket_count" : 20}]
+MC_PARAMS = [{"nc" : 30, "order" : 1}, {"nc" : 30, "order" : 2}]
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+@pytest.mark.parametrize("metric, function_params", [("shannon", SHANNON_PARAMS), ("mc", MC_PARAMS)])
+def test_multi_equals_single (sweep, request, tmp_path, backend, metric, function_params):
+
+    name, file = request.getfixturevalue(metric)
+    names = [f"{name}_{index}" for index in range(len(function_params))]
+    settings = dict(datasets=1, double_sweep=True, gen_input=True, backend=backend, seeds=[7], training=metric == "mc",
+                    parameters={"leak rate" : (0.1, 0.5, 0.2), "input scaling" : (0.5, 1.0, 0.5)})
+
+    multi = sweep(tmp_path / "multi", target_function=[(metric_name, file) for metric_name in names],
+                  function_params=function_params, **settings)
+    for metric_name, params in zip(names, function_params):
+        single = sweep(tmp_path / metric_name, target_function=(metric_name, file), function_params=params, **settings)
+        assert single[metric_name + "1"][0] == multi[metric_name + "1"][0]
+        np.testing.assert_allclose(multi[metric_name + "1"][1:], single[metric_name + "1"][1:], rtol=1e-10, atol=1e-12)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:20:47 2026
+"""
+
+"""
+the NumPy/SciPy reservoir backend of ESN_Maker against reservoirpy: the same weights and
+states from the same seed, the same trained readout, and with init_W, weights with the
+same statistics, W, Win and bias drawn independently of each other.
+"""
+
+import numpy as np
+import pytest
+import Harvest_V1 as HV
+
+def _Weights (model, backend):
+
+    if backend == 'numpy':
+        return model.W.toarray(), np.asarray(model.Win), np.asarray(model.bias)
+    reservoir = model.get_node(HV.Find_Reservoir(model))
+
+    return tuple(np.asarray(matrix.toarray() if hasattr(matrix, "toarray") else matrix)
+                 for matrix in (reservoir.W, reservoir.Win, reservoir.bias))
+
+def test_states_equal_reservoirpy (build, stream):
+
+    input_stream = stream(150)
+    numpy_model, reservoirpy_model = build(40, init=False), build(40, init=False, backend='reservoirpy')
+
+    np.testing.assert_allclose(numpy_model.run(input_stream), reservoirpy_model.run(input_stream), atol=1e-12)
+    for numpy_weights, reservoirpy_weights in zip(_Weights(numpy_model, 'numpy'), _Weights(reservoirpy_model, 'reservoirpy')):
+        np.testing.assert_array_equal(numpy_weights.reshape(reservoirpy_weights.shape), reservoirpy_weights) # drawn on the first run
+
+def test_trained_readout_equals_reservoirpy (build, stream):
+
+    input_stream = stream(300)
+    outputs = []
+    for backend in ('numpy', 'reservoirpy'):
+        model = build(40, init=False, backend=backend, training=True)
+        model.fit(input_stream[:150], input_stream[1:151])
+        outputs.append(model.run(input_stream[150:]))
+
+    np.testing.assert_allclose(*outputs, atol=1e-8)
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+def test_init_W_statistics (build, stream, backend):
+
+    model = build(200, init=False, init_W='uniform', backend=backend)
+    model.run(stream(5)) # weights set on the first run
+    W, Win, bias = _Weights(model, backend)
+
+    assert np.abs(W).max() <= 0.5 and np.abs(Win).max() <= 0.5
+    assert W.std() == pytest.approx(1 / np.sqrt(12), abs=0.01) # uniform on [-0.5:0.5]
+    assert abs(np.corrcoef(Win[:,0], W[:,0])[0,1]) < 0.3 # independent draws, not the same ones
+    assert not np.array_equal(Win[:,0], W[:,0])
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:39:15 2026
+"""
+
+"""
+resumable sweeps through Result_Cache_V1: a cached sweep is read back without evaluating
+a point, and an extended one only evaluates its new points.
+"""
+
+import numpy as np
+import GetDatasets_V7 as GD
+import Result_Cache_V1 as RC
+
+SETTINGS = dict(datasets=1, gen_input=True, backend='numpy', seeds=[7],
+                function_params={"columnwise" : False, "history_length" : 2, "bucket_count" : 10})
+
+def _Counting (monkeypatch) -> list:
+
+    evaluated = []
+    run_job = GD._Run_Job
+    def counting(job):
+        evaluated.extend(GD._Job_Points(job))
+        return run_job(job)
+    monkeypatch.setattr(GD, "_Run_Job", counting)
+
+    return evaluated
+
+def test_cached_sweep_is_read_back (sweep, shannon, tmp_path, monkeypatch):
+
+    parameters = {"leak rate" : (0.1, 0.5, 0.2)}
+    first = sweep(tmp_path / "first", target_function=shannon, parameters=parameters, cache_dir=str(tmp_path / "cache"), **SETTINGS)
+
+    evaluated = _Counting(monkeypatch)
+    again = sweep(tmp_path / "again", target_function=shannon, parameters=parameters, cache_dir=str(tmp_path / "cache"), **SETTINGS)
+
+    assert evaluated == []
+    assert again == first
+
+def test_extended_sweep_only_evaluates_new_points (sweep, shannon, tmp_path, monkeypatch):
+
+    fresh = sweep(tmp_path / "fresh", target_function=shannon, parameters={"leak rate" : (0.1, 0.9, 0.2)}, **SETTINGS)
+    sweep(tmp_path / "first", target_function=shannon, parameters={"leak rate" : (0.1, 0.5, 0.2)},
+          cache_dir=str(tmp_path / "cache"), **SETTINGS)
+
+    evaluated = _Counting(monkeypatch)
+    extended = sweep(tmp_path / "extended", target_function=shannon, parameters={"leak rate" : (0.1, 0.9, 0.2)},
+                     cache_dir=str(tmp_path / "cache"), **SETTINGS)
+
+    assert len(evaluated) == 2
+    np.testing.assert_array_equal(extended["Shannon_Entropy1"][1:], fresh["Shannon_Entropy1"][1:])
+
+def test_keys_depend_on_every_input (tmp_path):
+
+    cache = RC.Result_Cache(str(tmp_path), ("Shannon_Entropy", __file__))
+    key = cache.Point_Key({"lr" : 0.1}, {"bucket_count" : 10}, 7)
+
+    assert key == cache.Point_Key({"lr" : 0.1}, {"bucket_count" : 10}, 7)
+    assert key != cache.Point_Key({"lr" : 0.2}, {"bucket_count" : 10}, 7)
+    assert key != cache.Point_Key({"lr" : 0.1}, {"bucket_count" : 20}, 7)
+    assert key != cache.Point_Key({"lr" : 0.1}, {"bucket_count" : 10}, 8)
+    assert key != RC.Result_Cache(str(tmp_path), ("Shannon_Entropy", __file__), backend='numpy').Point_Key(
+                      {"lr" : 0.1}, {"bucket_count" : 10}, 7)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:46:22 2026
+"""
+
+"""
+the append-only Result_Store against the .JSON list Plot_HM reads: test bed first, then
+every result in sweep order.
+"""
+
+import json
+from os import listdir
+import numpy as np
+import Result_Store_V1 as RS
+
+def test_finalise_writes_test_bed_then_results (tmp_path):
+
+    store = RS.Result_Store(str(tmp_path / "store.jsonl"), {"leak rate" : [0.1, 0.5, 0.2]})
+    results = [0.5, np.float64(0.25), {"total" : np.arange(2)}]
+    for result in results:
+        store.Append(result)
+    store.Finalise(str(tmp_path / "leak rate"))
+
+    with open(tmp_path / "leak rate", 'r') as infile:
+        assert json.load(infile) == [{"leak rate" : [0.1, 0.5, 0.2]}, 0.5, 0.25, {"total" : [0, 1]}]
+    assert store.count == 3
+
+def test_finalise_columns_splits_metrics (tmp_path):
+
+    store = RS.Result_Store(str(tmp_path / "store.jsonl"), [{"metric" : "a"}, {"metric" : "b"}])
+    for result in ([1, 2], [3, 4]):
+        store.Append(result)
+    store.Finalise_Columns([str(tmp_path / "a"), str(tmp_path / "b")])
+
+    for name, expected in (("a", [{"metric" : "a"}, 1, 3]), ("b", [{"metric" : "b"}, 2, 4])):
+        with open(tmp_path / name, 'r') as infile:
+            assert json.load(infile) == expected
+
+def test_sweep_saves_one_list_per_dataset (sweep, shannon, tmp_path):
+
+    results = sweep(tmp_path, datasets=2, gen_input=True, backend='numpy', seeds=[7, 8], target_function=shannon,
+                    parameters={"leak rate" : (0.1, 0.9, 0.2)}, keep_buildpath=False,
+                    function_params={"columnwise" : False, "history_length" : 2, "bucket_count" : 10})
+
+    assert sorted(results) == ["Shannon_Entropy1", "Shannon_Entropy2"]
+    assert all(len(result) == 1 + 5 and isinstance(result[0], dict) for result in results.values())
+    assert not [name for name in listdir(tmp_path / "Shannon_Entropy" / "Shannon_Entropy1") if name.endswith(".jsonl")]
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:05:48 2026
+"""
+
+"""
+the regularisation path, one eigendecomposition for every ridge value, against one solve
+per ridge value, and MC_n(ridges=...) against fit() with each ridge value in turn.
+"""
+
+import numpy as np
+import pytest
+import Readout_V1 as RO
+from memory_capacity_V2 import MC_n
+
+RIDGES = [1e-7, 1e-5, 1e-3, 1e-1]
+
+def test_path_equals_solves ():
+
+    rng = np.random.default_rng(2)
+    XXT, YXT = RO.Gram(rng.standard_normal([400, 30]), rng.standard_normal([400, 2]))
+
+    for ridge, (Wout, bout) in zip(RIDGES, RO.Ridge_Path(XXT, YXT, RIDGES)):
+        expected_Wout, expected_bout = RO.Solve_Gram(XXT, YXT, ridge)
+        np.testing.assert_allclose(Wout, expected_Wout, rtol=1e-7, atol=1e-10)
+        np.testing.assert_allclose(bout, expected_bout, rtol=1e-7, atol=1e-10)
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+def test_mc_path_equals_fit (build, stream, backend):
+
+    input_stream = stream(300)
+    expected = [MC_n(build(40, backend=backend, init=False, training=True, ridge=ridge), input_stream, 40, 2) for ridge in RIDGES]
+
+    np.testing.assert_allclose(MC_n(build(40, backend=backend, init=False, training=True), input_stream, 40, 2, ridges=RIDGES),
+                               expected, rtol=1e-5)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 23:36:44 2026
+"""
+
+"""
+sequential sweeps: the mean, std and seed count of every point against the first seeds
+of a dense sweep, the confidence interval reached, and the seeds they use.
+"""
+
+import numpy as np
+import pytest
+import GetDatasets_V7 as GD
+
+SEEDS = list(range(1, 7))
+
+@pytest.fixture
+def settings(shannon, mc):
+    return dict(datasets=6, double_sweep=True, gen_input=True, backend='numpy', target_function=[shannon, mc],
+                function_params=[{"columnwise" : False, "history_length" : 2, "bucket_count" : 10}, {"nc" : 30, "order" : 1}],
+                parameters={"leak rate" : (0.1, 0.9, 0.4), "input scaling" : (0.5, 1.5, 0.5)})
+
+def test_sequential_equals_first_seeds (sweep, settings, tmp_path):
+
+    dense = sweep(tmp_path / "dense", seeds=SEEDS, **settings)
+    sequential = sweep(tmp_path / "sequential", seeds=SEEDS, sequential=3, ci_tolerance=0.02, **settings)
+
+    for name in ["Shannon_Entropy", "MC_n"]:
+        full = np.array([dense[name + str(dataset)][1:] for dataset in range(1, 7)]) # (seeds, points)
+        counts = sequential[name + "seeds"][1:]
+        first = [full[:count, point] for point, count in enumerate(counts)]
+
+        assert min(counts) >= 3 and max(counts) <= 6
+        np.testing.assert_allclose(sequential[name + "mean"][1:], [point.mean() for point in first], rtol=1e-12)
+        np.testing.assert_allclose(sequential[name + "std"][1:], [point.std(ddof=1) for point in first], rtol=1e-10, atol=1e-15)
+        for point, count in zip(first, counts):
+            assert count == 6 or GD.student_t.ppf(0.975, count - 1) * point.std(ddof=1) / np.sqrt(count) <= 0.02
+
+def test_drawn_seeds_distinct (sweep, settings, tmp_path, monkeypatch):
+
+    monkeypatch.setattr(GD, "randint", lambda low, high: 5) # a repeated draw, were seeds drawn one at a time
+    sequential = sweep(tmp_path, sequential=3, ci_tolerance=0.0, **settings)
+
+    seeds = sequential["Shannon_Entropymean"][0]["sequential"]["seeds"]
+    assert len(seeds) == len(set(seeds)) == 6
+
+def test_repeated_seeds_refused (sweep, settings, tmp_path):
+
+    with pytest.raises(Exception, match="distinct seeds"):
+        sweep(tmp_path, seeds=[1, 2, 2, 3, 4, 5], sequential=3, **settings)
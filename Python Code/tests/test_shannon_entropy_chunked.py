@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 23:04:47 2026
+"""
+
+"""
+Shannon_Entropy harvested and counted in chunks, and through a memory map, against the
+whole matrix in memory: the counts are the same, so the entropies are equal exactly.
+"""
+
+import pytest
+import Metric_Registry_V1 as MR
+
+SETTINGS = [(1, 10, False), (2, 10, False), (2, 10, True), (3, 20, True), (0, 5, False), (12, 40, True)]
+
+@pytest.fixture
+def entropy(shannon):
+    return MR.Load(shannon).function
+
+@pytest.mark.parametrize("backend, dtype", [('numpy', 'float64'), ('numpy', 'float32'), ('reservoirpy', 'float64')])
+@pytest.mark.parametrize("columnwise", [False, True])
+@pytest.mark.parametrize("history_length, bucket_count, sparse", SETTINGS)
+def test_chunked_equals_whole (entropy, build, stream, tmp_path, backend, dtype, columnwise, history_length, bucket_count, sparse):
+
+    model = lambda: build(40, backend=backend, init_W='uniform', dtype=dtype)
+    input_stream = stream(400, 1)
+    whole = entropy(model(), input_stream, columnwise, history_length, bucket_count, sparse)
+
+    for chunk_size, memmap_dir in [(97, None), (1, tmp_path), (333, tmp_path), (None, tmp_path), (2000, None)]:
+        assert entropy(model(), input_stream, columnwise, history_length, bucket_count, sparse, chunk_size, memmap_dir) == whole
+
+    assert list(tmp_path.iterdir()) == [] # memory maps removed
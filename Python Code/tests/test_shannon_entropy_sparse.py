@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:11:52 2026
+"""
+
+"""
+the sparse event histogram of Shannon_Entropy against the dense one, and at sizes the
+dense histogram could not be allocated for.
+"""
+
+import pytest
+from shannon_entropy_V15 import Shannon_Entropy
+
+@pytest.mark.parametrize("columnwise", [False, True])
+@pytest.mark.parametrize("history_length, bucket_count", [(0, 10), (1, 20), (2, 10), (3, 7)])
+def test_sparse_equals_dense (build, stream, columnwise, history_length, bucket_count):
+
+    input_stream = stream(150)
+    dense = Shannon_Entropy(build(init_W='uniform'), input_stream, columnwise, history_length, bucket_count)
+
+    assert Shannon_Entropy(build(init_W='uniform'), input_stream, columnwise, history_length, bucket_count, sparse=True) \
+        == pytest.approx(dense, rel=1e-9)
+
+def test_sparse_scales_past_dense (build, stream):
+
+    # bucket_count^(history_length + 1) = 1e24 events, far beyond a dense histogram
+
+    result = Shannon_Entropy(build(init_W='uniform'), stream(150), False, 11, 100, sparse=True)
+
+    assert 0 < result < 1
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 23:11:20 2026
+"""
+
+"""
+Shannon_Entropy over lists of settings, one harvest for the whole table, against one call
+per setting.
+"""
+
+import pytest
+import Metric_Registry_V1 as MR
+
+TABLES = [(False, [0, 1, 2, 3], [5, 10]), (True, [0, 1, 2, 4], [7, 10, 20]), (True, [1, 11, 12], [40])]
+
+@pytest.mark.parametrize("sparse, history_lengths, bucket_counts", TABLES)
+@pytest.mark.parametrize("kwargs", [{}, {"chunk_size" : 37}, {"chunk_size" : 50, "memmap_dir" : True}])
+def test_table_equals_separate_calls (shannon, build, stream, tmp_path, sparse, history_lengths, bucket_counts, kwargs):
+
+    entropy = MR.Load(shannon).function
+    model = lambda: build(40, init_W='uniform')
+    input_stream = stream(600, 1)
+    kwargs = {key : tmp_path if key == "memmap_dir" else value for key, value in kwargs.items()}
+
+    table = entropy(model(), input_stream, [False, True], history_lengths, bucket_counts, sparse, **kwargs)
+
+    assert table["columnwise"] == [False, True]
+    for c, columnwise in enumerate(table["columnwise"]):
+        for i, history_length in enumerate(history_lengths):
+            for j, bucket_count in enumerate(bucket_counts):
+                assert table["entropy"][c][i][j] == entropy(model(), input_stream, columnwise, history_length, bucket_count, sparse)
+
+def test_scalar_settings_return_a_number (shannon, build, stream):
+
+    entropy = MR.Load(shannon).function
+
+    assert isinstance(entropy(build(40), stream(200), True, 2, 10), float)
+    assert isinstance(entropy(build(40), stream(200), True, [1, 2], 10), dict)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:04:36 2026
+"""
+
+"""
+the vectorised symbolisation and event counting of Shannon_Entropy against the original
+loops: one model.call per timestep, one bucket per element, one dict lookup per event.
+"""
+
+from itertools import product
+import numpy as np
+import pytest
+from scipy.stats import entropy
+from shannon_entropy_V15 import Shannon_Entropy
+
+def _Reference (model, input_stream, columnwise, history_length, bucket_count):
+
+    output_matrix = np.array([model.call(data)[0] for data in input_stream])
+    output_matrix = np.reshape(output_matrix, (1,-1), 'F' if columnwise else 'C')[0]
+    output_matrix = (output_matrix - output_matrix.min()) / (output_matrix.max() - output_matrix.min() + 1e-16)
+    symbols = [min(int(value * bucket_count) + 1, bucket_count) for value in output_matrix]
+
+    event_index = {event : index for index, event in enumerate(product(range(1, bucket_count + 1), repeat=history_length + 1))}
+    occurences = [0] * len(event_index)
+    for end in range(history_length, len(symbols)):
+        occurences[event_index[tuple(symbols[end - history_length:end + 1])]] += 1
+    for length in range(1, history_length + 1): # no history events
+        occurences += [1] + [0] * bucket_count ** length
+
+    occurences = [count or 1e-10 for count in occurences]
+    return entropy(occurences, base=len(occurences))
+
+@pytest.mark.parametrize("columnwise", [False, True])
+@pytest.mark.parametrize("history_length, bucket_count", [(0, 10), (1, 10), (2, 10), (3, 5)])
+def test_matches_reference_loops (build, stream, columnwise, history_length, bucket_count):
+
+    input_stream = stream(120)
+    expected = _Reference(build(init_W='uniform'), input_stream, columnwise, history_length, bucket_count)
+
+    assert Shannon_Entropy(build(init_W='uniform'), input_stream, columnwise, history_length, bucket_count) \
+        == pytest.approx(expected, rel=1e-12)
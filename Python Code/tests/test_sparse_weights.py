@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:15:57 2026
+"""
+
+"""
+sparse reservoir construction: the shape of W drawn in CSR form, its scaling to the
+spectral radius, down to reservoirs of a few nodes, and the sparse reservoirpy path against
+the NumPy backend.
+"""
+
+import numpy as np
+import pytest
+import Sparse_Weights_V1 as SW
+
+@pytest.mark.parametrize("distribution", ['normal', 'uniform', 'bernoulli'])
+def test_rows_hold_cny_connections (distribution):
+
+    W = SW.Sparse_W(3000, 0.004, distribution, np.random.default_rng(1))
+
+    assert W.shape == (3000, 3000)
+    assert np.all(np.diff(W.indptr) <= 12) and W.nnz >= 0.95 * 3000 * 12 # duplicates removed
+    if distribution == 'bernoulli':
+        assert set(np.unique(W.data)) <= {-1.0, 1.0}
+
+def test_spectral_radius_matches_dense ():
+
+    W = SW.Sparse_W(1000, 0.01, 'normal', np.random.default_rng(2))
+    expected = np.abs(np.linalg.eigvals(W.toarray())).max() # ARPACK with k=1 misses it, see Spectral_Radius
+
+    assert SW.Spectral_Radius(W) == pytest.approx(expected, rel=1e-2)
+
+def test_scaled_to_spectral_radius (build):
+
+    model = build(1000, init=False, cny=0.01, sr=0.9, sparse_W=True)
+
+    assert np.abs(np.linalg.eigvals(model.W.toarray())).max() == pytest.approx(0.9, rel=1e-2)
+
+def test_reservoirpy_equals_numpy (build, stream):
+
+    input_stream = stream(30)
+    reservoirpy_model = build(1000, init=True, cny=0.005, sparse_W=True, backend='reservoirpy')
+    numpy_model = build(1000, init=False, cny=0.005, sparse_W=True)
+
+    np.testing.assert_allclose(reservoirpy_model.run(input_stream, reset=True), numpy_model.run(input_stream), atol=1e-10)
+
+@pytest.mark.parametrize("nc", [1, 2, 3, 7, 8])
+def test_small_reservoirs (build, stream, nc):
+
+    W = SW.Sparse_W(nc, 0.5, 'normal', np.random.default_rng(3))
+    assert SW.Spectral_Radius(W) == pytest.approx(np.abs(np.linalg.eigvals(W.toarray())).max(), rel=1e-2)
+
+    assert np.all(np.isfinite(build(nc, init=False, cny=0.5, sparse_W=True).run(stream(10))))
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:29:12 2026
+"""
+
+"""
+sweeps evaluated from stored states against direct ones, without building a reservoir
+once the states are stored, and the size bound of the state directory.
+"""
+
+import numpy as np
+import pytest
+import ESN_Maker_V4
+import State_Cache_V1 as SC
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+def test_stored_states_equal_direct (sweep, mc, tmp_path, monkeypatch, backend):
+
+    settings = dict(datasets=1, double_sweep=True, gen_input=True, training=True, backend=backend, seeds=[7],
+                    target_function=mc, function_params={"nc" : 30, "order" : 2},
+                    parameters={"leak rate" : (0.1, 0.5, 0.2), "ridge" : (1e-6, 2e-6, 1e-6)})
+
+    direct = sweep(tmp_path / "direct", **settings)
+    stored = sweep(tmp_path / "stored", state_dir=str(tmp_path / "states"), **settings)
+
+    def unbuildable(*args, **kwargs):
+        raise RuntimeError("a reservoir was built")
+    monkeypatch.setattr(ESN_Maker_V4.ESN_Maker, "__init__", unbuildable)
+    replayed = sweep(tmp_path / "replayed", state_dir=str(tmp_path / "states"), **settings)
+
+    np.testing.assert_array_equal(stored["MC_n1"][1:], direct["MC_n1"][1:])
+    np.testing.assert_array_equal(replayed["MC_n1"][1:], direct["MC_n1"][1:])
+
+def test_directory_is_kept_under_its_bound (tmp_path, monkeypatch):
+
+    walks = []
+    walk = SC.walk
+    monkeypatch.setattr(SC, "walk", lambda *args: walks.append(args) or walk(*args))
+
+    states, inputs = np.random.default_rng(0).random([100, 10]), np.zeros([100, 1])
+    cache = SC.State_Cache(str(tmp_path), max_bytes=100 * states.nbytes)
+    keys = [f"{index:04d}" + "0" * 60 for index in range(500)]
+    for key in keys:
+        cache.Put(key, inputs, states, {"key" : key})
+
+    size = sum(file.stat().st_size for file in tmp_path.rglob("*") if file.is_file())
+    assert size <= cache.max_bytes
+    assert len(walks) < len(keys) / 5 # one per WALK_EVERY x max_bytes written, about 9 Puts here
+    assert cache.Get(keys[-1]) is not None and cache.Get(keys[0]) is None # least recently used go first
+    np.testing.assert_array_equal(cache.Get(keys[-1])[1], states)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 23:17:52 2026
+"""
+
+"""
+Streaming_Entropy, updated incrementally as states arrive, against the entropy of every
+window computed from scratch.
+"""
+
+import numpy as np
+import pytest
+import Harvest_V1 as HV
+import shannon_entropy_V15 as se
+
+def _Direct (window: np.ndarray, history_length: int, bucket_count: int) -> float:
+
+    symbols = se._Bucket_Symbols(np.clip((window.reshape(-1) + 1) / (2 + 1e-16), 0, 1), bucket_count)
+    _, counts = se._Observed_Events(symbols, bucket_count, history_length)
+
+    return se._Sparse_Entropy(counts, bucket_count, history_length)
+
+@pytest.mark.parametrize("history_length, bucket_count, window, stride, feed",
+                         [(2, 10, 50, 1, 'rows'), (1, 5, 10, 3, 'chunks'), (0, 10, 30, 7, 'rows'), (12, 40, 20, 5, 'chunks')])
+def test_streaming_equals_direct (build, stream, history_length, bucket_count, window, stride, feed):
+
+    input_stream = stream(400, 1)
+    states = HV.Harvest_States(build(20, init_W='uniform'), input_stream)
+    if feed == 'rows':
+        source = (row for row in states)
+    else:
+        source = (chunk for _, chunk in HV.Harvest_Chunks(build(20, init_W='uniform'), input_stream, 37))
+
+    streamed = list(se.Streaming_Entropy(source, window, history_length, bucket_count, stride=stride))
+    direct = [_Direct(states[t - window + 1:t + 1], history_length, bucket_count)
+              for t in range(window - 1, len(states), stride)]
+
+    assert len(streamed) == len(direct)
+    np.testing.assert_allclose(streamed, direct, rtol=1e-10, atol=1e-12)
+
+def test_window_too_short ():
+
+    with pytest.raises(ValueError, match="history_length"):
+        list(se.Streaming_Entropy(iter(np.zeros([10, 2])), 2, history_length=4))
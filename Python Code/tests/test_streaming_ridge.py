@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:00:14 2026
+"""
+
+"""
+readouts trained from streamed chunks of states against one solve over all of them, and
+MC_n run chunk by chunk against MC_n on the whole stream.
+"""
+
+import numpy as np
+import pytest
+import Readout_V1 as RO
+from memory_capacity_V2 import MC_n
+
+def test_streaming_equals_whole_solve ():
+
+    rng = np.random.default_rng(1)
+    X, Y = rng.standard_normal([500, 20]), rng.standard_normal([500, 3])
+    readout = RO.Streaming_Ridge()
+    for start in range(0, 500, 64):
+        readout.Update(X[start:start + 64], Y[start:start + 64])
+
+    for streamed, whole in zip(readout.Solve(1e-5), RO.Ridge_Solve(X, Y, 1e-5)):
+        np.testing.assert_allclose(streamed, whole, rtol=1e-10, atol=1e-12)
+    assert readout.count == 500
+
+def test_chunked_fit_equals_whole_fit (build, stream):
+
+    input_stream = stream(300)
+    whole = build(40, init=False, training=True)
+    chunked = build(40, init=False, training=True)
+    whole.fit(input_stream[:150], input_stream[1:151], warmup=10)
+    chunked.fit(input_stream[:150], input_stream[1:151], warmup=10, chunk_size=7)
+
+    # at ridge 1e-7 the weights are large and ill conditioned, their predictions are not
+    np.testing.assert_allclose(chunked.run(input_stream[150:]), whole.run(input_stream[150:]), atol=1e-6)
+
+@pytest.mark.parametrize("backend", ['numpy', 'reservoirpy'])
+@pytest.mark.parametrize("chunk_size", [7, 64, 1000])
+def test_chunked_mc_equals_fit (build, stream, backend, chunk_size):
+
+    input_stream = stream(301)
+    expected = MC_n(build(40, backend=backend, init=False, training=True, ridge=1e-5), input_stream, 40, 3, all_orders=True)
+    chunked = MC_n(build(40, backend=backend, init=False, training=True, ridge=1e-5), input_stream, 40, 3, all_orders=True,
+                   chunk_size=chunk_size)
+
+    np.testing.assert_allclose(chunked["NMSE"], expected["NMSE"], rtol=1e-6)
+
+def test_chunked_mc_path_equals_whole_path (build, stream):
+
+    ridges = [1e-7, 1e-5, 1e-3]
+    input_stream = stream(300)
+    whole = MC_n(build(40, init=False, training=True), input_stream, 40, 2, ridges=ridges)
+    chunked = MC_n(build(40, init=False, training=True), input_stream, 40, 2, ridges=ridges, chunk_size=33)
+
+    np.testing.assert_allclose(chunked, whole, rtol=1e-6) # X^T.X summed by chunks, solved at ridge 1e-7
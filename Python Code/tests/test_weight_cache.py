@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 22:10:26 2026
+"""
+
+"""
+weights rescaled from the ESN_Maker weight cache against weights drawn afresh at every
+sweep point, against reservoirpy's initialisers, and given to reservoirpy Reservoirs.
+"""
+
+import numpy as np
+import pytest
+import ESN_Maker_V4
+from reservoirpy.mat_gen import normal, bernoulli
+
+POINTS = [(sr, ins) for sr in (0.5, 0.9, 1.3) for ins in (0.1, 1.0)]
+
+def _Weights (**kwargs):
+
+    model = ESN_Maker_V4.ESN_Maker(nn=1, out=False, rep=True, backend='numpy', init=False, seed=4, cny=0.2, **kwargs).networks[0]
+
+    return model.W.toarray(), np.asarray(model.Win), np.asarray(model.bias)
+
+@pytest.mark.parametrize("init_W", [None, 'uniform'])
+def test_cached_equal_fresh (monkeypatch, init_W):
+
+    monkeypatch.setattr(ESN_Maker_V4, "WEIGHT_CACHE_SIZE", 0)
+    ESN_Maker_V4._WEIGHT_CACHE.clear()
+    fresh = [_Weights(nc=60, sr=sr, ins=ins, init_W=init_W) for sr, ins in POINTS]
+
+    monkeypatch.setattr(ESN_Maker_V4, "WEIGHT_CACHE_SIZE", 32)
+    cached = [_Weights(nc=60, sr=sr, ins=ins, init_W=init_W) for sr, ins in POINTS]
+
+    assert len(ESN_Maker_V4._WEIGHT_CACHE) == 1 # one draw, rescaled for every point
+    for point_fresh, point_cached in zip(fresh, cached):
+        for weights_fresh, weights_cached in zip(point_fresh, point_cached):
+            np.testing.assert_allclose(weights_cached, weights_fresh, rtol=1e-12, atol=1e-14)
+
+def test_cached_equal_initialisers ():
+
+    ESN_Maker_V4._WEIGHT_CACHE.clear()
+    rng = np.random.default_rng(4)
+    W = normal(60, 60, connectivity=0.2, sr=1.3, seed=rng).toarray()
+    Win = bernoulli(60, 1, connectivity=0.1, input_scaling=2.0, seed=rng).toarray()
+
+    cached_W, cached_Win, _ = _Weights(nc=60, sr=1.3, ins=2.0)
+
+    np.testing.assert_allclose(cached_W, W, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(cached_Win, Win, rtol=1e-12)
+
+@pytest.mark.parametrize("init_W", [None, 'uniform'])
+def test_reservoirpy_given_cached_weights (stream, init_W):
+
+    ESN_Maker_V4._WEIGHT_CACHE.clear()
+    for sr, ins in POINTS:
+        reservoir = ESN_Maker_V4.ESN_Maker(nn=1, out=False, rep=True, backend='reservoirpy', seed=4, cny=0.2, nc=60,
+                                           sr=sr, ins=ins, init_W=init_W).networks[0].nodes[1]
+        reservoir.run(stream(5)) # reservoirpy draws, if it does, on the first run
+        for given, cached in zip((reservoir.W, reservoir.Win, reservoir.bias), _Weights(nc=60, sr=sr, ins=ins, init_W=init_W)):
+            np.testing.assert_array_equal(np.asarray(given.toarray() if hasattr(given, "toarray") else given).reshape(cached.shape),
+                                          cached)
+
+    assert len(ESN_Maker_V4._WEIGHT_CACHE) == 1 # both backends, one draw for every point
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:33:40 2026
+"""
+
+"""
+GetDataset over a process pool against a serial run, and the replacement of a kept pool
+that can no longer run jobs.
+"""
+
+import numpy as np
+import GetDatasets_V7 as GD
+
+def test_workers_equal_serial (sweep, shannon, tmp_path):
+
+    settings = dict(datasets=1, double_sweep=True, gen_input=True, target_function=shannon, backend='numpy', seeds=[7],
+                    parameters={"leak rate" : (0.1, 0.5, 0.2), "input scaling" : (0.5, 1.0, 0.5)},
+                    function_params={"columnwise" : False, "history_length" : 2, "bucket_count" : 10})
+
+    serial = sweep(tmp_path / "serial", **settings)
+    parallel = sweep(tmp_path / "parallel", workers=2, **settings)
+
+    assert serial.keys() == parallel.keys()
+    for name in serial:
+        assert serial[name][0] == parallel[name][0]
+        np.testing.assert_array_equal(serial[name][1:], parallel[name][1:])
+
+def test_kept_pool_is_replaced_once_shut_down ():
+
+    executor = GD._Executor(2)
+    assert GD._Executor(2) is executor
+
+    executor.shutdown()
+    replacement = GD._Executor(2)
+
+    assert replacement is not executor
+    assert replacement.submit(abs, -3).result() == 3